@@ -0,0 +1,216 @@
+"""Agregação em fluxo de simulações muito grandes (percentis por ano).
+
+As faixas de percentis de uma simulação de Monte Carlo normalmente exigem
+guardar todos os caminhos. Aqui os caminhos chegam em blocos de tamanho fixo e
+cada ano mantém:
+
+* momentos acumulados (contagem, média e soma dos quadrados dos desvios),
+  combinados pela fórmula paralela de Chan;
+* um t-digest: centróides (média, peso) comprimidos pela função de escala
+  ``k1``, mais finos nas caudas, de onde saem os percentis aproximados.
+
+A memória é constante no número de caminhos. Agregadores de blocos diferentes
+se combinam (``combinar``), então cada trabalhador processa seus blocos e os
+resultados parciais são somados no fim.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from estocastico import parametros_mensais
+from motor import ANOS_PROJECAO, MULTIPLICADOR_ANUAL
+
+
+class Momentos:
+    """Contagem, média e variância acumuladas de cada coluna (ano)."""
+
+    def __init__(self, anos):
+        self.n = 0
+        self.media = np.zeros(anos)
+        self.m2 = np.zeros(anos)
+
+    def atualizar(self, bloco):
+        """Inclui um bloco (caminhos x anos)."""
+        outro = Momentos(bloco.shape[1])
+        outro.n = bloco.shape[0]
+        outro.media = bloco.mean(axis=0)
+        outro.m2 = ((bloco - outro.media) ** 2).sum(axis=0)
+        self.combinar(outro)
+
+    def combinar(self, outro):
+        """Soma os momentos de outro agregador (Chan et al.)."""
+        n = self.n + outro.n
+        if n == 0:
+            return self
+        delta = outro.media - self.media
+        self.m2 = self.m2 + outro.m2 + delta**2 * self.n * outro.n / n
+        self.media = self.media + delta * outro.n / n
+        self.n = n
+        return self
+
+    @property
+    def variancia(self):
+        return self.m2 / max(self.n - 1, 1)
+
+    @property
+    def desvio(self):
+        return np.sqrt(self.variancia)
+
+
+class TDigest:
+    """Esboço de quantis t-digest (versão "merging") de uma série."""
+
+    def __init__(self, compressao=200):
+        self.compressao = compressao
+        self.medias = np.empty(0)
+        self.pesos = np.empty(0)
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    def adicionar(self, valores):
+        """Inclui os valores (cada um com peso 1) e recomprime."""
+        valores = np.asarray(valores, dtype=float).ravel()
+        if valores.size == 0:
+            return self
+        self.minimo = min(self.minimo, valores.min())
+        self.maximo = max(self.maximo, valores.max())
+        return self._comprimir(
+            np.concatenate([self.medias, valores]),
+            np.concatenate([self.pesos, np.ones(valores.size)]),
+        )
+
+    def combinar(self, outro):
+        """Junta os centróides de outro digest."""
+        self.minimo = min(self.minimo, outro.minimo)
+        self.maximo = max(self.maximo, outro.maximo)
+        return self._comprimir(
+            np.concatenate([self.medias, outro.medias]),
+            np.concatenate([self.pesos, outro.pesos]),
+        )
+
+    def _comprimir(self, medias, pesos):
+        # Agrupa centróides vizinhos com o mesmo inteiro de k1(q)
+        ordem = np.argsort(medias, kind="stable")
+        medias, pesos = medias[ordem], pesos[ordem]
+        q = (np.cumsum(pesos) - pesos / 2) / pesos.sum()
+        k = self.compressao / (2 * np.pi) * np.arcsin(2 * q - 1)
+        grupo = np.floor(k)
+        inicio = np.flatnonzero(np.r_[True, np.diff(grupo) != 0])
+        self.pesos = np.add.reduceat(pesos, inicio)
+        self.medias = np.add.reduceat(medias * pesos, inicio) / self.pesos
+        return self
+
+    def quantil(self, q):
+        """Quantis aproximados, interpolando entre os centróides."""
+        if self.pesos.size == 0:
+            return np.full(np.shape(q), np.nan)
+        posicoes = (np.cumsum(self.pesos) - self.pesos / 2) / self.pesos.sum()
+        return np.interp(
+            q,
+            np.r_[0, posicoes, 1],
+            np.r_[self.minimo, self.medias, self.maximo],
+        )
+
+
+class AgregadorAnual:
+    """Momentos e t-digest de cada ano de uma simulação."""
+
+    def __init__(self, anos, compressao=200):
+        self.momentos = Momentos(anos)
+        self.digests = [TDigest(compressao) for _ in range(anos)]
+
+    def atualizar(self, bloco):
+        """Inclui um bloco (caminhos x anos) de resultados."""
+        bloco = np.asarray(bloco, dtype=float)
+        self.momentos.atualizar(bloco)
+        for ano, digest in enumerate(self.digests):
+            digest.adicionar(bloco[:, ano])
+        return self
+
+    def combinar(self, outro):
+        """Soma os resultados parciais de outro agregador."""
+        self.momentos.combinar(outro.momentos)
+        for digest, outro_digest in zip(self.digests, outro.digests):
+            digest.combinar(outro_digest)
+        return self
+
+    def resumo(self, quantis=(0.05, 0.25, 0.5, 0.75, 0.95)):
+        """Tabela com média, desvio-padrão e percentis de cada ano."""
+        df = pd.DataFrame(
+            {
+                "Anos": np.arange(1, len(self.digests) + 1),
+                "Média": self.momentos.media,
+                "Desvio": self.momentos.desvio,
+            }
+        )
+        valores = np.array([digest.quantil(quantis) for digest in self.digests])
+        for i, q in enumerate(quantis):
+            df[f"P{round(100 * q)}"] = valores[:, i]
+        return df
+
+
+def saldos_aleatorios(aporte_anual, retornos_anuais):
+    """Saldo de cada ano com rentabilidades aleatórias, como em ``tabela_inv``.
+
+    saldo_n = saldo_(n-1) * (1 + r_n) + aporte_n, resolvido com o produto
+    acumulado dos fatores: saldo_n = G_n * soma(aporte_k / G_k). Como só as
+    razões G_n / G_k aparecem, o aporte do ano k rende de k + 1 a n.
+    """
+    crescimento = np.cumprod(1 + retornos_anuais, axis=-1)
+    return crescimento * np.cumsum(aporte_anual / crescimento, axis=-1)
+
+
+def _agregar_blocos(sementes, tamanhos, aporte_anual, media, volatilidade, anos):
+    # O log do fator anual é a soma de 12 normais mensais: sorteia direto o anual
+    mu, sigma = parametros_mensais(media, volatilidade)
+    agregador = AgregadorAnual(anos)
+    for semente, tamanho in zip(sementes, tamanhos):
+        z = np.random.default_rng(semente).standard_normal((tamanho, anos))
+        retornos = np.expm1(12 * mu + np.sqrt(12) * sigma * z)
+        agregador.atualizar(saldos_aleatorios(aporte_anual, retornos))
+    return agregador
+
+
+def percentis_acumulacao(
+    renda_mensal,
+    aporte,
+    taxa_anual,
+    volatilidade_anual,
+    n_caminhos=1_000_000,
+    anos=ANOS_PROJECAO,
+    bloco=10000,
+    trabalhadores=4,
+    semente=0,
+):
+    """Faixas de percentis do saldo acumulado sem guardar os caminhos.
+
+    Cada bloco tem a sua semente (derivada de ``semente``), então os caminhos
+    não dependem de quantos trabalhadores dividem os blocos; só a aproximação
+    do t-digest varia um pouco com a ordem da combinação.
+
+    Returns:
+        pandas.DataFrame: Média, desvio-padrão e percentis de cada ano.
+    """
+    aporte_anual = renda_mensal * MULTIPLICADOR_ANUAL * aporte / 100
+    tamanhos = [min(bloco, n_caminhos - i) for i in range(0, n_caminhos, bloco)]
+    sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+
+    with ThreadPoolExecutor(max_workers=trabalhadores) as executor:
+        parciais = list(
+            executor.map(
+                _agregar_blocos,
+                [sementes[i::trabalhadores] for i in range(trabalhadores)],
+                [tamanhos[i::trabalhadores] for i in range(trabalhadores)],
+                [aporte_anual] * trabalhadores,
+                [taxa_anual] * trabalhadores,
+                [volatilidade_anual] * trabalhadores,
+                [anos] * trabalhadores,
+            )
+        )
+
+    agregador = parciais[0]
+    for parcial in parciais[1:]:
+        agregador.combinar(parcial)
+    return agregador.resumo()
@@ -0,0 +1,193 @@
+"""Aquecimento do processo do servidor antes do primeiro acesso.
+
+Logo depois de um deploy, o primeiro usuário paga a importação da pilha de
+gráficos (pandas, seaborn, plotly, bs4), a compilação do Numba e os caches
+vazios. ``iniciar`` faz esse trabalho numa thread em segundo plano: importa o
+app, calcula o cenário padrão (6000 / 12 / 10) com as mesmas chamadas de
+``main()`` e desenha os heatmaps padrão das três estratégias, preenchendo o
+cache persistente, o atlas e o cache de figuras. É idempotente: chamadas
+seguintes no mesmo processo não fazem nada.
+
+A prontidão fica em ``pronto`` (``threading.Event``). Com
+``PLANEJAMENTO_PORTA_PRONTIDAO`` definida, um servidor HTTP responde em
+``/pronto`` com 200 depois do aquecimento e 503 antes, para o balanceador de
+carga. O app deve ser iniciado por aqui, que aquece e abre a prontidão já na
+partida do processo::
+
+    PLANEJAMENTO_PORTA_PRONTIDAO=8502 python aquecimento.py [opções do streamlit run]
+
+Com ``streamlit run`` direto, ``main()`` só chama ``iniciar`` no primeiro
+acesso: o balanceador não recebe resposta em ``/pronto`` até lá e nunca envia
+esse primeiro acesso. Nesse caso ``iniciar`` registra um aviso no log.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+RENDA_PADRAO, APORTE_PADRAO, TAXA_PADRAO = 6000, 12, 10
+ANOS = [5, 10, 15, 20, 25, 30]
+
+pronto = threading.Event()
+erro = None
+_lock = threading.Lock()
+_iniciado = False
+
+
+def aquecer(renda_mensal=RENDA_PADRAO, aporte=APORTE_PADRAO, taxa_anual=TAXA_PADRAO):
+    """Importa o app e calcula o cenário e os heatmaps padrão."""
+    import matplotlib.pyplot as plt
+
+    import planejamento_aposentadoria as app
+    from atlas_sensibilidade import carregar_atlas
+    from comparacao import comparar_estrategias
+    from graficos import figura
+    from saques_dinamicos import comparar_regras
+
+    carregar_atlas()
+
+    df = app.calcular_ir(renda_mensal, aporte)
+    irpf = df.loc[df["Descrição"] == "IRPF"]
+    dirpf = float(irpf["Sem PGBL"].values[0]) - float(irpf["Com PGBL"].values[0])
+    app.calcular_aporte(renda_mensal, aporte)
+
+    df_prev = app.tabela_prev(renda_mensal, aporte, taxa_anual, dirpf)
+    df_inv = app.tabela_inv(renda_mensal, aporte, taxa_anual)
+    df_inv_pgbl = app.tabela_inv(renda_mensal, aporte, taxa_anual, dirpf)
+    comparar_estrategias(renda_mensal, aporte, taxa_anual)
+
+    # Gráficos de barras padrão de cada estratégia
+    for df_barras in (df_inv, df_prev):
+        figura(
+            "aportes_rendimentos",
+            df_barras["Anos"],
+            df_barras["Valor Aportado"],
+            df_barras["Saldo Acumulado"] - df_barras["Valor Aportado"],
+        )
+    figura(
+        "pgbl_investimentos",
+        df_prev["Anos"],
+        df_prev["Saldo Acumulado"],
+        df_inv_pgbl["Saldo Acumulado"],
+    )
+
+    df_total = df_prev.iloc[:, 1:] + df_inv_pgbl.iloc[:, 1:]
+    df_total.insert(0, df_prev.columns[0], df_inv_pgbl.iloc[:, 0])
+    app.usufruto(renda_mensal, taxa_anual, df_total)
+
+    # Heatmaps com os mesmos argumentos de main() (mesmas chaves de cache)
+    heatmaps = [
+        ("conservadora", "Renda Passiva Mensal", [5, 10, 15, 20], 0),
+        ("conservadora", "Saldo Acumulado", [10, 12, 15, 20, 25, 30], 0),
+        ("moderada", "Renda Passiva Mensal", [5, 8, 10, 12], dirpf),
+        ("moderada", "Saldo Acumulado", [5, 8, 10, 12], dirpf),
+        ("agressiva", "Renda Passiva Mensal", [10, 12, 15, 20, 25, 30], None),
+        ("agressiva", "Saldo Acumulado", [10, 12, 15, 20, 25, 30], None),
+    ]
+    for estrategia, coluna, aportes, dirpf_heatmap in heatmaps:
+        if dirpf_heatmap is None:
+            dirpf_heatmap = dirpf / renda_mensal
+        app.tabela_sensibilidade(
+            estrategia, coluna, taxa_anual, ANOS, aportes, dirpf_heatmap
+        )
+
+    # Fontes e caches do Matplotlib/Seaborn
+    fig = app.figura_heatmap(
+        app.tabela_sensibilidade(
+            "conservadora", "Saldo Acumulado", taxa_anual, ANOS, [10, 12]
+        ),
+        tipo=2,
+    )
+    fig.canvas.draw()
+    plt.close(fig)
+
+    # Compila o kernel do Numba (quando instalado)
+    comparar_regras(1e6, 4000, taxa_anual, 12, n_caminhos=10, anos=1)
+
+
+def _executar():
+    global erro
+    inicio = time.perf_counter()
+    try:
+        aquecer()
+    except Exception as excecao:  # O app funciona mesmo sem aquecimento
+        erro = excecao
+        log.warning("Aquecimento falhou: %r", excecao)
+    else:
+        log.info("Aquecimento concluído em %.1f s", time.perf_counter() - inicio)
+    finally:
+        pronto.set()
+
+
+class _Prontidao(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/pronto":
+            self.send_error(404)
+            return
+        codigo = 200 if pronto.is_set() else 503
+        corpo = b"pronto\n" if codigo == 200 else b"aquecendo\n"
+        self.send_response(codigo)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def servir_prontidao(porta):
+    """Servidor HTTP de prontidão numa thread daemon."""
+    servidor = ThreadingHTTPServer(("", porta), _Prontidao)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def iniciar(na_partida=False):
+    """Dispara o aquecimento (uma vez por processo) e o endpoint de prontidão.
+
+    ``na_partida`` indica a chamada de ``python aquecimento.py``. Vinda do app,
+    a chamada só acontece no primeiro acesso e é tarde para a prontidão.
+    """
+    global _iniciado
+    with _lock:
+        if _iniciado:
+            return pronto
+        _iniciado = True
+
+    porta = os.environ.get("PLANEJAMENTO_PORTA_PRONTIDAO")
+    if not na_partida:
+        log.log(
+            logging.WARNING if porta else logging.INFO,
+            "Aquecimento iniciado só no primeiro acesso; inicie o app com "
+            "'python aquecimento.py' para aquecer e responder em /pronto desde a "
+            "partida do processo",
+        )
+    if porta:
+        try:
+            servir_prontidao(int(porta))
+        except (OSError, ValueError) as excecao:
+            log.warning("Porta de prontidão %s indisponível: %s", porta, excecao)
+
+    threading.Thread(target=_executar, name="aquecimento", daemon=True).start()
+    return pronto
+
+
+if __name__ == "__main__":
+    from streamlit.web import cli
+
+    import aquecimento  # O mesmo módulo que o app importa, não uma cópia em __main__
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(levelname)s %(name)s: %(message)s"
+    )
+    aquecimento.iniciar(na_partida=True)
+    script = Path(__file__).resolve().parent / "planejamento_aposentadoria.py"
+    sys.argv = ["streamlit", "run", str(script), *sys.argv[1:]]
+    sys.exit(cli.main())
@@ -0,0 +1,197 @@
+"""Atlas pré-calculado das tabelas de sensibilidade (heatmaps).
+
+Os heatmaps usam renda unitária (``renda_mensal=1``), então dependem apenas do
+aporte, da taxa anual, do ano e, na estratégia agressiva, de ``dirpf /
+renda_mensal``. As colunas de saldo e renda passiva são lineares por partes no
+aporte (a única quebra está no limite de 12% do PGBL) e lineares em ``dirpf``.
+Por isso o atlas guarda uma grade densa de aportes e taxas e duas camadas para
+``dirpf`` (0 e 1): a interpolação é exata nos aportes inteiros e em qualquer
+taxa da grade.
+
+Para gerar o atlas::
+
+    python atlas_sensibilidade.py [diretorio]
+
+O diretório padrão é ``atlas/`` ao lado deste arquivo, ou o definido em
+``PLANEJAMENTO_ATLAS``.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from motor import ANOS_PROJECAO, projetar_inv, projetar_prev
+
+APORTES = np.arange(0, 101, 1.0)  # Aporte (% da renda)
+TAXAS = 0.25 * np.arange(1, 121)  # Taxa anual de 0,25% a 30%
+
+CAMADAS = [
+    "prev_saldo",
+    "prev_renda",
+    "inv_saldo",
+    "inv_renda",
+    "com_pgbl_0_saldo",
+    "com_pgbl_0_renda",
+    "com_pgbl_1_saldo",
+    "com_pgbl_1_renda",
+]
+
+COLUNA_CAMADA = {"Saldo Acumulado": "saldo", "Renda Passiva Mensal": "renda"}
+
+_atlas = {}
+
+
+def diretorio_padrao():
+    return Path(
+        os.environ.get("PLANEJAMENTO_ATLAS", Path(__file__).resolve().parent / "atlas")
+    )
+
+
+def construir_atlas(diretorio=None):
+    """Calcula todas as camadas e grava o atlas como array mapeado em memória."""
+    diretorio = Path(diretorio or diretorio_padrao())
+    diretorio.mkdir(parents=True, exist_ok=True)
+
+    aporte = APORTES[:, None]
+    taxa = TAXAS[None, :]
+
+    projecoes = {
+        "prev": projetar_prev(1, aporte, taxa, 0),
+        "inv": projetar_inv(1, aporte, taxa, 0, com_pgbl=False),
+        "com_pgbl_0": projetar_inv(1, aporte, taxa, 0, com_pgbl=True),
+        "com_pgbl_1": projetar_inv(1, aporte, taxa, 1, com_pgbl=True),
+    }
+
+    atlas = np.lib.format.open_memmap(
+        diretorio / "atlas.npy",
+        mode="w+",
+        dtype=np.float64,
+        shape=(len(CAMADAS), len(APORTES), len(TAXAS), ANOS_PROJECAO),
+    )
+    for i, camada in enumerate(CAMADAS):
+        nome, tipo = camada.rsplit("_", 1)
+        coluna = "Saldo Acumulado" if tipo == "saldo" else "Renda Passiva Mensal"
+        atlas[i] = projecoes[nome][coluna]
+    atlas.flush()
+
+    eixos = {
+        "camadas": CAMADAS,
+        "aportes": APORTES.tolist(),
+        "taxas": TAXAS.tolist(),
+        "anos": ANOS_PROJECAO,
+    }
+    with open(diretorio / "atlas.json", "w", encoding="utf-8") as arquivo:
+        json.dump(eixos, arquivo)
+
+    _atlas.clear()
+
+    return diretorio
+
+
+def carregar_atlas(diretorio=None):
+    """Abre o atlas em modo somente leitura (``mmap``). Retorna None se não existir."""
+    diretorio = Path(diretorio or diretorio_padrao())
+    if diretorio in _atlas:
+        return _atlas[diretorio]
+
+    try:
+        with open(diretorio / "atlas.json", encoding="utf-8") as arquivo:
+            eixos = json.load(arquivo)
+        dados = np.load(diretorio / "atlas.npy", mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+    _atlas[diretorio] = {
+        "dados": dados,
+        "camadas": {nome: i for i, nome in enumerate(eixos["camadas"])},
+        "aportes": np.asarray(eixos["aportes"]),
+        "taxas": np.asarray(eixos["taxas"]),
+        "anos": eixos["anos"],
+    }
+    return _atlas[diretorio]
+
+
+def _indices(eixo, valores):
+    """Índices e pesos da interpolação linear numa grade uniforme."""
+    posicao = (np.asarray(valores, dtype=float) - eixo[0]) / (eixo[1] - eixo[0])
+    inferior = np.clip(np.floor(posicao).astype(int), 0, len(eixo) - 2)
+    return inferior, posicao - inferior
+
+
+def _interpolar(atlas, camada, aportes, taxa_anual, anos):
+    dados = atlas["dados"][atlas["camadas"][camada]]
+    i_aporte, p_aporte = _indices(atlas["aportes"], aportes)
+    i_taxa, p_taxa = _indices(atlas["taxas"], [taxa_anual])
+    i_taxa, p_taxa = i_taxa[0], p_taxa[0]
+    i_anos = np.asarray(anos) - 1
+
+    # Bloco (aportes x anos) nas duas taxas vizinhas
+    blocos = dados[:, [i_taxa, i_taxa + 1]][:, :, i_anos]
+    por_taxa = blocos[:, 0] * (1 - p_taxa) + blocos[:, 1] * p_taxa
+    valores = (
+        por_taxa[i_aporte] * (1 - p_aporte[:, None])
+        + por_taxa[i_aporte + 1] * p_aporte[:, None]
+    )
+    return valores.T  # anos x aportes
+
+
+def consultar_atlas(estrategia, coluna, taxa_anual, anos, aportes, dirpf=0):
+    """Monta a tabela de sensibilidade de uma estratégia a partir do atlas.
+
+    Args:
+        estrategia (str): "conservadora", "moderada" ou "agressiva".
+        coluna (str): "Saldo Acumulado" ou "Renda Passiva Mensal".
+        taxa_anual (float): A taxa de juros anual (em porcentagem).
+        anos (list): Anos exibidos nas linhas.
+        aportes (list): Aportes (%) exibidos nas colunas.
+        dirpf (float): Diferença de IRPF por unidade de renda (só na agressiva).
+
+    Returns:
+        pandas.DataFrame | None: A tabela no formato de ``criar_heatmap``, ou
+        None quando o atlas não existe ou os parâmetros estão fora da grade.
+    """
+    atlas = carregar_atlas()
+    if atlas is None:
+        return None
+
+    aportes_atlas, taxas_atlas = atlas["aportes"], atlas["taxas"]
+    if (
+        min(aportes) < aportes_atlas[0]
+        or max(aportes) > aportes_atlas[-1]
+        or not taxas_atlas[0] <= taxa_anual <= taxas_atlas[-1]
+        or min(anos) < 1
+        or max(anos) > atlas["anos"]
+    ):
+        return None
+
+    tipo = COLUNA_CAMADA[coluna]
+
+    def camada(nome):
+        return _interpolar(atlas, f"{nome}_{tipo}", aportes, taxa_anual, anos)
+
+    if estrategia == "conservadora":
+        valores = camada("inv")
+    elif estrategia == "moderada":
+        valores = camada("prev")
+    elif dirpf == 0:
+        valores = camada("prev") + camada("inv")
+    else:
+        com_pgbl_0 = camada("com_pgbl_0")
+        valores = (
+            camada("prev") + com_pgbl_0 + dirpf * (camada("com_pgbl_1") - com_pgbl_0)
+        )
+
+    dados = {"Anos": anos}
+    for j, aporte in enumerate(aportes):
+        dados[f"Aporte {aporte}%"] = valores[:, j]
+
+    return pd.DataFrame(dados)
+
+
+if __name__ == "__main__":
+    destino = construir_atlas(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"Atlas gravado em {destino}")
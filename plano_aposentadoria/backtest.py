@@ -0,0 +1,242 @@
+"""Backtest das estratégias em janelas móveis sobre séries históricas locais.
+
+Em vez de uma taxa anual constante, avalia o plano iniciado em cada mês da série
+histórica: acumulação por ``anos_acumulacao`` anos e, em seguida, usufruto de
+uma renda mensal corrigida pela inflação por até ``anos_usufruto`` anos.
+
+A série é lida de um CSV local (``dados/historico_mensal.csv`` ao lado deste
+arquivo, ou o caminho em ``PLANEJAMENTO_HISTORICO``) com uma linha por mês e as
+rentabilidades mensais em porcentagem::
+
+    data,cdi,ipca,ibov
+    1994-07-01,6.89,6.84,...
+
+O app só lê esse arquivo. Para atualizá-lo, ``python backtest.py`` baixa do SGS
+do Banco Central o CDI e o IPCA mensais e o Ibovespa diário (a variação mensal
+sai do fechamento do último dia de cada mês).
+
+Todas as janelas são avaliadas de uma vez: com os produtos acumulados G (fator
+de crescimento) e I (inflação), o saldo de cada janela é um produto escalar
+entre os aportes e uma visão ``sliding_window_view`` de 1/G, e o usufruto usa
+somas prefixadas de I/G, sem copiar janelas.
+"""
+
+import json
+import os
+from pathlib import Path
+from urllib.request import urlopen
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from motor import MULTIPLICADOR_ANUAL, impostos
+
+# Séries do SGS/BCB: CDI e IPCA mensais (% a.m.) e Ibovespa diário (pontos)
+SERIES_SGS = {"cdi": 4391, "ipca": 433}
+SERIE_IBOVESPA = 7
+URL_SGS = (
+    "https://api.bcb.gov.br/dados/serie/bcdata.sgs.{codigo}/dados"
+    "?formato=json&dataInicial={inicio}&dataFinal={fim}"
+)
+INICIO_HISTORICO = "1994-07-01"  # Plano Real
+ANOS_POR_CONSULTA = 10  # O SGS limita as séries diárias a 10 anos por consulta
+
+
+def caminho_padrao():
+    return Path(
+        os.environ.get(
+            "PLANEJAMENTO_HISTORICO",
+            Path(__file__).resolve().parent / "dados" / "historico_mensal.csv",
+        )
+    )
+
+
+def carregar_historico(caminho=None):
+    """Lê as rentabilidades mensais (em fração) indexadas pelo mês."""
+    df = pd.read_csv(caminho or caminho_padrao(), parse_dates=["data"])
+    return df.set_index("data").sort_index() / 100
+
+
+def consultar_sgs(codigo, inicio, fim, timeout=10):
+    """Valores de uma série do SGS entre duas datas, em janelas de 10 anos."""
+    pontos = []
+    comeco = pd.Timestamp(inicio)
+    while comeco <= fim:
+        final = min(comeco + pd.DateOffset(years=ANOS_POR_CONSULTA, days=-1), fim)
+        url = URL_SGS.format(
+            codigo=codigo,
+            inicio=comeco.strftime("%d/%m/%Y"),
+            fim=final.strftime("%d/%m/%Y"),
+        )
+        with urlopen(url, timeout=timeout) as resposta:
+            pontos.extend(json.load(resposta))
+        comeco = final + pd.Timedelta(days=1)
+
+    return pd.Series(
+        [float(ponto["valor"]) for ponto in pontos],
+        index=pd.to_datetime([ponto["data"] for ponto in pontos], dayfirst=True),
+    )
+
+
+def baixar_historico(caminho=None, fim=None, timeout=10):
+    """Baixa CDI, IPCA e Ibovespa do SGS/BCB e grava o CSV do histórico.
+
+    Ferramenta de atualização (``python backtest.py``); o app não acessa a rede.
+    """
+    inicio = pd.Timestamp(INICIO_HISTORICO)
+    fim = pd.Timestamp(fim or pd.Timestamp.today().normalize())
+    series = {
+        coluna: consultar_sgs(codigo, inicio, fim, timeout)
+        for coluna, codigo in SERIES_SGS.items()
+    }
+
+    # Variação mensal do Ibovespa pelo último fechamento de cada mês, a partir
+    # do mês anterior ao início para que o primeiro mês tenha variação
+    pontos = consultar_sgs(
+        SERIE_IBOVESPA, inicio - pd.DateOffset(months=1), fim, timeout
+    )
+    fechamento = pontos.resample("MS").last()
+    series["ibov"] = (fechamento.pct_change() * 100).loc[inicio:]
+
+    df = pd.DataFrame(series).dropna().round(4).rename_axis("data")
+    caminho = Path(caminho or caminho_padrao())
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(caminho)
+    return df
+
+
+def historico_disponivel(caminho=None):
+    """Indica se há série local."""
+    return Path(caminho or caminho_padrao()).exists()
+
+
+def retornos_carteira(historico, pesos):
+    """Rentabilidade mensal de uma carteira rebalanceada todo mês.
+
+    Args:
+        pesos (dict): Peso de cada coluna, ex.: {"cdi": 0.7, "ibov": 0.3}.
+    """
+    return sum(historico[coluna] * peso for coluna, peso in pesos.items())
+
+
+def aportes_mensais(renda_mensal, aporte, estrategia, anos):
+    """Aportes de cada mês do plano, seguindo ``tabela_inv``/``tabela_prev``.
+
+    Na estratégia agressiva a diferença de IRPF é reinvestida a partir do
+    segundo ano; na moderada só o PGBL (até 12%) é aportado.
+    """
+    ir = impostos(renda_mensal, aporte)
+    aporte_total = renda_mensal * MULTIPLICADOR_ANUAL * aporte / 100
+    ano = np.arange(anos)
+
+    if estrategia == "conservadora":
+        anuais = np.full(anos, aporte_total)
+    elif estrategia == "moderada":
+        anuais = np.full(anos, float(ir["PGBL"]))
+    else:
+        anuais = aporte_total + np.where(ano >= 1, float(ir["dirpf"]), 0)
+
+    return np.repeat(anuais / 12, 12)
+
+
+def backtest(
+    retornos,
+    inflacao,
+    aportes,
+    renda_mensal,
+    anos_usufruto=10,
+):
+    """Acumulação e usufruto para cada mês de início da série.
+
+    Args:
+        retornos (pandas.Series): Rentabilidade mensal da carteira (fração).
+        inflacao (pandas.Series): IPCA mensal (fração), no mesmo índice.
+        aportes (array): Aporte de cada mês da acumulação.
+        renda_mensal (float): Renda retirada no usufruto, em reais do início do
+            usufruto e corrigida pelo IPCA.
+        anos_usufruto (int): Meses observados no usufruto = 12 * anos_usufruto.
+
+    Returns:
+        pandas.DataFrame: Uma linha por mês de início com o saldo nominal e real
+        (em reais do início) e os meses de usufruto sem esgotar o saldo
+        (limitado à janela observada).
+    """
+    r = retornos.to_numpy(dtype=float)
+    p = inflacao.to_numpy(dtype=float)
+    aportes = np.asarray(aportes, dtype=float)
+    n, d = len(aportes), 12 * anos_usufruto
+    inicios = len(r) - n - d + 1
+    if inicios <= 0:
+        raise ValueError(
+            f"A série tem {len(r)} meses; são necessários pelo menos {n + d}."
+        )
+
+    # Produtos acumulados com G[0] = I[0] = 1
+    G = np.concatenate([[1.0], np.cumprod(1 + r)])
+    I = np.concatenate([[1.0], np.cumprod(1 + p)])
+
+    # Acumulação: aporte no fim de cada mês, saldo = G[s+n] * sum(c_k / G[s+k+1])
+    janelas = sliding_window_view(1 / G[1:], n)[:inicios]
+    s = np.arange(inicios)
+    saldo = G[s + n] * (janelas @ aportes)
+    saldo_real = saldo / (I[s + n] / I[s])
+
+    # Usufruto: retirada w * I[u+j+1]/I[u] no fim do mês j, a partir de u = s + n.
+    # O saldo esgota quando w/I[u] * sum(I/G) supera saldo/G[u].
+    u = s + n
+    prefixo = np.concatenate([[0.0], np.cumsum(I[1:] / G[1:])])
+    consumido = sliding_window_view(prefixo[1:], d)[u] - prefixo[u][:, None]
+    esgotado = renda_mensal / I[u][:, None] * consumido > (saldo / G[u])[:, None]
+    meses = np.where(esgotado.any(axis=1), esgotado.argmax(axis=1), d)
+
+    return pd.DataFrame(
+        {
+            "Início": retornos.index[:inicios],
+            "Saldo Acumulado": saldo,
+            "Saldo Real": saldo_real,
+            "Meses de Usufruto": meses,
+            "Anos de Usufruto": meses / 12,
+        }
+    )
+
+
+def resumo_backtest(df):
+    """Pior, mediana e melhor janela pelo saldo real acumulado."""
+    ordem = df.sort_values("Saldo Real").reset_index(drop=True)
+    linhas = [0, (len(ordem) - 1) // 2, len(ordem) - 1]
+    resumo = ordem.iloc[linhas].copy()
+    resumo.insert(0, "Cenário", ["Pior", "Mediana", "Melhor"])
+    resumo["Início"] = resumo["Início"].dt.strftime("%m/%Y")
+    return resumo.reset_index(drop=True)
+
+
+def taxa_sucesso(df, anos_usufruto=10):
+    """Fração das janelas em que o saldo durou todo o usufruto observado."""
+    return float((df["Meses de Usufruto"] >= 12 * anos_usufruto).mean())
+
+
+def backtest_estrategia(
+    renda_mensal,
+    aporte,
+    estrategia,
+    pesos,
+    anos_acumulacao=10,
+    anos_usufruto=10,
+    caminho=None,
+):
+    """Backtest de uma estratégia do app sobre a série histórica local."""
+    historico = carregar_historico(caminho)
+    aportes = aportes_mensais(renda_mensal, aporte, estrategia, anos_acumulacao)
+    return backtest(
+        retornos_carteira(historico, pesos),
+        historico["ipca"],
+        aportes,
+        renda_mensal,
+        anos_usufruto=anos_usufruto,
+    )
+
+
+if __name__ == "__main__":
+    historico = baixar_historico()
+    print(f"{len(historico)} meses gravados em {caminho_padrao()}")
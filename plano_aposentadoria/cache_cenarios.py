@@ -0,0 +1,197 @@
+"""Cache persistente de cenários compartilhado entre processos.
+
+Vários processos do Streamlit atrás de um balanceador de carga podem
+compartilhar o mesmo arquivo SQLite. O cache é opcional: só é ativado quando a
+variável de ambiente ``PLANEJAMENTO_CACHE_DB`` aponta para o arquivo do banco.
+O tamanho máximo (em MB) é controlado por ``PLANEJAMENTO_CACHE_MAX_MB``.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+TAMANHO_MAXIMO_PADRAO = 256  # MB
+
+
+def _caminho_banco():
+    return os.environ.get("PLANEJAMENTO_CACHE_DB")
+
+
+def _tamanho_maximo():
+    megabytes = os.environ.get("PLANEJAMENTO_CACHE_MAX_MB", TAMANHO_MAXIMO_PADRAO)
+    return int(float(megabytes) * 2**20)
+
+
+def _conectar(caminho):
+    """Abre uma conexão em modo WAL (leituras concorrentes com uma escrita)."""
+    conexao = sqlite3.connect(caminho, timeout=30, isolation_level=None)
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute("PRAGMA synchronous=NORMAL")
+    conexao.execute("""
+        CREATE TABLE IF NOT EXISTS cenarios (
+            chave TEXT PRIMARY KEY,
+            valor BLOB NOT NULL,
+            tamanho INTEGER NOT NULL,
+            acesso REAL NOT NULL
+        )
+        """)
+    conexao.execute("CREATE INDEX IF NOT EXISTS idx_acesso ON cenarios (acesso)")
+    return conexao
+
+
+def _canonico(valor):
+    """Converte os argumentos numa estrutura JSON estável para o hash.
+
+    Números são normalizados para float (``12`` e ``12.0`` geram a mesma chave) e
+    DataFrames são representados pelo hash do conteúdo.
+    """
+    if isinstance(valor, pd.DataFrame):
+        conteudo = pd.util.hash_pandas_object(valor, index=True).values
+        return {
+            "colunas": [str(c) for c in valor.columns],
+            "hash": hashlib.sha256(conteudo.tobytes()).hexdigest(),
+        }
+    if isinstance(valor, np.ndarray):
+        return {
+            "shape": list(valor.shape),
+            "hash": hashlib.sha256(valor.tobytes()).hexdigest(),
+        }
+    if isinstance(valor, (bool, np.bool_)):
+        return bool(valor)
+    if isinstance(valor, (int, float, np.integer, np.floating)):
+        return repr(float(valor))
+    if isinstance(valor, (list, tuple)):
+        return [_canonico(v) for v in valor]
+    if isinstance(valor, dict):
+        return {str(k): _canonico(v) for k, v in sorted(valor.items())}
+    return repr(valor)
+
+
+def chave_cenario(nome, versao, args, kwargs):
+    """Gera o hash canônico dos argumentos e da versão das tabelas de impostos."""
+    dados = {
+        "funcao": nome,
+        "versao": versao,
+        "args": _canonico(list(args)),
+        "kwargs": _canonico(kwargs),
+    }
+    texto = json.dumps(dados, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+def _ler(caminho, chave):
+    conexao = _conectar(caminho)
+    try:
+        linha = conexao.execute(
+            "SELECT valor FROM cenarios WHERE chave = ?", (chave,)
+        ).fetchone()
+        if linha is None:
+            return None
+        conexao.execute(
+            "UPDATE cenarios SET acesso = ? WHERE chave = ?", (time.time(), chave)
+        )
+        return linha[0]
+    finally:
+        conexao.close()
+
+
+def _gravar(caminho, chave, blob):
+    """Grava o resultado e remove os cenários menos usados até caber no limite."""
+    limite = _tamanho_maximo()
+    if len(blob) > limite:
+        return
+
+    conexao = _conectar(caminho)
+    try:
+        conexao.execute("BEGIN IMMEDIATE")
+        conexao.execute(
+            "INSERT OR REPLACE INTO cenarios (chave, valor, tamanho, acesso) "
+            "VALUES (?, ?, ?, ?)",
+            (chave, blob, len(blob), time.time()),
+        )
+        total = conexao.execute(
+            "SELECT COALESCE(SUM(tamanho), 0) FROM cenarios"
+        ).fetchone()[0]
+        if total > limite:
+            antigos = conexao.execute(
+                "SELECT chave, tamanho FROM cenarios WHERE chave != ? ORDER BY acesso",
+                (chave,),
+            )
+            remover = []
+            for chave_antiga, tamanho in antigos:
+                if total <= limite:
+                    break
+                remover.append((chave_antiga,))
+                total -= tamanho
+            conexao.executemany("DELETE FROM cenarios WHERE chave = ?", remover)
+        conexao.execute("COMMIT")
+    except sqlite3.Error:
+        if conexao.in_transaction:
+            conexao.execute("ROLLBACK")
+        raise
+    finally:
+        conexao.close()
+
+
+def cache_persistente(versao):
+    """Decorador que guarda o resultado da função no cache SQLite compartilhado.
+
+    Args:
+        versao (str): Versão das tabelas de INSS/IRPF. Mudar a versão invalida
+            os cenários já gravados.
+
+    Returns:
+        function: O decorador. Sem ``PLANEJAMENTO_CACHE_DB`` a função é chamada
+        diretamente. Falhas do banco nunca interrompem o cálculo.
+    """
+
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            caminho = _caminho_banco()
+            if not caminho:
+                return funcao(*args, **kwargs)
+
+            chave = chave_cenario(funcao.__qualname__, versao, args, kwargs)
+            try:
+                blob = _ler(caminho, chave)
+                if blob is not None:
+                    return pickle.loads(blob)
+            except (sqlite3.Error, pickle.UnpicklingError):
+                pass
+
+            resultado = funcao(*args, **kwargs)
+
+            try:
+                _gravar(
+                    caminho,
+                    chave,
+                    pickle.dumps(resultado, protocol=pickle.HIGHEST_PROTOCOL),
+                )
+            except sqlite3.Error:
+                pass
+
+            return resultado
+
+        return envoltorio
+
+    return decorador
+
+
+def limpar_cache():
+    """Remove todos os cenários gravados no cache."""
+    caminho = _caminho_banco()
+    if not caminho:
+        return
+    conexao = _conectar(caminho)
+    try:
+        conexao.execute("DELETE FROM cenarios")
+    finally:
+        conexao.close()
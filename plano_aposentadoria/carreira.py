@@ -0,0 +1,184 @@
+"""Trajetória salarial por tabela de carreira e projeções com renda variável.
+
+``tabela_prev`` e ``tabela_inv`` usam a mesma ``renda_mensal`` nos 30 anos. Em
+carreiras com tabela (serviço público), o salário de cada ano segue a posição
+na tabela (nível e padrão), que muda a cada interstício, e os reajustes
+gerais. Aqui a posição de cada servidor em cada ano sai de um único
+``searchsorted`` sobre os interstícios acumulados, e os impostos, a dedução do
+PGBL e os aportes de cada ano são recalculados por ``motor.impostos`` sobre a
+matriz (servidores x anos), sem laço em Python.
+
+As tabelas têm as colunas "Nível", "Padrão", "Vencimento" e "Interstício" (anos
+de permanência na posição antes da próxima), em ordem de progressão.
+"""
+
+import numpy as np
+import pandas as pd
+
+from motor import (
+    CARENCIA_PGBL,
+    LIMITE_PGBL,
+    MULTIPLICADOR_ANUAL,
+    acumular,
+    impostos,
+)
+
+COLUNAS_TABELA = ["Nível", "Padrão", "Vencimento", "Interstício"]
+
+
+def tabela_geometrica(
+    vencimento_inicial,
+    niveis=1,
+    padroes=16,
+    step=0.039,
+    step_nivel=0.0,
+    intersticio=1.5,
+):
+    """Tabela com ``step`` constante entre padrões e ``step_nivel`` entre níveis.
+
+    O padrão segue o PCCTAE: 16 padrões com step de 3,9% a cada 18 meses.
+    """
+    nivel, padrao = np.divmod(np.arange(niveis * padroes), padroes)
+    return pd.DataFrame(
+        {
+            "Nível": nivel + 1,
+            "Padrão": padrao + 1,
+            "Vencimento": vencimento_inicial
+            * (1 + step) ** padrao
+            * (1 + step_nivel) ** nivel,
+            "Interstício": float(intersticio),
+        }
+    )
+
+
+def ler_tabela(caminho):
+    """Lê uma tabela de carreira de um CSV com as colunas de ``COLUNAS_TABELA``.
+
+    Raises:
+        ValueError: Se faltar alguma coluna, a tabela estiver vazia ou o
+            vencimento e o interstício não forem números positivos.
+    """
+    tabela = pd.read_csv(caminho)
+    faltando = set(COLUNAS_TABELA) - set(tabela.columns)
+    if faltando:
+        raise ValueError(f"Colunas ausentes na tabela de carreira: {sorted(faltando)}")
+    if tabela.empty:
+        raise ValueError("A tabela de carreira não tem nenhuma linha")
+    for coluna in ["Vencimento", "Interstício"]:
+        valores = pd.to_numeric(tabela[coluna], errors="coerce")
+        if valores.isna().any() or (valores <= 0).any():
+            raise ValueError(
+                f"A coluna {coluna} da tabela de carreira deve ter só números "
+                "positivos"
+            )
+        tabela[coluna] = valores
+    return tabela[COLUNAS_TABELA].reset_index(drop=True)
+
+
+def posicoes_carreira(tabela, anos, posicao_inicial=0, tempo_na_posicao=0.0):
+    """Índice da posição na tabela de cada servidor em cada ano.
+
+    Args:
+        tabela (pandas.DataFrame): Tabela de carreira.
+        anos (int): Anos projetados.
+        posicao_inicial (array): Posição (linha da tabela) de cada servidor hoje.
+        tempo_na_posicao (array): Anos já cumpridos na posição atual.
+
+    Returns:
+        numpy.ndarray: Matriz (servidores x anos) de índices da tabela.
+    """
+    # Tempo de carreira em que cada posição termina (a última não termina)
+    limites = np.cumsum(tabela["Interstício"].to_numpy(dtype=float))[:-1]
+    inicio_posicao = np.r_[0.0, limites]
+
+    posicao_inicial = np.atleast_1d(np.asarray(posicao_inicial, dtype=int))
+    tempo = (
+        inicio_posicao[posicao_inicial] + np.asarray(tempo_na_posicao, dtype=float)
+    )[:, None] + np.arange(anos)
+    return np.searchsorted(limites, tempo, side="right")
+
+
+def salarios_carreira(
+    tabela, anos, posicao_inicial=0, tempo_na_posicao=0.0, reajuste=0.0
+):
+    """Salário mensal de cada servidor em cada ano.
+
+    Args:
+        reajuste (float | array): Reajuste geral da tabela em cada ano (em
+            fração); um array com ``anos`` elementos permite índices variáveis.
+            O primeiro ano usa a tabela atual.
+
+    Returns:
+        numpy.ndarray: Matriz (servidores x anos) com o salário mensal.
+    """
+    posicao = posicoes_carreira(tabela, anos, posicao_inicial, tempo_na_posicao)
+    reajuste = np.broadcast_to(np.asarray(reajuste, dtype=float), (anos,)).copy()
+    reajuste[0] = 0.0
+    fator = np.cumprod(1 + reajuste)
+    return tabela["Vencimento"].to_numpy(dtype=float)[posicao] * fator
+
+
+def projetar_carreira(
+    salarios,
+    aporte,
+    taxa_anual,
+    estrategia="agressiva",
+    multiplicador=MULTIPLICADOR_ANUAL,
+    escala_faixas=1.0,
+):
+    """Projeções de ``tabela_prev``/``tabela_inv`` com o salário de cada ano.
+
+    A restituição do IRPF de um ano (``dirpf``) chega no ano seguinte: reduz o
+    custo do PGBL na moderada e é investida na agressiva, como no motor.
+
+    Args:
+        salarios (array): Matriz (servidores x anos) com o salário mensal.
+        aporte (array): Aporte de cada servidor (em % da renda).
+        taxa_anual (float): A taxa de juros anual (em porcentagem).
+        estrategia (str): "conservadora", "moderada" ou "agressiva".
+
+    Returns:
+        dict: Arrays (servidores x anos) com "Renda Mensal", "IRPF",
+        "dirpf", "Saldo PGBL", "Saldo Investimentos" e as colunas de
+        ``motor.COLUNAS`` da estratégia.
+    """
+    salarios = np.atleast_2d(np.asarray(salarios, dtype=float))
+    taxa_aporte = np.atleast_1d(np.asarray(aporte, dtype=float))[:, None] / 100
+    ano = np.arange(1, salarios.shape[-1] + 1)
+    renda_anual = salarios * multiplicador
+
+    if estrategia == "conservadora":
+        ir = impostos(salarios, 0.0, multiplicador, escala_faixas)
+        aportes_prev = np.zeros_like(salarios)
+        custo_prev = aportes_prev
+        aportes_inv = renda_anual * taxa_aporte
+    else:
+        ir = impostos(salarios, 100 * taxa_aporte, multiplicador, escala_faixas)
+        restituicao = np.zeros_like(salarios)
+        restituicao[:, 1:] = ir["dirpf"][:, :-1]
+        aportes_prev = ir["PGBL"]
+        custo_prev = aportes_prev - restituicao
+        aportes_inv = np.zeros_like(salarios)
+        if estrategia == "agressiva":
+            fora_pgbl = taxa_aporte - np.minimum(taxa_aporte, LIMITE_PGBL)
+            aportes_inv = renda_anual * fora_pgbl + restituicao
+
+    taxa = np.asarray(taxa_anual, dtype=float)
+    saldo_prev = acumular(aportes_prev, taxa)
+    saldo_inv = acumular(aportes_inv, taxa)
+    renda_passiva = (
+        np.where(ano > CARENCIA_PGBL, saldo_prev, 0) + np.where(ano > 1, saldo_inv, 0)
+    ) * (taxa / 100)
+
+    return {
+        "Anos": ano,
+        "Renda Mensal": salarios,
+        "IRPF": ir["IRPF"],
+        "dirpf": ir["dirpf"],
+        "Saldo PGBL": saldo_prev,
+        "Saldo Investimentos": saldo_inv,
+        "Valor Aportado": np.cumsum(custo_prev + aportes_inv, axis=-1),
+        "Saldo Acumulado": saldo_prev + saldo_inv,
+        "Renda Passiva Anual": renda_passiva,
+        "Renda Passiva Mensal": renda_passiva / 12,
+    }
@@ -0,0 +1,196 @@
+"""Carteira com várias classes de ativos, glide path por idade e rebalanceamento.
+
+``tabela_inv`` capitaliza um único ``taxa_anual`` sobre um saldo. Aqui o saldo
+é dividido entre classes de ativos cujos pesos-alvo mudam com a idade (glide
+path). A cada ano as posições rendem, o aporte entra nos pesos-alvo e a
+carteira é rebalanceada todo ano ou só quando algum peso se afasta mais que a
+``banda`` do alvo. O volume vendido paga ``custo`` (corretagem e imposto sobre
+o ganho, simplificados numa alíquota sobre a venda).
+
+Os cálculos são vetorizados sobre ativos e cenários, e as dimensões iniciais
+dos pesos e dos retornos se combinam por broadcasting. Assim, variantes de
+glide path (eixo extra nos pesos) e caminhos aleatórios (eixo dos retornos)
+são simulados juntos. O laço é só sobre os anos, porque o rebalanceamento por
+banda depende da trajetória.
+"""
+
+import numpy as np
+import pandas as pd
+
+from estocastico import retornos_correlacionados
+from motor import ANOS_PROJECAO, MULTIPLICADOR_ANUAL
+
+CLASSES = ["Tesouro IPCA+", "CDI", "Ações"]
+
+# Premissas nominais anuais (%) de cada classe e correlação entre elas
+MEDIAS = np.array([11.0, 10.5, 13.0])
+VOLATILIDADES = np.array([8.0, 1.0, 22.0])
+CORRELACAO = np.array(
+    [
+        [1.0, 0.2, 0.3],
+        [0.2, 1.0, 0.0],
+        [0.3, 0.0, 1.0],
+    ]
+)
+
+# Parcela da renda fixa que fica no Tesouro IPCA+ (o resto fica no CDI)
+FRACAO_IPCA = 0.7
+
+
+def _pesos_acoes(acoes):
+    """Pesos das classes a partir da fração em ações."""
+    acoes = np.clip(np.asarray(acoes, dtype=float), 0, 1)
+    renda_fixa = 1 - acoes
+    return np.stack(
+        [renda_fixa * FRACAO_IPCA, renda_fixa * (1 - FRACAO_IPCA), acoes], axis=-1
+    )
+
+
+def glide_constante(idades, idade_aposentadoria, acoes=0.5):
+    """Mesma alocação em todas as idades."""
+    return _pesos_acoes(np.full(np.shape(idades), acoes))
+
+
+def glide_idade(idades, idade_aposentadoria, base=110):
+    """Regra "``base`` menos a idade" em ações, entre 20% e 90%."""
+    return _pesos_acoes(np.clip((base - np.asarray(idades)) / 100, 0.2, 0.9))
+
+
+def glide_alvo(idades, idade_aposentadoria, inicio=0.8, fim=0.3):
+    """Ações caem linearmente de ``inicio`` a ``fim`` até a aposentadoria."""
+    idades = np.asarray(idades, dtype=float)
+    progresso = (idades - idades[0]) / max(idade_aposentadoria - idades[0], 1)
+    return _pesos_acoes(inicio + (fim - inicio) * np.clip(progresso, 0, 1))
+
+
+GLIDE_PATHS = {
+    "Constante 50%": glide_constante,
+    "110 menos a idade": glide_idade,
+    "Data-alvo": glide_alvo,
+}
+
+
+def pesos_glide_paths(idade_inicial, anos=ANOS_PROJECAO, variantes=None):
+    """Pesos-alvo (variantes x anos x ativos) de cada glide path."""
+    variantes = list(GLIDE_PATHS) if variantes is None else list(variantes)
+    idades = idade_inicial + np.arange(anos)
+    return np.stack(
+        [GLIDE_PATHS[nome](idades, idade_inicial + anos) for nome in variantes]
+    )
+
+
+def retornos_anuais(retornos_mensais):
+    """Compõe um tensor (... x meses x ativos) em (... x anos x ativos)."""
+    *inicio, meses, ativos = retornos_mensais.shape
+    fatores = (1 + retornos_mensais).reshape(*inicio, meses // 12, 12, ativos)
+    return fatores.prod(axis=-2) - 1
+
+
+def simular_carteira(
+    aportes, retornos, pesos, rebalanceamento="anual", banda=0.05, custo=0.0
+):
+    """Evolução da carteira ano a ano.
+
+    Args:
+        aportes (array): Aportes de cada ano no último eixo.
+        retornos (array): Rentabilidades anuais (em fração), (... x anos x ativos).
+        pesos (array): Pesos-alvo, (... x anos x ativos).
+        rebalanceamento (str): "anual", "banda" ou "nenhum".
+        banda (float): Desvio máximo de um peso antes de rebalancear.
+        custo (float): Custo proporcional sobre o volume vendido.
+
+    Returns:
+        dict: "Saldo Acumulado" e "Custos" de cada ano e as "Posições" finais.
+    """
+    aportes = np.asarray(aportes, dtype=float)
+    retornos = np.asarray(retornos, dtype=float)
+    pesos = np.asarray(pesos, dtype=float)
+    anos = aportes.shape[-1]
+
+    forma = np.broadcast_shapes(
+        aportes.shape[:-1] + (1,), retornos.shape[:-2] + (1,), pesos.shape[:-2] + (1,)
+    )[:-1]
+    posicoes = np.zeros(forma + (pesos.shape[-1],))
+    saldos = np.zeros(forma + (anos,))
+    custos = np.zeros(forma + (anos,))
+
+    for ano in range(anos):
+        alvo = pesos[..., ano, :]
+        posicoes = posicoes * (1 + retornos[..., ano, :])
+        posicoes = posicoes + aportes[..., ano, None] * alvo
+        total = posicoes.sum(axis=-1, keepdims=True)
+
+        if rebalanceamento == "anual":
+            rebalancear = np.ones(forma + (1,), dtype=bool)
+        elif rebalanceamento == "banda":
+            atual = posicoes / np.where(total > 0, total, 1)
+            rebalancear = np.abs(atual - alvo).max(axis=-1, keepdims=True) > banda
+        else:
+            rebalancear = np.zeros(forma + (1,), dtype=bool)
+
+        # Vendas: o que está acima do alvo; o custo sai do total rebalanceado
+        vendas = np.maximum(posicoes - alvo * total, 0).sum(axis=-1, keepdims=True)
+        pago = np.where(rebalancear, custo * vendas, 0)
+        posicoes = np.where(rebalancear, alvo * (total - pago), posicoes)
+
+        saldos[..., ano] = posicoes.sum(axis=-1)
+        custos[..., ano] = pago[..., 0]
+
+    return {"Saldo Acumulado": saldos, "Custos": custos, "Posições": posicoes}
+
+
+def aportes_investimento(renda_mensal, aporte, anos=ANOS_PROJECAO):
+    """Aportes anuais da estratégia conservadora (os mesmos de ``tabela_inv``)."""
+    aporte_anual = renda_mensal * MULTIPLICADOR_ANUAL * aporte / 100
+    return np.full(anos, float(aporte_anual))
+
+
+def comparar_glide_paths(
+    renda_mensal,
+    aporte,
+    idade_inicial,
+    anos=ANOS_PROJECAO,
+    variantes=None,
+    rebalanceamento="anual",
+    banda=0.05,
+    custo=0.0,
+    n_caminhos=2000,
+    semente=0,
+    medias=MEDIAS,
+    volatilidades=VOLATILIDADES,
+    correlacao=CORRELACAO,
+):
+    """Resumo de cada glide path sobre os mesmos caminhos aleatórios.
+
+    Returns:
+        pandas.DataFrame: Saldo com as rentabilidades médias, mediana e pior 5%
+        dos caminhos e custo médio de rebalanceamento, ao fim de ``anos``.
+    """
+    variantes = list(GLIDE_PATHS) if variantes is None else list(variantes)
+    pesos = pesos_glide_paths(idade_inicial, anos, variantes)
+    aportes = aportes_investimento(renda_mensal, aporte, anos)
+    opcoes = dict(rebalanceamento=rebalanceamento, banda=banda, custo=custo)
+
+    # Cenário determinístico com a média de cada classe em todos os anos
+    medio = np.broadcast_to(np.asarray(medias) / 100, (anos, len(CLASSES)))
+    esperado = simular_carteira(aportes, medio, pesos, **opcoes)
+
+    rng = np.random.default_rng(semente)
+    mensais = retornos_correlacionados(
+        n_caminhos, 12 * anos, medias, volatilidades, correlacao, rng
+    )
+    # Pesos (variantes x 1 x anos x ativos) contra retornos (caminhos x anos x ativos)
+    caminhos = simular_carteira(
+        aportes, retornos_anuais(mensais), pesos[:, None], **opcoes
+    )
+
+    saldo_final = caminhos["Saldo Acumulado"][..., -1]
+    return pd.DataFrame(
+        {
+            "Glide Path": variantes,
+            "Saldo Esperado": esperado["Saldo Acumulado"][:, -1],
+            "Saldo Mediano": np.median(saldo_final, axis=-1),
+            "Saldo (pior 5%)": np.quantile(saldo_final, 0.05, axis=-1),
+            "Custos Médios": caminhos["Custos"].sum(axis=-1).mean(axis=-1),
+        }
+    )
@@ -0,0 +1,260 @@
+"""Modo exato das projeções em centavos inteiros (int64).
+
+O motor em ``motor.py`` trabalha com floats e só arredonda na exibição
+(``formatar_reais``). Aqui os valores monetários são arrays int64 de centavos e
+as alíquotas e taxas são inteiros em pontos-base (1/10000), de modo que cada
+resultado fecha no centavo. Os pontos de arredondamento (meio para cima, longe
+do zero) são os da folha de pagamento:
+
+* INSS: soma exata das parcelas de cada faixa, arredondada uma vez por mês;
+* IRPF: base do mês vezes a alíquota, arredondada, menos a parcela a deduzir;
+* valores anuais: o valor mensal já arredondado vezes o multiplicador (13,5),
+  arredondado;
+* projeções: os juros de cada ano são creditados arredondados ao centavo.
+
+As operações continuam vetorizadas sobre qualquer eixo de cenários; só os anos
+da projeção são percorridos num laço, porque o arredondamento anual impede a
+fórmula fechada de ``motor.acumular``. Os juros multiplicam o saldo pela taxa
+em pontos-base antes de dividir por 10000, então, com taxas de até 100% a.a.,
+os saldos cabem no int64 até cerca de R$ 9,2 trilhões.
+"""
+
+import numpy as np
+import pandas as pd
+
+from motor import (
+    ANOS_PROJECAO,
+    CARENCIA_PGBL,
+    COLUNAS,
+    FAIXAS_INSS,
+    FAIXAS_IR,
+    LIMITE_PGBL,
+    MULTIPLICADOR_ANUAL,
+)
+
+BASE = 10000  # Pontos-base: alíquotas e taxas como inteiros sobre 10000
+
+
+def dividir(numerador, denominador):
+    """Divisão inteira arredondando a metade para longe do zero."""
+    numerador = np.asarray(numerador, dtype=np.int64)
+    return np.sign(numerador) * ((np.abs(numerador) + denominador // 2) // denominador)
+
+
+def para_centavos(reais):
+    """Converte reais (float) em centavos int64, arredondando meio para cima."""
+    reais = np.asarray(reais, dtype=float)
+    return (np.sign(reais) * np.floor(np.abs(reais) * 100 + 0.5)).astype(np.int64)
+
+
+def para_reais(centavos):
+    return np.asarray(centavos) / 100
+
+
+def pontos_base(fracao):
+    """Converte uma fração (ex.: 0.075) em pontos-base inteiros (750)."""
+    return np.rint(np.asarray(fracao, dtype=float) * BASE).astype(np.int64)
+
+
+def _multiplicador(multiplicador):
+    """Multiplicador anual como fração inteira (13,5 -> 27/2)."""
+    return int(round(multiplicador * 2)), 2
+
+
+def inss(salario_mensal, faixas=FAIXAS_INSS):
+    """Contribuição mensal ao INSS em centavos (salário em centavos)."""
+    salario = np.minimum(
+        np.asarray(salario_mensal, dtype=np.int64), para_centavos(faixas[-1][0])
+    )
+    # Soma exata em (centavos x pontos-base) e um único arredondamento
+    total = np.zeros_like(salario)
+    anterior = 0
+    for faixa, aliquota in faixas:
+        limite = int(para_centavos(faixa))
+        total += np.clip(salario - anterior, 0, limite - anterior) * int(
+            pontos_base(aliquota)
+        )
+        anterior = limite
+    return dividir(total, BASE)
+
+
+def irpf(renda, faixas=FAIXAS_IR):
+    """IRPF mensal em centavos pela tabela progressiva (renda em centavos)."""
+    renda = np.asarray(renda, dtype=np.int64)
+    limites = np.array(
+        [
+            para_centavos(limite) if np.isfinite(limite) else np.iinfo(np.int64).max
+            for limite, _, _ in faixas
+        ]
+    )
+    aliquotas = pontos_base([aliquota for _, aliquota, _ in faixas])
+    deducoes = para_centavos([deducao for _, _, deducao in faixas])
+    faixa = np.searchsorted(limites, renda, side="right")
+    return dividir(renda * aliquotas[faixa], BASE) - deducoes[faixa]
+
+
+def impostos(salario_mensal, aporte, multiplicador=MULTIPLICADOR_ANUAL):
+    """Versão exata de ``motor.impostos``: valores anuais em centavos.
+
+    Args:
+        salario_mensal (array): Salário mensal em reais.
+        aporte (array): Aporte em porcentagem da renda.
+    """
+    salario = para_centavos(salario_mensal)
+    aporte_pb = np.minimum(
+        pontos_base(np.asarray(aporte) / 100), pontos_base(LIMITE_PGBL)
+    )
+    vezes, por = _multiplicador(multiplicador)
+
+    previdencia = dividir(salario * aporte_pb, BASE)
+    inss_mensal = inss(salario)
+    renda_tributavel = salario - inss_mensal - previdencia
+    renda_sem = salario - inss_mensal
+    ir_mensal = irpf(renda_tributavel)
+    ir_sem = irpf(renda_sem)
+
+    def anual(valor):
+        return dividir(valor * vezes, por)
+
+    return {
+        "Renda Anual": anual(salario),
+        "Desconto INSS": anual(inss_mensal),
+        "PGBL": anual(previdencia),
+        "Renda Tributável": anual(renda_tributavel),
+        "IRPF": anual(ir_mensal),
+        "Renda Tributável Sem PGBL": anual(renda_sem),
+        "IRPF Sem PGBL": anual(ir_sem),
+        "dirpf": anual(ir_sem) - anual(ir_mensal),
+    }
+
+
+def acumular(aportes, taxa_anual):
+    """Saldo ano a ano com os juros creditados arredondados ao centavo.
+
+    Args:
+        aportes (array): Aportes de cada ano (centavos) no último eixo.
+        taxa_anual (float | array): A taxa de juros anual (em porcentagem).
+    """
+    aportes = np.asarray(aportes, dtype=np.int64)
+    taxa = pontos_base(np.asarray(taxa_anual) / 100)[..., None]
+    taxa, aportes = np.broadcast_arrays(taxa, aportes)
+    taxa = taxa[..., 0]
+
+    saldo = np.empty_like(aportes)
+    atual = np.zeros(aportes.shape[:-1], dtype=np.int64)
+    for ano in range(aportes.shape[-1]):
+        atual = atual + dividir(atual * taxa, BASE) + aportes[..., ano]
+        saldo[..., ano] = atual
+    return saldo
+
+
+def _renda_passiva(saldo, taxa_anual, anos, carencia):
+    taxa = pontos_base(np.asarray(taxa_anual) / 100)[..., None]
+    renda_anual = np.where(anos > carencia, dividir(saldo * taxa, BASE), 0)
+    return renda_anual, dividir(renda_anual, 12)
+
+
+def _aporte_anual(renda_mensal, fracao_pb, multiplicador):
+    vezes, por = _multiplicador(multiplicador)
+    return dividir(para_centavos(renda_mensal) * vezes * fracao_pb, por * BASE)
+
+
+def projetar_prev(
+    renda_mensal,
+    aporte,
+    taxa_anual,
+    dirpf,
+    anos=ANOS_PROJECAO,
+    multiplicador=MULTIPLICADOR_ANUAL,
+):
+    """Versão exata de ``motor.projetar_prev`` (``dirpf`` em centavos)."""
+    aporte_pb = np.minimum(
+        pontos_base(np.asarray(aporte) / 100), pontos_base(LIMITE_PGBL)
+    )
+    aporte_1, dirpf, taxa_anual = np.broadcast_arrays(
+        _aporte_anual(renda_mensal, aporte_pb, multiplicador),
+        np.asarray(dirpf, dtype=np.int64),
+        np.asarray(taxa_anual, dtype=float),
+    )
+    ano = np.arange(1, anos + 1)
+
+    valor_aportado = aporte_1[..., None] + (ano - 1) * (aporte_1 - dirpf)[..., None]
+    saldo = acumular(np.repeat(aporte_1[..., None], anos, axis=-1), taxa_anual)
+    renda_anual, renda_mensal_passiva = _renda_passiva(
+        saldo, taxa_anual, ano, CARENCIA_PGBL
+    )
+
+    return {
+        "Anos": ano,
+        "Valor Aportado": valor_aportado,
+        "Saldo Acumulado": saldo,
+        "Renda Passiva Anual": renda_anual,
+        "Renda Passiva Mensal": renda_mensal_passiva,
+    }
+
+
+def projetar_inv(
+    renda_mensal,
+    aporte,
+    taxa_anual,
+    dirpf=0,
+    anos=ANOS_PROJECAO,
+    multiplicador=MULTIPLICADOR_ANUAL,
+    com_pgbl=None,
+):
+    """Versão exata de ``motor.projetar_inv`` (``dirpf`` em centavos)."""
+    if com_pgbl is None:
+        com_pgbl = np.asarray(dirpf) != 0
+    aporte_pb = pontos_base(np.asarray(aporte) / 100)
+    prev_pb = np.where(com_pgbl, np.minimum(aporte_pb, pontos_base(LIMITE_PGBL)), 0)
+    aporte_1, dirpf, taxa_anual = np.broadcast_arrays(
+        _aporte_anual(renda_mensal, aporte_pb - prev_pb, multiplicador),
+        np.asarray(dirpf, dtype=np.int64),
+        np.asarray(taxa_anual, dtype=float),
+    )
+    ano = np.arange(1, anos + 1)
+    aporte_inv = aporte_1 + dirpf
+
+    valor_aportado = aporte_1[..., None] + (ano - 1) * aporte_inv[..., None]
+    aportes = np.where(ano == 1, aporte_1[..., None], aporte_inv[..., None])
+    saldo = acumular(aportes, taxa_anual)
+    renda_anual, renda_mensal_passiva = _renda_passiva(saldo, taxa_anual, ano, 1)
+
+    return {
+        "Anos": ano,
+        "Valor Aportado": valor_aportado,
+        "Saldo Acumulado": saldo,
+        "Renda Passiva Anual": renda_anual,
+        "Renda Passiva Mensal": renda_mensal_passiva,
+    }
+
+
+def aportes(renda_mensal, aporte, multiplicador=MULTIPLICADOR_ANUAL):
+    """Versão exata de ``calcular_aporte``: divisão do aporte nos anos 1 e 2.
+
+    Returns:
+        dict: Centavos de "Aporte PGBL", "Aporte Investimentos" e "Total" (um
+        valor por ano, no último eixo).
+    """
+    aporte_pb = pontos_base(np.asarray(aporte) / 100)
+    total = _aporte_anual(renda_mensal, aporte_pb, multiplicador)
+    prev = _aporte_anual(
+        renda_mensal, np.minimum(aporte_pb, pontos_base(LIMITE_PGBL)), multiplicador
+    )
+    dirpf = impostos(renda_mensal, aporte, multiplicador)["dirpf"]
+
+    prev = np.stack(np.broadcast_arrays(prev, prev - dirpf), axis=-1)
+    total = np.stack([total, total], axis=-1)
+    return {
+        "Aporte PGBL": prev,
+        "Aporte Investimentos": total - prev,
+        "Total": total,
+    }
+
+
+def para_dataframe(projecao, em_reais=True):
+    """Tabela de uma projeção exata; com ``em_reais=False`` mantém os centavos."""
+    df = pd.DataFrame({coluna: projecao[coluna] for coluna in COLUNAS})
+    if em_reais:
+        df[COLUNAS[1:]] = df[COLUNAS[1:]] / 100
+    return df
@@ -0,0 +1,56 @@
+"""Comparação lado a lado das três estratégias para as mesmas entradas.
+
+As estratégias compartilham sub-resultados: o IRPF com e sem PGBL é calculado
+uma vez, e a projeção do PGBL da moderada é a mesma parcela de previdência da
+agressiva: comparar as três custa um cálculo de IRPF e três projeções.
+"""
+
+import pandas as pd
+
+from motor import (
+    ANOS_PROJECAO,
+    COLUNAS,
+    impostos,
+    para_dataframe,
+    projetar_inv,
+    projetar_prev,
+)
+
+ESTRATEGIAS = ["Conservadora", "Moderada", "Agressiva"]
+
+
+def comparar_estrategias(renda_mensal, aporte, taxa_anual, anos=ANOS_PROJECAO):
+    """Projeções das três estratégias com os sub-resultados compartilhados.
+
+    Returns:
+        dict: Tabela (colunas de ``motor.COLUNAS``) de cada estratégia e o
+        dicionário de impostos compartilhado em "IR".
+    """
+    ir = impostos(renda_mensal, aporte)
+    dirpf = float(ir["dirpf"])
+    conservadora = projetar_inv(renda_mensal, aporte, taxa_anual, anos=anos)
+    df_prev = para_dataframe(
+        projetar_prev(renda_mensal, aporte, taxa_anual, dirpf, anos=anos)
+    )
+    df_inv = para_dataframe(
+        projetar_inv(renda_mensal, aporte, taxa_anual, dirpf, anos=anos)
+    )
+
+    df_agressiva = df_prev.copy()
+    df_agressiva[COLUNAS[1:]] += df_inv[COLUNAS[1:]]
+
+    return {
+        "Conservadora": para_dataframe(conservadora),
+        "Moderada": df_prev,
+        "Agressiva": df_agressiva,
+        "IR": ir,
+    }
+
+
+def tabela_alinhada(resultados, coluna, anos=(5, 10, 15, 20, 25, 30)):
+    """Uma coluna de cada estratégia, lado a lado, nos anos escolhidos."""
+    df = pd.DataFrame({"Anos": list(anos)})
+    for estrategia in ESTRATEGIAS:
+        projecao = resultados[estrategia].set_index("Anos")[coluna]
+        df[estrategia] = projecao.reindex(anos).to_numpy()
+    return df
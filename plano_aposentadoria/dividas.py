@@ -0,0 +1,193 @@
+"""Quitação de várias dívidas simultâneas (avalanche, bola de neve ou ordem livre).
+
+Todo mês cada dívida rende juros e recebe a parcela mínima; o que sobra do
+orçamento (parcela extra mais as parcelas das dívidas já quitadas) amortiza as
+dívidas na ordem de prioridade da estratégia:
+
+* avalanche: maior taxa de juros primeiro;
+* bola de neve: menor saldo devedor primeiro;
+* livre: ordem informada pelo usuário (ex.: quitar o consignado antes).
+
+Os planos (estratégias x níveis de parcela extra) são um eixo dos arrays, então
+dezenas de planos são simulados no mesmo laço de meses. Depois da quitação, o
+orçamento das dívidas é redirecionado para os investimentos, como em
+``tabela_inv``.
+"""
+
+import numpy as np
+import pandas as pd
+
+from motor import ANOS_PROJECAO, MULTIPLICADOR_ANUAL, acumular
+
+ESTRATEGIAS = ("avalanche", "bola de neve")
+MAX_MESES = 600
+
+
+def ordem_estrategia(estrategia, saldos, taxas_mensais):
+    """Índices das dívidas na ordem de amortização da estratégia.
+
+    Args:
+        estrategia (str | list): "avalanche", "bola de neve" ou uma lista com a
+            ordem das dívidas (estratégia livre).
+    """
+    if not isinstance(estrategia, str):
+        return np.asarray(estrategia, dtype=int)
+    if estrategia == "avalanche":
+        return np.argsort(-np.asarray(taxas_mensais, dtype=float), kind="stable")
+    if estrategia == "bola de neve":
+        return np.argsort(np.asarray(saldos, dtype=float), kind="stable")
+    raise ValueError(f"Estratégia desconhecida: {estrategia!r}")
+
+
+def simular_dividas(
+    saldos,
+    taxas_mensais,
+    parcelas,
+    extras=(0,),
+    estrategias=ESTRATEGIAS,
+    max_meses=MAX_MESES,
+):
+    """Simula a quitação para cada combinação de estratégia e parcela extra.
+
+    Args:
+        saldos (array): Saldo devedor de cada dívida.
+        taxas_mensais (array): Taxa de juros mensal de cada dívida (em %).
+        parcelas (array): Parcela mínima mensal de cada dívida.
+        extras (array): Valores mensais pagos além das parcelas mínimas.
+        estrategias (list): Estratégias aceitas por ``ordem_estrategia``.
+        max_meses (int): Limite da simulação.
+
+    Returns:
+        dict: Arrays com forma (estratégias, extras, ...): "Pagamentos" (valor
+        pago em cada mês), "Juros" (total pago de juros), "Quitação" (mês em que
+        cada dívida é quitada, NaN se não for) e "Meses" (mês da última
+        quitação, NaN se alguma dívida não for quitada), além do "Orçamento"
+        mensal e da parcela "Extra" de cada plano.
+    """
+    saldos = np.asarray(saldos, dtype=float)
+    taxas = np.asarray(taxas_mensais, dtype=float) / 100
+    parcelas = np.asarray(parcelas, dtype=float)
+    extras = np.asarray(extras, dtype=float)
+    n_estrategias, n_extras = len(estrategias), len(extras)
+
+    # Planos no primeiro eixo: (planos, dívidas)
+    ordem = np.stack([ordem_estrategia(e, saldos, taxas) for e in estrategias])
+    ordem = np.repeat(ordem, n_extras, axis=0)
+    orcamento = parcelas.sum() + np.tile(extras, n_estrategias)
+    saldo = np.tile(saldos, (len(ordem), 1))
+
+    pagamentos = np.zeros((len(ordem), max_meses))
+    juros = np.zeros(len(ordem))
+    quitacao = np.where(saldo > 0, np.nan, 0.0)
+
+    for mes in range(max_meses):
+        if not (saldo > 0).any():
+            break
+
+        juros_mes = saldo * taxas
+        saldo = saldo + juros_mes
+        juros += juros_mes.sum(axis=1)
+
+        minimo = np.minimum(parcelas, saldo)
+        sobra = np.maximum(orcamento - minimo.sum(axis=1), 0)
+
+        # Amortização extra na ordem de prioridade de cada plano
+        restante = np.take_along_axis(saldo - minimo, ordem, axis=1)
+        antes = np.cumsum(restante, axis=1) - restante
+        extra = np.clip(sobra[:, None] - antes, 0, restante)
+        pago = minimo.copy()
+        np.put_along_axis(
+            pago, ordem, np.take_along_axis(pago, ordem, axis=1) + extra, axis=1
+        )
+
+        saldo = saldo - pago
+        saldo[saldo < 1e-6] = 0
+        pagamentos[:, mes] = pago.sum(axis=1)
+        quitacao = np.where(np.isnan(quitacao) & (saldo == 0), mes + 1, quitacao)
+
+    forma = (n_estrategias, n_extras)
+    meses = np.where(np.isnan(quitacao).any(axis=1), np.nan, quitacao.max(axis=1))
+    return {
+        "Pagamentos": pagamentos.reshape(forma + (max_meses,)),
+        "Juros": juros.reshape(forma),
+        "Quitação": quitacao.reshape(forma + (len(saldos),)),
+        "Meses": meses.reshape(forma),
+        "Orçamento": orcamento.reshape(forma),
+        "Extra": np.broadcast_to(extras, forma),
+    }
+
+
+def investir_apos_dividas(
+    renda_mensal, aporte, taxa_anual, simulacao, anos=ANOS_PROJECAO
+):
+    """Acumulação quando o aporte divide o orçamento com as dívidas.
+
+    A parcela extra sai do aporte mensal; o que o plano deixa de pagar (depois
+    de cada quitação) volta para os investimentos. Aportes mensais são somados
+    por ano e acumulados como em ``tabela_inv``. Um extra maior que o aporte não
+    tira dinheiro dos investimentos: o aporte do mês fica em zero.
+
+    Returns:
+        dict: Arrays (estratégias, extras, anos) com as colunas de
+        ``motor.COLUNAS``.
+    """
+    aporte_mensal = renda_mensal * MULTIPLICADOR_ANUAL * aporte / 100 / 12
+    orcamento = simulacao["Orçamento"]
+    pagamentos = simulacao["Pagamentos"]
+
+    meses = 12 * anos
+    pagos = np.zeros(pagamentos.shape[:-1] + (meses,))
+    n = min(meses, pagamentos.shape[-1])
+    pagos[..., :n] = pagamentos[..., :n]
+
+    extras = simulacao["Extra"]
+    investido = np.maximum(
+        aporte_mensal - extras[..., None] + orcamento[..., None] - pagos, 0
+    )
+    aportes = investido.reshape(pagos.shape[:-1] + (anos, 12)).sum(axis=-1)
+
+    ano = np.arange(1, anos + 1)
+    saldo = acumular(aportes, taxa_anual)
+    renda_anual = np.where(ano > 1, saldo * taxa_anual / 100, 0)
+
+    return {
+        "Anos": ano,
+        "Valor Aportado": np.cumsum(aportes, axis=-1),
+        "Saldo Acumulado": saldo,
+        "Renda Passiva Anual": renda_anual,
+        "Renda Passiva Mensal": renda_anual / 12,
+    }
+
+
+def comparar_planos(
+    saldos,
+    taxas_mensais,
+    parcelas,
+    renda_mensal,
+    aporte,
+    taxa_anual,
+    extras=(0, 250, 500, 1000),
+    estrategias=ESTRATEGIAS,
+    anos=ANOS_PROJECAO,
+):
+    """Tabela com prazo, juros e patrimônio final de cada plano de quitação.
+
+    Extras maiores que o aporte mensal não cabem no orçamento e ficam de fora.
+    """
+    aporte_mensal = renda_mensal * MULTIPLICADOR_ANUAL * aporte / 100 / 12
+    extras = [extra for extra in extras if extra <= aporte_mensal]
+    simulacao = simular_dividas(saldos, taxas_mensais, parcelas, extras, estrategias)
+    projecao = investir_apos_dividas(renda_mensal, aporte, taxa_anual, simulacao, anos)
+
+    nomes = [e if isinstance(e, str) else "livre" for e in estrategias]
+    indice = pd.MultiIndex.from_product(
+        [nomes, list(extras)], names=["Estratégia", "Extra Mensal"]
+    )
+    return pd.DataFrame(
+        {
+            "Meses até Quitar": simulacao["Meses"].ravel(),
+            "Juros Pagos": simulacao["Juros"].ravel(),
+            "Saldo Acumulado": projecao["Saldo Acumulado"][..., -1].ravel(),
+        },
+        index=indice,
+    ).reset_index()
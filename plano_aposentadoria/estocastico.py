@@ -0,0 +1,70 @@
+"""Geradores de rentabilidades mensais aleatórias para simulações de Monte Carlo.
+
+As rentabilidades são lognormais: o log do fator mensal é normal, calibrado
+para que a média do fator anual seja ``1 + media_anual`` e o desvio-padrão do
+log anual seja ``volatilidade_anual``. Matrizes grandes podem ser geradas em
+blocos de caminhos com a mesma semente (``blocos_retornos``), mantendo a
+memória limitada. Para carteiras com várias classes de ativos,
+``retornos_correlacionados`` acopla as normais pela decomposição de Cholesky
+da matriz de correlação.
+"""
+
+import numpy as np
+
+
+def parametros_mensais(media_anual, volatilidade_anual):
+    """Média e desvio-padrão do log do fator mensal.
+
+    Args:
+        media_anual (float): Rentabilidade média anual (em porcentagem).
+        volatilidade_anual (float): Volatilidade anual (em porcentagem).
+    """
+    sigma_anual = volatilidade_anual / 100
+    mu_anual = np.log1p(media_anual / 100) - sigma_anual**2 / 2
+    return mu_anual / 12, sigma_anual / np.sqrt(12)
+
+
+def retornos_lognormais(
+    n_caminhos, meses, media_anual, volatilidade_anual, rng=None, dtype=float
+):
+    """Matriz (caminhos x meses) de rentabilidades mensais (em fração)."""
+    rng = rng if rng is not None else np.random.default_rng()
+    mu, sigma = parametros_mensais(media_anual, volatilidade_anual)
+    z = rng.standard_normal((n_caminhos, meses), dtype=dtype)
+    return np.expm1(mu + sigma * z)
+
+
+def retornos_correlacionados(
+    n_caminhos,
+    meses,
+    medias_anuais,
+    volatilidades_anuais,
+    correlacao,
+    rng=None,
+    dtype=float,
+):
+    """Tensor (caminhos x meses x ativos) de rentabilidades mensais (em fração).
+
+    Args:
+        medias_anuais (array): Rentabilidade média anual de cada ativo (em %).
+        volatilidades_anuais (array): Volatilidade anual de cada ativo (em %).
+        correlacao (array): Matriz de correlação entre os logs dos fatores.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    mu, sigma = parametros_mensais(
+        np.asarray(medias_anuais, dtype=float),
+        np.asarray(volatilidades_anuais, dtype=float),
+    )
+    cholesky = np.linalg.cholesky(np.asarray(correlacao, dtype=float))
+    z = rng.standard_normal((n_caminhos, meses, len(mu)), dtype=dtype) @ cholesky.T
+    return np.expm1(mu + sigma * z)
+
+
+def blocos_retornos(
+    n_caminhos, meses, media_anual, volatilidade_anual, bloco=10000, semente=0
+):
+    """Gera as rentabilidades em blocos de até ``bloco`` caminhos."""
+    rng = np.random.default_rng(semente)
+    for inicio in range(0, n_caminhos, bloco):
+        tamanho = min(bloco, n_caminhos - inicio)
+        yield retornos_lognormais(tamanho, meses, media_anual, volatilidade_anual, rng)
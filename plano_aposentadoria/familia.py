@@ -0,0 +1,166 @@
+"""Planejamento conjunto da família (ex.: casal).
+
+Cada membro tem seu próprio INSS, IRPF e limite de 12% de dedução do PGBL, mas o
+orçamento de aportes é da família. Os membros são um eixo dos arrays: impostos e
+projeções de todos saem numa única chamada ao motor vetorizado, e a escolha de
+quem contribui para o PGBL percorre os membros guardando só as combinações que
+nenhuma outra mais barata supera.
+"""
+
+import numpy as np
+import pandas as pd
+
+from motor import (
+    ANOS_PROJECAO,
+    COLUNAS,
+    LIMITE_PGBL,
+    MULTIPLICADOR_ANUAL,
+    acumular,
+    impostos,
+    projetar_inv,
+    projetar_prev,
+)
+
+
+def projetar_familia(rendas, aportes, taxa_anual, anos=ANOS_PROJECAO):
+    """Estratégia agressiva de cada membro e a soma da família.
+
+    Args:
+        rendas (list): Renda mensal de cada membro.
+        aportes (list): Aporte (% da renda) de cada membro.
+        taxa_anual (float): A taxa de juros anual (em porcentagem).
+
+    Returns:
+        tuple: Tabela da família (mesmas colunas de ``tabela_inv``) e tabela
+        por membro com o IRPF e a diferença de IRPF de cada um.
+    """
+    rendas = np.asarray(rendas, dtype=float)
+    aportes = np.asarray(aportes, dtype=float)
+
+    ir = impostos(rendas, aportes)
+    prev = projetar_prev(rendas, aportes, taxa_anual, ir["dirpf"], anos=anos)
+    inv = projetar_inv(
+        rendas, aportes, taxa_anual, ir["dirpf"], anos=anos, com_pgbl=True
+    )
+
+    familia = {"Anos": prev["Anos"]}
+    for coluna in COLUNAS[1:]:
+        familia[coluna] = (prev[coluna] + inv[coluna]).sum(axis=0)
+
+    membros = pd.DataFrame(
+        {
+            "Membro": np.arange(1, len(rendas) + 1),
+            "Renda Anual": ir["Renda Anual"],
+            "PGBL": ir["PGBL"],
+            "IRPF Sem PGBL": ir["IRPF Sem PGBL"],
+            "IRPF": ir["IRPF"],
+            "Diferença IRPF": ir["dirpf"],
+        }
+    )
+
+    return pd.DataFrame(familia), membros
+
+
+def otimizar_pgbl(rendas, orcamento_anual, passo=0.5):
+    """Escolhe quanto cada membro aporta no PGBL para maximizar a restituição.
+
+    Percorre os percentuais (de 0 a 12% da renda de cada membro, com o passo
+    informado) membro a membro, guardando só a fronteira das combinações que
+    cabem no orçamento anual da família: as que nenhuma combinação de aporte
+    menor ou igual supera na restituição. O resultado é o mesmo da grade com
+    todas as combinações, sem crescer como 25 ** membros.
+
+    Args:
+        rendas (list): Renda mensal de cada membro.
+        orcamento_anual (float): Total que a família aporta por ano.
+        passo (float): Passo da grade de percentuais (em pontos percentuais).
+
+    Returns:
+        pandas.DataFrame: Percentual, aporte anual no PGBL e diferença de IRPF
+        de cada membro.
+    """
+    rendas = np.asarray(rendas, dtype=float)
+    percentuais = np.arange(0, 100 * LIMITE_PGBL + passo / 2, passo)
+    renda_anual = rendas * MULTIPLICADOR_ANUAL
+
+    # Restituição de cada membro em cada percentual: (membros x percentuais)
+    tabela = impostos(rendas[:, None], percentuais)["dirpf"]
+    aportes_tabela = percentuais / 100 * renda_anual[:, None]
+
+    # Fronteira das combinações dos membros já vistos: aporte total,
+    # restituição total e o índice do percentual de cada membro
+    aporte = np.zeros(1)
+    restituicao = np.zeros(1)
+    escolhas = np.zeros((1, 0), dtype=int)
+    n = len(percentuais)
+    for i in range(len(rendas)):
+        aporte = (aporte[:, None] + aportes_tabela[i]).ravel()
+        restituicao = (restituicao[:, None] + tabela[i]).ravel()
+        escolhas = np.column_stack(
+            [np.repeat(escolhas, n, axis=0), np.tile(np.arange(n), len(escolhas))]
+        )
+
+        # Só ficam as combinações viáveis que nenhuma mais barata supera
+        ordem = np.lexsort((-restituicao, aporte))
+        ordem = ordem[aporte[ordem] <= orcamento_anual + 1e-9]
+        anterior = np.maximum.accumulate(np.r_[-np.inf, restituicao[ordem][:-1]])
+        ordem = ordem[restituicao[ordem] > anterior + 1e-9]
+        aporte, restituicao, escolhas = (
+            aporte[ordem],
+            restituicao[ordem],
+            escolhas[ordem],
+        )
+
+    # A última da fronteira tem a maior restituição com o menor aporte
+    membros = np.arange(len(rendas))
+    escolha = escolhas[-1]
+    percentual = percentuais[escolha]
+    aporte_pgbl = aportes_tabela[membros, escolha]
+    dirpf = tabela[membros, escolha]
+
+    return pd.DataFrame(
+        {
+            "Membro": np.arange(1, len(rendas) + 1),
+            "Renda Anual": renda_anual,
+            "PGBL (%)": percentual,
+            "Aporte PGBL": aporte_pgbl,
+            "Diferença IRPF": dirpf,
+        }
+    )
+
+
+def projetar_familia_otimizada(rendas, aportes, taxa_anual, anos=ANOS_PROJECAO):
+    """Projeção da família com o PGBL distribuído por ``otimizar_pgbl``.
+
+    O orçamento é o mesmo de ``projetar_familia``. O que não vai para o PGBL, e
+    a restituição de IR a partir do segundo ano, vai para os investimentos.
+
+    Returns:
+        tuple: Tabela da família e a distribuição do PGBL entre os membros.
+    """
+    rendas = np.asarray(rendas, dtype=float)
+    orcamento = (rendas * MULTIPLICADOR_ANUAL * np.asarray(aportes) / 100).sum()
+    distribuicao = otimizar_pgbl(rendas, orcamento)
+
+    dirpf = distribuicao["Diferença IRPF"].to_numpy()
+    prev = projetar_prev(
+        rendas, distribuicao["PGBL (%)"].to_numpy(), taxa_anual, dirpf, anos=anos
+    )
+
+    aporte_1 = orcamento - distribuicao["Aporte PGBL"].sum()
+    ano = np.arange(1, anos + 1)
+    aportes_inv = np.where(ano == 1, aporte_1, aporte_1 + dirpf.sum())
+    saldo_inv = acumular(aportes_inv, taxa_anual)
+    renda_inv = np.where(ano > 1, saldo_inv * taxa_anual / 100, 0)
+
+    familia = {
+        "Anos": ano,
+        "Valor Aportado": prev["Valor Aportado"].sum(axis=0)
+        + aporte_1
+        + (ano - 1) * (aporte_1 + dirpf.sum()),
+        "Saldo Acumulado": prev["Saldo Acumulado"].sum(axis=0) + saldo_inv,
+        "Renda Passiva Anual": prev["Renda Passiva Anual"].sum(axis=0) + renda_inv,
+    }
+    familia["Renda Passiva Mensal"] = familia["Renda Passiva Anual"] / 12
+
+    return pd.DataFrame(familia), distribuicao
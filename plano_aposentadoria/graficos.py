@@ -0,0 +1,184 @@
+"""Gráficos Plotly a partir de modelos pré-montados.
+
+Montar um ``go.Figure`` com ``go.Bar``/``go.Scatter`` valida cada propriedade
+(layout, cores, hovertemplates) a cada execução do script. Aqui cada modelo é
+montado e validado uma única vez e guardado como dicionário; a cada execução só
+os arrays de dados são trocados, sem nova validação. As figuras ficam num
+cache LRU pelo hash dos dados, então reexecuções com as mesmas entradas não
+montam nada.
+
+Séries de linha longas (ex.: projeções mensais) passam pelo LTTB
+(Largest-Triangle-Three-Buckets) antes de irem para o navegador, o que reduz os
+bytes enviados sem perder a forma da curva.
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+
+LIMITE_PONTOS = 500  # Pontos por série de linha enviados ao navegador
+TAMANHO_CACHE = 128  # Figuras guardadas
+
+MODELOS = {}
+_cache = OrderedDict()
+
+
+def registrar_modelo(nome, figura):
+    """Guarda o modelo já validado: os dados dos traços são ignorados."""
+    modelo = figura.to_dict()
+    for traco in modelo["data"]:
+        traco.pop("x", None)
+        traco.pop("y", None)
+    MODELOS[nome] = modelo
+
+
+def lttb(x, y, n_pontos):
+    """Índices dos ``n_pontos`` que preservam a forma da série (LTTB).
+
+    O primeiro e o último ponto são mantidos; os demais são divididos em
+    ``n_pontos - 2`` faixas e, em cada uma, fica o ponto que forma o maior
+    triângulo com o ponto escolhido na faixa anterior e a média da seguinte.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    tamanho = len(x)
+    if n_pontos >= tamanho or n_pontos < 3:
+        return np.arange(tamanho)
+
+    bordas = np.linspace(1, tamanho - 1, n_pontos - 1).astype(int)
+    indices = [0]
+    for i in range(n_pontos - 2):
+        inicio, fim = bordas[i], bordas[i + 1]
+        if i == n_pontos - 3:
+            media_x, media_y = x[-1], y[-1]
+        else:
+            media_x = x[bordas[i + 1] : bordas[i + 2]].mean()
+            media_y = y[bordas[i + 1] : bordas[i + 2]].mean()
+        a = indices[-1]
+        area = np.abs(
+            (x[a] - media_x) * (y[inicio:fim] - y[a])
+            - (x[a] - x[inicio:fim]) * (media_y - y[a])
+        )
+        indices.append(inicio + int(np.argmax(area)))
+    indices.append(tamanho - 1)
+    return np.array(indices)
+
+
+def _hash_dados(nome, arrays):
+    h = hashlib.blake2b(nome.encode(), digest_size=16)
+    for array in arrays:
+        h.update(str((array.dtype, array.shape)).encode())
+        h.update(np.ascontiguousarray(array).tobytes())
+    return h.hexdigest()
+
+
+def figura(nome, x, *ys):
+    """Figura do modelo ``nome`` com ``x`` e um ``y`` por traço.
+
+    A figura devolvida pode vir do cache: não a altere.
+    """
+    x = np.asarray(x)
+    ys = [np.asarray(y, dtype=float) for y in ys]
+    chave = _hash_dados(nome, [x, *ys])
+    if chave in _cache:
+        _cache.move_to_end(chave)
+        return _cache[chave]
+
+    modelo = MODELOS[nome]
+    dados = []
+    for traco, y in zip(modelo["data"], ys):
+        xs = x
+        if traco["type"] == "scatter" and len(x) > LIMITE_PONTOS:
+            indices = lttb(x, y, LIMITE_PONTOS)
+            xs, y = x[indices], y[indices]
+        dados.append({**traco, "x": xs, "y": y})
+
+    fig = go.Figure({"data": dados, "layout": modelo["layout"]}, _validate=False)
+
+    _cache[chave] = fig
+    if len(_cache) > TAMANHO_CACHE:
+        _cache.popitem(last=False)
+    return fig
+
+
+def _barras_empilhadas(series):
+    """Barras empilhadas de patrimônio: ``series`` é [(nome, cor, rótulo)]."""
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                name=nome,
+                marker=dict(color=cor),
+                hovertemplate=f"Ano: %{{x}}<br>{rotulo}: R$ %{{y:,.2f}}<extra></extra>",
+            )
+            for nome, cor, rotulo in series
+        ]
+    )
+    fig.update_layout(
+        barmode="stack",
+        xaxis_title="Prazo (Anos)",
+        yaxis_title="Valor (R$)",
+    )
+    return fig
+
+
+def _linhas_saldo(series):
+    """Linhas de saldo por ano: ``series`` é [(nome, cor, traço, modo)]."""
+    fig = go.Figure(
+        data=[
+            go.Scatter(
+                name=nome,
+                mode=modo,
+                line=dict(color=cor, dash=traco),
+                hovertemplate=f"{nome}<br>Ano: %{{x}}<br>"
+                "Saldo: R$ %{y:,.2f}<extra></extra>",
+            )
+            for nome, cor, traco, modo in series
+        ]
+    )
+    fig.update_layout(
+        xaxis_title="Anos",
+        yaxis_title="Saldo Acumulado (R$)",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02),
+    )
+    return fig
+
+
+registrar_modelo(
+    "aportes_rendimentos",
+    _barras_empilhadas(
+        [
+            ("Valor Aportado", "orange", "Valor Aportado"),
+            ("Rendimentos", "blue", "Rendimentos"),
+        ]
+    ),
+)
+registrar_modelo(
+    "pgbl_investimentos",
+    _barras_empilhadas(
+        [("PGBL", "orange", "Previdência"), ("Investimentos", "blue", "Investimentos")]
+    ),
+)
+registrar_modelo(
+    "estrategias",
+    _linhas_saldo(
+        [
+            ("Conservadora", "green", "solid", "lines+markers"),
+            ("Moderada", "orange", "solid", "lines+markers"),
+            ("Agressiva", "red", "solid", "lines+markers"),
+        ]
+    ),
+)
+registrar_modelo(
+    "faixas_percentis",
+    _linhas_saldo(
+        [
+            ("Pior 5%", "red", "dot", "lines"),
+            ("25%", "orange", "dash", "lines"),
+            ("Mediana", "green", "solid", "lines"),
+            ("75%", "orange", "dash", "lines"),
+            ("Melhor 5%", "blue", "dot", "lines"),
+        ]
+    ),
+)
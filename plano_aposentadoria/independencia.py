@@ -0,0 +1,112 @@
+"""Ano e mês em que a renda passiva mensal alcança a renda desejada.
+
+Para grades inteiras de renda, aporte, taxa e renda desejada, calcula a série de
+"Renda Passiva Mensal" de cada estratégia com o motor vetorizado e localiza o
+cruzamento com ``searchsorted``. A série é tornada não decrescente com o máximo
+acumulado e cada linha da grade recebe um deslocamento, de modo que uma única
+busca no array achatado resolve todos os cenários.
+"""
+
+import numpy as np
+import pandas as pd
+
+from motor import ANOS_PROJECAO, impostos, projetar_inv, projetar_prev
+
+
+def renda_passiva(renda_mensal, aporte, taxa_anual, estrategia, anos=ANOS_PROJECAO):
+    """Série anual de renda passiva mensal da estratégia (último eixo = ano)."""
+    if estrategia == "conservadora":
+        return projetar_inv(renda_mensal, aporte, taxa_anual, anos=anos)[
+            "Renda Passiva Mensal"
+        ]
+
+    dirpf = impostos(renda_mensal, aporte)["dirpf"]
+    prev = projetar_prev(renda_mensal, aporte, taxa_anual, dirpf, anos=anos)
+    if estrategia == "moderada":
+        return prev["Renda Passiva Mensal"]
+
+    inv = projetar_inv(renda_mensal, aporte, taxa_anual, dirpf, anos=anos)
+    return prev["Renda Passiva Mensal"] + inv["Renda Passiva Mensal"]
+
+
+def cruzamento(serie, alvos):
+    """Localiza o primeiro ano em que cada série alcança cada valor-alvo.
+
+    Args:
+        serie (array): Séries anuais com forma (..., anos).
+        alvos (array): Valores-alvo com forma (..., alvos), compatível com
+            ``serie[..., :1]``.
+
+    Returns:
+        dict: "Ano" (1 a anos; 0 se nunca alcança), "Mês" (1 a 12; 0 se nunca
+        alcança) e "Anos Decimais" (NaN se nunca alcança).
+    """
+    serie = np.maximum.accumulate(np.asarray(serie, dtype=float), axis=-1)
+    anos = serie.shape[-1]
+    alvos = np.asarray(alvos, dtype=float)
+    forma = np.broadcast_shapes(serie.shape[:-1], alvos.shape[:-1])
+    serie = np.broadcast_to(serie, forma + (anos,)).reshape(-1, anos)
+    alvos = np.broadcast_to(alvos, forma + alvos.shape[-1:]).reshape(len(serie), -1)
+
+    # Desloca cada linha para que fiquem ordenadas num único array
+    amplitude = max(serie.max(initial=0), alvos.max(initial=0)) + 1
+    deslocamento = amplitude * np.arange(len(serie))[:, None]
+    alvos_linha = np.clip(alvos, 0, amplitude - 0.5)
+    posicao = (
+        np.searchsorted(
+            (serie + deslocamento).ravel(), (alvos_linha + deslocamento).ravel()
+        ).reshape(alvos.shape)
+        - anos * np.arange(len(serie))[:, None]
+    )
+
+    alcancado = posicao < anos
+    indice = np.minimum(posicao, anos - 1)
+    atual = np.take_along_axis(serie, indice, axis=-1)
+    anterior = np.where(
+        indice > 0, np.take_along_axis(serie, np.maximum(indice - 1, 0), axis=-1), 0
+    )
+    fracao = np.divide(
+        alvos - anterior,
+        atual - anterior,
+        out=np.ones_like(atual),
+        where=atual > anterior,
+    )
+    mes = np.clip(np.ceil(np.clip(fracao, 0, 1) * 12), 1, 12).astype(int)
+
+    forma_saida = forma + alvos.shape[-1:]
+    return {
+        "Ano": np.where(alcancado, posicao + 1, 0).reshape(forma_saida),
+        "Mês": np.where(alcancado, mes, 0).reshape(forma_saida),
+        "Anos Decimais": np.where(alcancado, posicao + mes / 12, np.nan).reshape(
+            forma_saida
+        ),
+    }
+
+
+def grade_cruzamento(
+    rendas, aportes, taxas, alvos, estrategia="agressiva", anos=ANOS_PROJECAO
+):
+    """Cruzamento para a grade completa (rendas x aportes x taxas x alvos).
+
+    Os alvos são rendas mensais desejadas em reais.
+    """
+    renda = np.asarray(rendas, dtype=float)[:, None, None]
+    aporte = np.asarray(aportes, dtype=float)[None, :, None]
+    taxa = np.asarray(taxas, dtype=float)[None, None, :]
+
+    serie = renda_passiva(renda, aporte, taxa, estrategia, anos=anos)
+    return cruzamento(serie, np.asarray(alvos, dtype=float)[None, None, None, :])
+
+
+def mapa_cruzamento(renda_mensal, taxa_anual, aportes, alvos, estrategia):
+    """Tabela (renda desejada x aporte) com o prazo, em anos, até o cruzamento."""
+    resultado = grade_cruzamento(
+        [renda_mensal], aportes, [taxa_anual], alvos, estrategia
+    )
+    anos = resultado["Anos Decimais"][0, :, 0, :]  # aportes x alvos
+
+    dados = {"Renda Desejada": [f"R$ {alvo:,.0f}".replace(",", ".") for alvo in alvos]}
+    for j, aporte in enumerate(aportes):
+        dados[f"Aporte {aporte}%"] = anos[j]
+
+    return pd.DataFrame(dados)
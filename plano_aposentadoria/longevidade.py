@@ -0,0 +1,270 @@
+"""Usufruto com longevidade: ruína ponderada pela sobrevivência.
+
+``usufruto`` diz quantos meses um saldo dura com uma retirada fixa, mas não se
+isso basta para quem se aposenta com uma certa idade. Aqui a ruína é o evento
+de estar vivo quando o saldo acaba: a probabilidade de ruína é a média, nos
+caminhos de rentabilidade, da probabilidade de sobreviver até o mês em que o
+saldo acaba.
+
+A tábua é lida de um CSV local (``dados/tabua_mortalidade.csv`` ao lado deste
+arquivo, ou o caminho em ``PLANEJAMENTO_TABUA``) com as probabilidades de morte
+entre duas idades exatas, 1000 q(x, 1)::
+
+    idade,homens,mulheres
+    0,0.3372,0.3438
+    ...
+
+O arquivo distribuído é a tábua BR-EMSsb-V.2015 (sobrevivência) da SUSEP,
+construída com a experiência do mercado segurador brasileiro, na versão
+publicada no banco de tábuas da Society of Actuaries (tabelas 3383 e 3384).
+É uma tábua de segurados, com mortalidade menor que a da população em geral
+(esperança de vida ao nascer de 82 anos para homens e 88 para mulheres).
+
+A última idade é o grupo aberto. Tábuas que terminam antes de ``IDADE_FINAL``,
+como as tábuas completas do IBGE (grupo aberto de 80 anos ou mais), têm o
+grupo aberto fechado por uma lei de Gompertz (log da força de mortalidade
+linear na idade) ajustada às ``IDADES_AJUSTE`` idades anteriores a ele; em
+``IDADE_FINAL`` ninguém sobrevive.
+
+Tudo é vetorizado em sexos x idades x saldos: a sobrevivência mensal sai de
+somas prefixadas do log da sobrevivência anual, e o mês em que o saldo acaba,
+em cada caminho, de um único ``searchsorted``. Como a ruína depende só da razão
+saldo / retirada, a retirada sustentável é proporcional ao saldo e a busca é
+feita uma vez por sexo e idade.
+"""
+
+import functools
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from estocastico import parametros_mensais
+
+COLUNAS_SEXO = {"M": "homens", "F": "mulheres"}
+IDADE_FINAL = 110  # Idade final das tábuas com grupo aberto mais cedo
+IDADES_AJUSTE = 10  # Idades usadas no ajuste de Gompertz do grupo aberto
+
+
+def caminho_padrao():
+    return Path(
+        os.environ.get(
+            "PLANEJAMENTO_TABUA",
+            Path(__file__).resolve().parent / "dados" / "tabua_mortalidade.csv",
+        )
+    )
+
+
+def carregar_tabua(caminho=None):
+    """Probabilidades de morte q(x, 1) (em fração) indexadas pela idade.
+
+    A leitura é guardada por caminho e data de modificação do arquivo, então o
+    CSV só é relido quando muda. Não altere a tábua devolvida.
+    """
+    caminho = Path(caminho or caminho_padrao()).resolve()
+    return _ler_tabua(caminho, caminho.stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _ler_tabua(caminho, modificacao):
+    df = pd.read_csv(caminho)
+    faltando = {"idade", *COLUNAS_SEXO.values()} - set(df.columns)
+    if faltando:
+        raise ValueError(
+            f"Colunas ausentes na tábua de mortalidade: {sorted(faltando)}"
+        )
+    df = df.set_index("idade").sort_index()[list(COLUNAS_SEXO.values())] / 1000
+    if df.index[-1] < IDADE_FINAL:
+        df = fechar_grupo_aberto(df)
+    df.iloc[-1] = 1.0  # Grupo aberto final
+    return df
+
+
+def fechar_grupo_aberto(tabua, idade_final=IDADE_FINAL, idades_ajuste=IDADES_AJUSTE):
+    """Troca o grupo aberto por idades simples até ``idade_final`` (Gompertz).
+
+    A força de mortalidade mu(x) = -log(1 - q(x)) das ``idades_ajuste`` idades
+    anteriores ao grupo aberto dá, por mínimos quadrados, log mu(x) = a + b x.
+    """
+    aberto = int(tabua.index[-1])
+    ajuste = tabua.iloc[-idades_ajuste - 1 : -1]
+    if len(ajuste) < idades_ajuste or np.any(np.diff(ajuste.index) != 1):
+        raise ValueError(
+            f"A tábua precisa de {idades_ajuste} idades simples antes do grupo "
+            f"aberto ({aberto} anos) para estendê-la até {idade_final} anos"
+        )
+    log_mu = np.log(-np.log1p(-ajuste.to_numpy(dtype=float)))
+    b, a = np.polyfit(ajuste.index.to_numpy(dtype=float), log_mu, 1)
+
+    idades = np.arange(aberto, idade_final + 1)
+    q = -np.expm1(-np.exp(a + np.outer(idades, b)))
+    extensao = pd.DataFrame(q, index=idades, columns=tabua.columns)
+    return pd.concat([tabua.iloc[:-1], extensao]).rename_axis(tabua.index.name)
+
+
+def tabua_disponivel(caminho=None):
+    return Path(caminho or caminho_padrao()).exists()
+
+
+def sobrevivencia(tabua, sexos, idades, meses):
+    """Probabilidade de estar vivo ``m`` meses depois de cada idade.
+
+    Dentro de cada ano de idade a força de mortalidade é constante.
+
+    Args:
+        tabua (pandas.DataFrame): Tábua de ``carregar_tabua``.
+        sexos (list): Sexos ("M" ou "F").
+        idades (array): Idades inteiras na aposentadoria.
+        meses (int): Último mês calculado.
+
+    Returns:
+        numpy.ndarray: Matriz (sexos x idades x meses + 1).
+    """
+    q = tabua[[COLUNAS_SEXO[sexo] for sexo in sexos]].to_numpy(dtype=float).T
+    with np.errstate(divide="ignore"):
+        log_p = np.log1p(-q)  # -inf na última idade
+    acumulado = np.concatenate(
+        [np.zeros((len(sexos), 1)), np.cumsum(log_p, axis=1)], axis=1
+    )
+
+    ultima = q.shape[1] - 1
+    inicio = np.asarray(idades, dtype=int) - int(tabua.index[0])
+    if inicio.min() < 0 or inicio.max() > ultima:
+        raise ValueError("Idades fora da tábua de mortalidade")
+
+    m = np.arange(meses + 1)
+    idade = inicio[:, None] + m // 12  # (idades x meses)
+    fracao = (m % 12) / 12
+    sexo = np.arange(len(sexos))[:, None, None]
+    atual = np.minimum(idade, ultima)
+
+    with np.errstate(invalid="ignore"):
+        parcial = np.where(fracao > 0, fracao * log_p[sexo, atual], 0.0)
+    log_s = acumulado[sexo, atual] - acumulado[sexo, inicio[:, None]] + parcial
+    return np.where(idade > ultima, 0.0, np.exp(log_s))
+
+
+def descontos_acumulados(taxa_anual, volatilidade_anual, meses, n_caminhos, semente):
+    """Soma dos fatores de desconto 1 / G_j de j = 0 a k em cada caminho.
+
+    Com a retirada no início de cada mês, como em ``usufruto``, o saldo depois
+    da retirada do mês k é G_k * (saldo - retirada * A_k): a retirada do mês k
+    é paga enquanto A_k <= saldo / retirada.
+
+    Returns:
+        numpy.ndarray: Matriz (caminhos x meses), crescente em cada linha.
+    """
+    mu, sigma = parametros_mensais(taxa_anual, volatilidade_anual)
+    if volatilidade_anual == 0:
+        n_caminhos = 1
+    z = np.random.default_rng(semente).standard_normal((n_caminhos, meses - 1))
+    log_g = np.cumsum(mu + sigma * z, axis=1)
+    log_g = np.concatenate([np.zeros((n_caminhos, 1)), log_g], axis=1)
+    return np.cumsum(np.exp(-log_g), axis=1)
+
+
+def meses_cobertos(descontos, razoes):
+    """Meses com a retirada paga, em cada caminho, para cada saldo / retirada.
+
+    As linhas são deslocadas para que o array achatado fique ordenado e um
+    único ``searchsorted`` atenda todos os caminhos. Um saldo igual à retirada
+    paga o primeiro mês (``side="right"`` conta os A_k iguais à razão).
+
+    Returns:
+        numpy.ndarray: Array (caminhos x razoes.shape) de meses.
+    """
+    razoes = np.asarray(razoes, dtype=float)
+    caminhos, meses = descontos.shape
+    passo = descontos[:, -1].max() + max(razoes.max(), 0) + 1
+    forma = (caminhos,) + (1,) * razoes.ndim
+    deslocamento = passo * np.arange(caminhos)
+    posicoes = np.searchsorted(
+        (descontos + deslocamento[:, None]).ravel(),
+        razoes + deslocamento.reshape(forma),
+        side="right",
+    )
+    return posicoes - (meses * np.arange(caminhos)).reshape(forma)
+
+
+def _preparar(
+    tabua, sexos, idades, taxa_anual, volatilidade_anual, n_caminhos, semente
+):
+    # Horizonte até a última idade da tábua para a aposentadoria mais cedo
+    meses = 12 * (int(tabua.index[-1]) + 1 - int(np.min(idades)))
+    vivo = sobrevivencia(tabua, sexos, idades, meses)
+    descontos = descontos_acumulados(
+        taxa_anual, volatilidade_anual, meses, n_caminhos, semente
+    )
+    return vivo, descontos
+
+
+def probabilidade_ruina(
+    tabua,
+    sexos,
+    idades,
+    saldos,
+    retirada,
+    taxa_anual,
+    volatilidade_anual=0.0,
+    n_caminhos=2000,
+    semente=0,
+):
+    """Probabilidade de estar vivo quando o saldo acaba.
+
+    Args:
+        saldos (array): Saldo na aposentadoria.
+        retirada (float | array): Retirada mensal (a mesma ou uma por saldo).
+        taxa_anual (float): Rentabilidade média anual (em porcentagem).
+        volatilidade_anual (float): Volatilidade anual (em porcentagem); com 0
+            a rentabilidade é constante, como em ``usufruto``.
+
+    Returns:
+        numpy.ndarray: Matriz (sexos x idades x saldos).
+    """
+    vivo, descontos = _preparar(
+        tabua, sexos, idades, taxa_anual, volatilidade_anual, n_caminhos, semente
+    )
+    razoes = np.asarray(saldos, dtype=float) / np.asarray(retirada, dtype=float)
+    meses = meses_cobertos(descontos, razoes)  # (caminhos x saldos)
+    return vivo[:, :, meses].mean(axis=2)
+
+
+def retirada_sustentavel(
+    tabua,
+    sexos,
+    idades,
+    saldos,
+    taxa_anual,
+    confianca=0.9,
+    volatilidade_anual=0.0,
+    n_caminhos=2000,
+    semente=0,
+    iteracoes=30,
+):
+    """Maior retirada mensal com probabilidade de ruína até ``1 - confianca``.
+
+    Com rentabilidade constante é a anuidade antecipada que dura até o mês em
+    que a sobrevivência cai a ``1 - confianca``.
+
+    Returns:
+        numpy.ndarray: Matriz (sexos x idades x saldos).
+    """
+    vivo, descontos = _preparar(
+        tabua, sexos, idades, taxa_anual, volatilidade_anual, n_caminhos, semente
+    )
+    sexo = np.arange(vivo.shape[0])[:, None]
+    idade = np.arange(vivo.shape[1])
+
+    # Bisseção geométrica na razão saldo / retirada, para todos os sexos e
+    # idades juntos (com razão 1 o saldo paga só o primeiro mês)
+    baixo = np.ones(vivo.shape[:2])
+    alto = np.full(vivo.shape[:2], descontos[:, -1].max() + 1)  # Nunca acaba
+    for _ in range(iteracoes):
+        meio = np.sqrt(baixo * alto)
+        ruina = vivo[sexo, idade, meses_cobertos(descontos, meio)].mean(axis=0)
+        aceitavel = ruina <= 1 - confianca
+        alto = np.where(aceitavel, meio, alto)
+        baixo = np.where(aceitavel, baixo, meio)
+
+    return np.asarray(saldos, dtype=float) / alto[..., None]
@@ -0,0 +1,223 @@
+"""Motor vetorizado das projeções de poupança.
+
+Reproduz as fórmulas de ``tabela_prev`` e ``tabela_inv`` com arrays do NumPy, de
+modo que qualquer parâmetro pode ser um array (grades de aportes, taxas, rendas
+etc.). O último eixo dos resultados é sempre o ano da projeção.
+"""
+
+import numpy as np
+import pandas as pd
+
+MULTIPLICADOR_ANUAL = 13.5  # 12 salários + 13o + 1/3 de férias
+LIMITE_PGBL = 0.12  # Dedução máxima do PGBL (12% da renda bruta)
+CARENCIA_PGBL = 10  # Anos sem renda passiva do PGBL
+ANOS_PROJECAO = 30
+
+# Versão das tabelas de INSS e IRPF abaixo (faz parte da chave do cache)
+VERSAO_TABELAS = "2025"
+
+# Faixas do INSS (baseado em valores de 2025)
+FAIXAS_INSS = [(1518.00, 0.075), (2793.88, 0.09), (4190.83, 0.12), (8157.41, 0.14)]
+TETO_INSS = 8157.41  # Teto do INSS
+
+# Faixas do IR (2025): limite, alíquota e parcela a deduzir
+FAIXAS_IR = [
+    (2259.20, 0.0, 0),
+    (2826.65, 0.075, 169.44),
+    (3751.05, 0.15, 381.44),
+    (4664.68, 0.225, 662.77),
+    (float("inf"), 0.275, 896.00),
+]
+
+COLUNAS = [
+    "Anos",
+    "Valor Aportado",
+    "Saldo Acumulado",
+    "Renda Passiva Anual",
+    "Renda Passiva Mensal",
+]
+
+
+def acumular(aportes, taxa_anual):
+    """Acumula os aportes anuais: saldo_n = saldo_(n-1) * (1 + taxa) + aporte_n.
+
+    Args:
+        aportes (array): Aportes de cada ano no último eixo.
+        taxa_anual (float | array): A taxa de juros anual (em porcentagem).
+
+    Returns:
+        numpy.ndarray: O saldo ao final de cada ano.
+    """
+    aportes = np.asarray(aportes, dtype=float)
+    fator = 1 + np.asarray(taxa_anual, dtype=float)[..., None] / 100
+    crescimento = fator ** np.arange(aportes.shape[-1])
+    return crescimento * np.cumsum(aportes / crescimento, axis=-1)
+
+
+def inss(salario_mensal, faixas=FAIXAS_INSS):
+    """Contribuição mensal ao INSS, progressiva por faixas e limitada ao teto."""
+    salario_base = np.minimum(np.asarray(salario_mensal, dtype=float), faixas[-1][0])
+    contribuicao = np.zeros_like(salario_base)
+    faixa_anterior = 0
+    for faixa, aliquota in faixas:
+        contribuicao += (
+            np.clip(salario_base - faixa_anterior, 0, faixa - faixa_anterior) * aliquota
+        )
+        faixa_anterior = faixa
+    return contribuicao
+
+
+def irpf(renda, faixas=FAIXAS_IR):
+    """IRPF mensal pela tabela progressiva (alíquota da faixa menos a dedução)."""
+    renda = np.asarray(renda, dtype=float)
+    limites = np.array([limite for limite, _, _ in faixas])
+    aliquotas = np.array([aliquota for _, aliquota, _ in faixas])
+    deducoes = np.array([deducao for _, _, deducao in faixas])
+    faixa = np.searchsorted(limites, renda, side="right")
+    return renda * aliquotas[faixa] - deducoes[faixa]
+
+
+def impostos(
+    salario_mensal, aporte, multiplicador=MULTIPLICADOR_ANUAL, escala_faixas=1.0
+):
+    """Versão vetorizada de ``calcular_ir``: valores anuais com e sem PGBL.
+
+    Args:
+        escala_faixas (float | array): Multiplica os limites e as parcelas a
+            deduzir das faixas de INSS e IR (ex.: 1.1 para uma correção de 10%).
+            Como as tabelas são homogêneas, equivale a calcular sobre o salário
+            dividido pela escala e multiplicar o imposto por ela.
+
+    Returns:
+        dict: Arrays com "Renda Anual", "Desconto INSS", "PGBL",
+        "Renda Tributável" e "IRPF" (com PGBL), "Renda Tributável Sem PGBL",
+        "IRPF Sem PGBL" e a diferença de IRPF em "dirpf".
+    """
+    salario_mensal = np.asarray(salario_mensal, dtype=float)
+    aporte = np.asarray(aporte, dtype=float)
+
+    escala = np.asarray(escala_faixas, dtype=float)
+
+    previdencia = salario_mensal * np.minimum(aporte / 100, LIMITE_PGBL)
+    inss_mensal = inss(salario_mensal / escala) * escala
+    renda_tributavel = salario_mensal - inss_mensal - previdencia
+    renda_sem = salario_mensal - inss_mensal
+    ir_mensal = irpf(renda_tributavel / escala) * escala
+    ir_sem = irpf(renda_sem / escala) * escala
+
+    return {
+        "Renda Anual": salario_mensal * multiplicador,
+        "Desconto INSS": inss_mensal * multiplicador,
+        "PGBL": previdencia * multiplicador,
+        "Renda Tributável": renda_tributavel * multiplicador,
+        "IRPF": ir_mensal * multiplicador,
+        "Renda Tributável Sem PGBL": renda_sem * multiplicador,
+        "IRPF Sem PGBL": ir_sem * multiplicador,
+        "dirpf": (ir_sem - ir_mensal) * multiplicador,
+    }
+
+
+def _renda_passiva(saldo, taxa_anual, anos, carencia):
+    renda_anual = np.where(
+        anos > carencia, saldo * np.asarray(taxa_anual, dtype=float)[..., None] / 100, 0
+    )
+    return renda_anual, renda_anual / 12
+
+
+def projetar_prev(
+    renda_mensal,
+    aporte,
+    taxa_anual,
+    dirpf,
+    anos=ANOS_PROJECAO,
+    multiplicador=MULTIPLICADOR_ANUAL,
+):
+    """Versão vetorizada de ``tabela_prev`` (aportes em PGBL).
+
+    Returns:
+        dict: Arrays com as colunas de ``COLUNAS``.
+    """
+    renda_mensal, aporte, taxa_anual, dirpf, multiplicador = np.broadcast_arrays(
+        *(
+            np.asarray(x, dtype=float)
+            for x in (renda_mensal, aporte, taxa_anual, dirpf, multiplicador)
+        )
+    )
+    ano = np.arange(1, anos + 1)
+
+    aporte_1 = renda_mensal * multiplicador * np.minimum(aporte / 100, LIMITE_PGBL)
+    aporte_liq = aporte_1 - dirpf
+
+    valor_aportado = aporte_1[..., None] + (ano - 1) * aporte_liq[..., None]
+    saldo = acumular(np.repeat(aporte_1[..., None], anos, axis=-1), taxa_anual)
+    renda_anual, renda_mensal_passiva = _renda_passiva(
+        saldo, taxa_anual, ano, CARENCIA_PGBL
+    )
+
+    return {
+        "Anos": ano,
+        "Valor Aportado": valor_aportado,
+        "Saldo Acumulado": saldo,
+        "Renda Passiva Anual": renda_anual,
+        "Renda Passiva Mensal": renda_mensal_passiva,
+    }
+
+
+def projetar_inv(
+    renda_mensal,
+    aporte,
+    taxa_anual,
+    dirpf=0,
+    anos=ANOS_PROJECAO,
+    multiplicador=MULTIPLICADOR_ANUAL,
+    com_pgbl=None,
+):
+    """Versão vetorizada de ``tabela_inv`` (aportes em outros investimentos).
+
+    Args:
+        com_pgbl (bool | array, opcional): Indica se parte do aporte vai para o
+            PGBL. Por padrão segue ``tabela_inv``: há PGBL quando ``dirpf != 0``.
+
+    Returns:
+        dict: Arrays com as colunas de ``COLUNAS``.
+    """
+    if com_pgbl is None:
+        com_pgbl = np.asarray(dirpf) != 0
+    renda_mensal, aporte, taxa_anual, dirpf, multiplicador, com_pgbl = (
+        np.broadcast_arrays(
+            *(
+                np.asarray(x, dtype=float)
+                for x in (renda_mensal, aporte, taxa_anual, dirpf, multiplicador)
+            ),
+            np.asarray(com_pgbl, dtype=bool),
+        )
+    )
+    ano = np.arange(1, anos + 1)
+
+    taxa_aporte = aporte / 100
+    taxa_prev = np.where(com_pgbl, np.minimum(taxa_aporte, LIMITE_PGBL), 0)
+    aporte_1 = renda_mensal * multiplicador * (taxa_aporte - taxa_prev)
+    aporte_inv = aporte_1 + dirpf
+
+    valor_aportado = aporte_1[..., None] + (ano - 1) * aporte_inv[..., None]
+    aportes = np.where(ano == 1, aporte_1[..., None], aporte_inv[..., None])
+    saldo = acumular(aportes, taxa_anual)
+    renda_anual, renda_mensal_passiva = _renda_passiva(saldo, taxa_anual, ano, 1)
+
+    return {
+        "Anos": ano,
+        "Valor Aportado": valor_aportado,
+        "Saldo Acumulado": saldo,
+        "Renda Passiva Anual": renda_anual,
+        "Renda Passiva Mensal": renda_mensal_passiva,
+    }
+
+
+def para_dataframe(projecao):
+    """Converte uma projeção de um único cenário na tabela usada pelo app."""
+    return pd.DataFrame(
+        {
+            coluna: np.broadcast_to(projecao[coluna], projecao["Anos"].shape)
+            for coluna in COLUNAS
+        }
+    )
@@ -0,0 +1,307 @@
+"""Orçamento a partir de extratos bancários (CSV ou OFX).
+
+Os extratos são lidos linha a linha e cada lançamento é categorizado por um
+índice de regras compilado: os prefixos literais da descrição ficam numa trie e
+os padrões restantes formam uma única expressão regular com grupos nomeados. Os
+valores são somados por (mês, categoria) à medida que chegam, então extratos de
+vários anos são processados numa passada com memória proporcional ao número de
+meses, e não ao de lançamentos.
+
+O resultado alimenta o Sankey de ``presentation/imagens/gerar_grafico.py`` e a
+taxa de poupança sugere o ``aporte`` da calculadora.
+"""
+
+import csv
+import io
+import re
+import unicodedata
+from collections import defaultdict
+from datetime import datetime
+
+import pandas as pd
+
+from motor import MULTIPLICADOR_ANUAL
+
+INVESTIMENTOS = "Investimentos"  # Aplicações e resgates: não são renda nem gasto
+
+# Regras padrão: categoria -> padrões. Padrões sem metacaracteres são prefixos da
+# descrição normalizada; os demais são expressões regulares (busca em qualquer
+# posição). Receitas e despesas são separadas pelo sinal do valor.
+REGRAS = {
+    "Salário": ["SALARIO", "PAGTO SALARIO", "CRED SALARIO", r"\bFOLHA\b"],
+    INVESTIMENTOS: [
+        "APLICACAO",
+        "RESGATE",
+        "TESOURO DIRETO",
+        "CDB",
+        r"\bPREVIDENCIA\b",
+        r"\bPGBL\b",
+    ],
+    "Moradia": ["ALUGUEL", "CONDOMINIO", "ENERGIA", "CEMIG", "ENEL", "SANEAGO"],
+    "Alimentação": ["SUPERMERCADO", "IFOOD", "PADARIA", r"\bRESTAURANTE\b"],
+    "Transporte": ["UBER", "99 ", "POSTO", r"\bCOMBUSTIVEL\b", "ESTACIONAMENTO"],
+    "Educação": ["ESCOLA", "COLEGIO", "FACULDADE", r"\bCURSO\b"],
+    "Saúde": ["FARMACIA", "DROGARIA", "UNIMED", r"\bHOSPITAL\b", r"\bCLINICA\b"],
+    "Lazer": ["NETFLIX", "SPOTIFY", "CINEMA", r"\bVIAGEM\b"],
+}
+
+OUTRAS_RECEITAS = "Outros"
+OUTRAS_DESPESAS = "Outras Despesas"
+RENDA_TOTAL = "RENDA TOTAL"
+
+_METACARACTERES = re.compile(r"[\\^$.|?*+()\[\]{}]")
+
+
+def normalizar(descricao):
+    """Maiúsculas, sem acentos e com espaços simples."""
+    texto = unicodedata.normalize("NFKD", descricao)
+    texto = texto.encode("ascii", "ignore").decode("ascii")
+    return " ".join(texto.upper().split())
+
+
+class IndiceRegras:
+    """Índice compilado das regras de categorização.
+
+    A busca por prefixo percorre a trie caractere a caractere e fica com a
+    regra mais longa que casar; só os lançamentos sem prefixo conhecido passam
+    pela expressão regular combinada.
+    """
+
+    def __init__(self, regras=REGRAS):
+        self.trie = {}
+        padroes = []
+        self.grupos = {}
+
+        for categoria, lista in regras.items():
+            for padrao in lista:
+                if _METACARACTERES.search(padrao.rstrip()):
+                    grupo = f"r{len(padroes)}"
+                    self.grupos[grupo] = categoria
+                    padroes.append(f"(?P<{grupo}>{padrao})")
+                else:
+                    no = self.trie
+                    for caractere in normalizar(padrao) + (
+                        " " if padrao.endswith(" ") else ""
+                    ):
+                        no = no.setdefault(caractere, {})
+                    no[None] = categoria
+
+        self.regex = re.compile("|".join(padroes)) if padroes else None
+
+    def categorizar(self, descricao):
+        """Categoria da descrição, ou None se nenhuma regra casar."""
+        texto = normalizar(descricao)
+
+        no, categoria = self.trie, None
+        for caractere in texto:
+            no = no.get(caractere)
+            if no is None:
+                break
+            categoria = no.get(None, categoria)
+        if categoria is not None:
+            return categoria
+
+        if self.regex is not None:
+            encontrado = self.regex.search(texto)
+            if encontrado:
+                return self.grupos[encontrado.lastgroup]
+
+        return None
+
+
+def _texto(origem, encoding):
+    """Abre um caminho ou envolve um arquivo binário (ex.: upload) como texto."""
+    if isinstance(origem, (str, bytes)) or hasattr(origem, "__fspath__"):
+        return open(origem, encoding=encoding, errors="replace", newline="")
+    if isinstance(origem, io.TextIOBase):
+        return origem
+    return io.TextIOWrapper(origem, encoding=encoding, errors="replace", newline="")
+
+
+MILHAR = re.compile(r"[-+]?\d{1,3}(\.\d{3})+")  # "1.234" ou "-1.234.567"
+
+
+def _valor(texto, milhar=True):
+    """Converte "1.234,56", "1.234", "-1234.56" ou "R$ 10,00" em float.
+
+    Sem vírgula, um ponto seguido de exatamente três dígitos separa milhares
+    (formato brasileiro); com ``milhar=False`` (OFX) o ponto é sempre decimal.
+    """
+    texto = texto.replace("R$", "").replace(" ", "").strip()
+    if "," in texto or (milhar and MILHAR.fullmatch(texto)):
+        texto = texto.replace(".", "").replace(",", ".")
+    try:
+        return float(texto)
+    except ValueError:
+        raise ValueError(f"Valor inválido: {texto!r}") from None
+
+
+def _data(texto):
+    texto = texto.strip()
+    for formato, tamanho in (("%d/%m/%Y", 10), ("%Y-%m-%d", 10), ("%Y%m%d", 8)):
+        try:
+            return datetime.strptime(texto[:tamanho], formato)
+        except ValueError:
+            continue
+    raise ValueError(f"Data inválida: {texto!r}")
+
+
+def ler_csv(
+    origem,
+    coluna_data="data",
+    coluna_descricao="descricao",
+    coluna_valor="valor",
+    delimitador=";",
+    encoding="utf-8",
+):
+    """Lançamentos (data, descrição, valor) de um extrato CSV, um por vez.
+
+    Raises:
+        ValueError: Se faltar alguma coluna ou uma data ou valor for inválido.
+    """
+    with _texto(origem, encoding) as arquivo:
+        leitor = csv.DictReader(arquivo, delimiter=delimitador)
+        colunas = [coluna_data, coluna_descricao, coluna_valor]
+        faltando = [
+            coluna for coluna in colunas if coluna not in (leitor.fieldnames or [])
+        ]
+        if faltando:
+            raise ValueError(
+                f"Colunas ausentes no extrato: {', '.join(faltando)} (esperadas: "
+                f"{', '.join(colunas)}, separadas por {delimitador!r})"
+            )
+        for linha in leitor:
+            if not linha.get(coluna_valor):
+                continue
+            try:
+                lancamento = (
+                    _data(linha[coluna_data] or ""),
+                    linha[coluna_descricao] or "",
+                    _valor(linha[coluna_valor]),
+                )
+            except ValueError as erro:
+                raise ValueError(
+                    f"Linha {leitor.line_num} do extrato: {erro}"
+                ) from erro
+            yield lancamento
+
+
+def ler_ofx(origem, encoding="latin-1"):
+    """Lançamentos (data, descrição, valor) de um extrato OFX, um por vez.
+
+    Aceita tanto o OFX 1.x (SGML, tags sem fechamento) quanto o 2.x (XML).
+    """
+    # As tags são tratadas em sequência, então vários lançamentos na mesma
+    # linha (OFX minificado) também são lidos
+    marcacao = re.compile(r"<(/?\w+)>([^<\r\n]*)")
+    with _texto(origem, encoding) as arquivo:
+        transacao = None
+        for linha in arquivo:
+            for tag, conteudo in marcacao.findall(linha):
+                tag = tag.upper()
+                if tag == "STMTTRN":
+                    transacao = {}
+                elif tag == "/STMTTRN" and transacao is not None:
+                    if not {"DTPOSTED", "TRNAMT"} <= set(transacao):
+                        raise ValueError("Lançamento do OFX sem DTPOSTED ou TRNAMT")
+                    yield (
+                        _data(transacao["DTPOSTED"]),
+                        transacao.get("MEMO") or transacao.get("NAME", ""),
+                        _valor(transacao["TRNAMT"], milhar=False),
+                    )
+                    transacao = None
+                elif transacao is not None and conteudo.strip():
+                    transacao.setdefault(tag, conteudo.strip())
+
+
+def ler_extrato(origem, nome=None, **kwargs):
+    """Escolhe o leitor pela extensão do arquivo (.ofx ou .csv)."""
+    nome = str(nome or getattr(origem, "name", origem))
+    if nome.lower().endswith(".ofx"):
+        return ler_ofx(origem, **kwargs)
+    return ler_csv(origem, **kwargs)
+
+
+def agregar(lancamentos, indice=None):
+    """Soma os lançamentos por mês e categoria numa única passada.
+
+    Returns:
+        pandas.DataFrame: Colunas "Mês", "Categoria", "Tipo" ("Receita" ou
+        "Despesa") e "Valor" (sempre positivo).
+    """
+    indice = indice or IndiceRegras()
+    totais = defaultdict(float)
+
+    for data, descricao, valor in lancamentos:
+        tipo = "Receita" if valor > 0 else "Despesa"
+        categoria = indice.categorizar(descricao)
+        if categoria is None:
+            categoria = OUTRAS_RECEITAS if valor > 0 else OUTRAS_DESPESAS
+        totais[(data.strftime("%Y-%m"), categoria, tipo)] += abs(valor)
+
+    fluxos = pd.DataFrame(
+        [(*chave, total) for chave, total in totais.items()],
+        columns=["Mês", "Categoria", "Tipo", "Valor"],
+    )
+    return fluxos.sort_values(["Mês", "Tipo", "Categoria"]).reset_index(drop=True)
+
+
+def dados_sankey(fluxos):
+    """Entradas do Sankey (receitas -> RENDA TOTAL -> despesas).
+
+    Os valores são frações da renda total, como em ``gerar_grafico.py``. O que
+    sobra da renda depois das despesas aparece como "Sobra".
+
+    Returns:
+        tuple: labels, source, target e value.
+    """
+    por_categoria = fluxos.groupby(["Tipo", "Categoria"])["Valor"].sum()
+    receitas = por_categoria.get("Receita", pd.Series(dtype=float))
+    despesas = por_categoria.get("Despesa", pd.Series(dtype=float))
+    renda = receitas.sum()
+    if renda <= 0:
+        raise ValueError("O extrato não tem receitas.")
+
+    sobra = renda - despesas.sum()
+    if sobra > 0:
+        despesas = pd.concat([despesas, pd.Series({"Sobra": sobra})])
+
+    labels = list(receitas.index) + [RENDA_TOTAL] + list(despesas.index)
+    centro = len(receitas)
+    source = list(range(centro)) + [centro] * len(despesas)
+    target = [centro] * centro + list(range(centro + 1, len(labels)))
+    value = list(receitas / renda) + list(despesas / renda)
+
+    return labels, source, target, value
+
+
+def _receitas(fluxos):
+    """Receitas do extrato sem os resgates de investimentos."""
+    return fluxos.loc[
+        (fluxos["Tipo"] == "Receita") & (fluxos["Categoria"] != INVESTIMENTOS),
+        "Valor",
+    ].sum()
+
+
+def taxa_poupanca(fluxos):
+    """Fração da renda do extrato que não foi gasta (ou foi investida)."""
+    receitas = _receitas(fluxos)
+    despesas = fluxos.loc[
+        (fluxos["Tipo"] == "Despesa") & (fluxos["Categoria"] != INVESTIMENTOS),
+        "Valor",
+    ].sum()
+    return (receitas - despesas) / receitas if receitas > 0 else 0.0
+
+
+def aporte_equivalente(fluxos, renda_mensal):
+    """Poupança média do extrato como ``aporte`` (% da renda) da calculadora.
+
+    A calculadora aplica o aporte sobre ``renda_mensal * MULTIPLICADOR_ANUAL``;
+    a poupança anual é a média mensal do extrato vezes 12.
+    """
+    meses = fluxos["Mês"].nunique()
+    if meses == 0 or renda_mensal <= 0:
+        return 0
+    poupanca_anual = taxa_poupanca(fluxos) * _receitas(fluxos) / meses * 12
+    aporte = poupanca_anual / (renda_mensal * MULTIPLICADOR_ANUAL) * 100
+    return max(int(round(aporte)), 0)
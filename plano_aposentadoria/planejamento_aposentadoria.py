@@ -1,3 +1,5 @@
+import io
+
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
@@ -6,61 +8,63 @@ import seaborn as sns
 import streamlit as st
 from bs4 import BeautifulSoup
 
-# Configuração da página
-st.set_page_config(layout="wide")  # Isso define a largura para ocupar a tela inteira
-
-
-def calcular_ir(salario_mensal, aporte):
-    # Cálculo do renda mensal considerando o salário bruto
-    previdencia = (
-        salario_mensal * (aporte / 100) if aporte < 12 else salario_mensal * 0.12
-    )
-
-    # Faixas do INSS (baseado em valores de 2025)
-    faixas_inss = [(1518.00, 0.075), (2793.88, 0.09), (4190.83, 0.12), (8157.41, 0.14)]
-    teto_inss = 8157.41  # Teto do INSS
-
-    # Cálculo da contribuição mensal ao INSS
-    salario_base = min(salario_mensal, teto_inss)
-    inss_mensal = 0
-    faixa_anterior = 0
-
-    for faixa, aliquota in faixas_inss:
-        if salario_base > faixa:
-            inss_mensal += (faixa - faixa_anterior) * aliquota
-        else:
-            inss_mensal += (salario_base - faixa_anterior) * aliquota
-            break
-        faixa_anterior = faixa
-
-    # Renda tributável
-    renda_tributavel = salario_mensal - inss_mensal - previdencia
-    renda_sem = salario_mensal - inss_mensal
-
-    # Faixas do IR (2025)
-    faixas_ir = [
-        (2259.20, 0.0, 0),
-        (2826.65, 0.075, 169.44),
-        (3751.05, 0.15, 381.44),
-        (4664.68, 0.225, 662.77),
-        (float("inf"), 0.275, 896.00),
-    ]
-
-    def irpf(renda, faixas_ir):
-        """Calcula o IRPF com base na renda e nas faixas de IR fornecidas."""
-
-        ir = 0
-        for limite, aliquota, deducao in faixas_ir:
-            if renda < limite:
-                ir = (renda * aliquota) - deducao
-                break
-            else:
-                ir = (limite * aliquota) - deducao
-
-        return ir
-
-    ir_mensal = irpf(renda_tributavel, faixas_ir)
-    ir_sem = irpf(renda_sem, faixas_ir)
+import aquecimento
+import centavos
+from agregacao import percentis_acumulacao
+from atlas_sensibilidade import consultar_atlas
+from backtest import (
+    backtest_estrategia,
+    carregar_historico,
+    historico_disponivel,
+    resumo_backtest,
+    taxa_sucesso,
+)
+from cache_cenarios import cache_persistente
+from carreira import (
+    ler_tabela,
+    projetar_carreira,
+    salarios_carreira,
+    tabela_geometrica,
+)
+from carteira import CLASSES, GLIDE_PATHS, comparar_glide_paths, pesos_glide_paths
+from comparacao import ESTRATEGIAS, comparar_estrategias, tabela_alinhada
+from dividas import comparar_planos
+from familia import projetar_familia, projetar_familia_otimizada
+from graficos import figura
+from independencia import mapa_cruzamento
+from longevidade import (
+    carregar_tabua,
+    probabilidade_ruina,
+    retirada_sustentavel,
+    tabua_disponivel,
+)
+from motor import (
+    VERSAO_TABELAS,
+    impostos,
+    para_dataframe,
+    projetar_inv,
+    projetar_prev,
+)
+from orcamento import aporte_equivalente, agregar, ler_extrato, taxa_poupanca
+from previdencia_publica import projetar_beneficios, trajetoria_salarial
+from reserva import dimensionar_reserva, projetar_com_reserva
+from saques_dinamicos import comparar_regras
+from sensibilidade import tornado
+from tributacao_resgate import usufruto_liquido
+from veiculos import ranking_veiculos, tabela_veiculos
+
+
+def calcular_ir(salario_mensal, aporte, exato=False):
+    # Cálculo do IRPF anual com e sem PGBL (faixas de INSS e IR em motor.py).
+    # No modo exato os valores são arredondados ao centavo como na folha.
+    if exato:
+        calculado = {
+            chave: centavos.para_reais(valor)
+            for chave, valor in centavos.impostos(salario_mensal, aporte).items()
+        }
+    else:
+        calculado = impostos(salario_mensal, aporte)
+    valores = {chave: float(valor) for chave, valor in calculado.items()}
 
     dados = {
         "Descrição": [
@@ -71,18 +75,18 @@ def calcular_ir(salario_mensal, aporte):
             "IRPF",
         ],
         "Sem PGBL": [
-            salario_mensal * 13.5,
-            inss_mensal * 13.5,
+            valores["Renda Anual"],
+            valores["Desconto INSS"],
             0,  # Sem PGBL
-            renda_sem * 13.5,
-            ir_sem * 13.5,
+            valores["Renda Tributável Sem PGBL"],
+            valores["IRPF Sem PGBL"],
         ],
         "Com PGBL": [
-            salario_mensal * 13.5,
-            inss_mensal * 13.5,
-            previdencia * 13.5,
-            renda_tributavel * 13.5,
-            ir_mensal * 13.5,
+            valores["Renda Anual"],
+            valores["Desconto INSS"],
+            valores["PGBL"],
+            valores["Renda Tributável"],
+            valores["IRPF"],
         ],
     }
 
@@ -91,7 +95,7 @@ def calcular_ir(salario_mensal, aporte):
     return df
 
 
-def tabela_prev(renda_mensal, aporte, taxa_anual, dirpf):
+def tabela_prev(renda_mensal, aporte, taxa_anual, dirpf, exato=False):
     """
     Calcula a tabela de poupança e renda passiva a cada 5 anos.
 
@@ -99,61 +103,22 @@ def tabela_prev(renda_mensal, aporte, taxa_anual, dirpf):
         aporte_mensal (float): O valor do aporte mensal.
         taxa_anual (float): A taxa de juros anual (em porcentagem).
         prazo_anos (int): O prazo em anos.
+        exato (bool): Calcula em centavos inteiros (ver ``centavos.py``).
 
     Returns:
         pandas.DataFrame: A tabela de poupança e renda passiva a cada 5 anos.
     """
-
-    # Valor aportado no 1o mes
-    taxa_aporte = aporte / 100
-    renda_anual = renda_mensal * 13.5
-
-    aporte_total = renda_anual * taxa_aporte
-
-    aporte_1 = aporte_total if taxa_aporte < 0.12 else 0.12 * renda_anual
-
-    dados = [
-        {
-            "Anos": 1,
-            "Valor Aportado": aporte_1,
-            "Saldo Acumulado": aporte_1,
-            "Renda Passiva Anual": 0,
-            "Renda Passiva Mensal": 0,
-        }
-    ]
-
-    aporte_liq = aporte_1 - dirpf
-
-    anos = list(range(2, 31))  # começa do segundo ano
-
-    saldo_acumulado = aporte_1
-    for ano in anos:
-        valor_aportado = (
-            aporte_1 + (ano - 1) * aporte_liq
-        )  # Calcula o valor total aportado
-        saldo_acumulado = aporte_1 + saldo_acumulado * (1 + taxa_anual / 100)
-        if ano <= 10:
-            rendimento_anual = 0
-            rendimento_mensal = 0
-        else:
-            rendimento_anual = saldo_acumulado * taxa_anual / 100
-            rendimento_mensal = rendimento_anual / 12
-        dados.append(
-            {
-                "Anos": ano,
-                "Valor Aportado": valor_aportado,
-                "Saldo Acumulado": saldo_acumulado,
-                "Renda Passiva Anual": rendimento_anual,
-                "Renda Passiva Mensal": rendimento_mensal,
-            }
+    if exato:
+        return centavos.para_dataframe(
+            centavos.projetar_prev(
+                renda_mensal, aporte, taxa_anual, centavos.para_centavos(dirpf)
+            )
         )
 
-    df = pd.DataFrame(dados)
-
-    return df
+    return para_dataframe(projetar_prev(renda_mensal, aporte, taxa_anual, dirpf))
 
 
-def tabela_inv(renda_mensal, aporte, taxa_anual, dirpf=0):
+def tabela_inv(renda_mensal, aporte, taxa_anual, dirpf=0, exato=False):
     """
     Calcula a tabela de poupança e renda passiva a cada 5 anos.
 
@@ -161,60 +126,22 @@ def tabela_inv(renda_mensal, aporte, taxa_anual, dirpf=0):
         aporte_mensal (float): O valor do aporte mensal.
         taxa_anual (float): A taxa de juros anual (em porcentagem).
         prazo_anos (int): O prazo em anos.
+        exato (bool): Calcula em centavos inteiros (ver ``centavos.py``).
 
     Returns:
         pandas.DataFrame: A tabela de poupança e renda passiva a cada 5 anos.
     """
-
-    # Valor aportado no 1o mes
-    taxa_aporte = aporte / 100
-    renda_anual = renda_mensal * 13.5
-    taxa_prev = aporte / 100 if aporte < 12 else 0.12
-
-    if dirpf == 0:
-        aporte_1 = renda_anual * taxa_aporte
-    else:
-        aporte_1 = renda_anual * (taxa_aporte - taxa_prev)
-
-    dados = [
-        {
-            "Anos": 1,
-            "Valor Aportado": aporte_1,
-            "Saldo Acumulado": aporte_1,
-            "Renda Passiva Anual": 0,
-            "Renda Passiva Mensal": 0,
-        }
-    ]
-
-    anos = list(range(2, 31))  # começa do segundo ano
-
-    aporte_inv = aporte_1 + dirpf
-    saldo_acumulado = aporte_1
-
-    for ano in anos:
-        valor_aportado = (
-            aporte_1 + (ano - 1) * aporte_inv
-        )  # Calcula o valor total aportado
-        saldo_acumulado = aporte_inv + saldo_acumulado * (1 + taxa_anual / 100)
-
-        rendimento_anual = saldo_acumulado * taxa_anual / 100
-        rendimento_mensal = rendimento_anual / 12
-
-        dados.append(
-            {
-                "Anos": ano,
-                "Valor Aportado": valor_aportado,
-                "Saldo Acumulado": saldo_acumulado,
-                "Renda Passiva Anual": rendimento_anual,
-                "Renda Passiva Mensal": rendimento_mensal,
-            }
+    if exato:
+        return centavos.para_dataframe(
+            centavos.projetar_inv(
+                renda_mensal, aporte, taxa_anual, centavos.para_centavos(dirpf)
+            )
         )
 
-    df = pd.DataFrame(dados)
-
-    return df
+    return para_dataframe(projetar_inv(renda_mensal, aporte, taxa_anual, dirpf))
 
 
+@cache_persistente(VERSAO_TABELAS)
 def tabela_comparativa_renda(taxa_anual, anos, aportes, dirpf):
     dados = {"Anos": anos}
 
@@ -240,6 +167,7 @@ def tabela_comparativa_renda(taxa_anual, anos, aportes, dirpf):
     return df
 
 
+@cache_persistente(VERSAO_TABELAS)
 def tabela_comparativa_patrimonio(taxa_anual, anos, aportes, dirpf):
     dados = {"Anos": anos}
 
@@ -265,7 +193,40 @@ def tabela_comparativa_patrimonio(taxa_anual, anos, aportes, dirpf):
     return df
 
 
-def calcular_aporte(renda_mensal, aporte):
+def tabela_sensibilidade(estrategia, coluna, taxa_anual, anos, aportes, dirpf=0):
+    """Tabela dos heatmaps: usa o atlas pré-calculado ou, na falta dele, recalcula."""
+    df = consultar_atlas(estrategia, coluna, taxa_anual, anos, aportes, dirpf)
+    if df is not None:
+        return df
+
+    if estrategia == "agressiva":
+        if coluna == "Saldo Acumulado":
+            return tabela_comparativa_patrimonio(taxa_anual, anos, aportes, dirpf)
+        return tabela_comparativa_renda(taxa_anual, anos, aportes, dirpf)
+
+    dados = {"Anos": anos}
+
+    for aporte in aportes:
+
+        if estrategia == "moderada":
+            df = tabela_prev(1, aporte, taxa_anual, dirpf)
+        else:
+            df = tabela_inv(1, aporte, taxa_anual)
+
+        df = df[df["Anos"].isin(anos)]
+
+        dados[f"Aporte {aporte}%"] = df[coluna].to_numpy()
+
+    return pd.DataFrame(dados)
+
+
+def calcular_aporte(renda_mensal, aporte, exato=False):
+    if exato:
+        valores = centavos.aportes(renda_mensal, aporte)
+        df = pd.DataFrame({chave: valor / 100 for chave, valor in valores.items()})
+        df.insert(0, "Ano", [1, 2])
+        return df
+
     dados = []
 
     renda_anual = 13.5 * renda_mensal
@@ -349,6 +310,7 @@ def tabela_html(df, tipo=None):
     return soup
 
 
+@cache_persistente(VERSAO_TABELAS)
 def usufruto(renda_mensal, taxa_anual, df):
 
     def anos_usufruto(valor, renda_mensal, taxa_mensal):
@@ -375,7 +337,7 @@ def usufruto(renda_mensal, taxa_anual, df):
     return df
 
 
-def criar_heatmap(dataframe, tipo):
+def figura_heatmap(dataframe, tipo):
     """Cria um heatmap onde a primeira coluna é o índice (y) e as colunas restantes são os valores (x)."""
     dataframe = dataframe.set_index(
         dataframe.columns[0]
@@ -387,7 +349,13 @@ def criar_heatmap(dataframe, tipo):
         dataframe = dataframe.round().astype(int)
         tipo_fmt = "d"
         tipo_vmin = -200
-    plt.figure(figsize=(10, 8))
+    elif tipo == 3:
+        tipo_fmt = ".1f"
+        tipo_vmin = 0
+    elif tipo == 4:
+        tipo_fmt = ".0%"
+        tipo_vmin = 0
+    fig, ax = plt.subplots(figsize=(10, 8))
     sns.heatmap(
         dataframe,
         annot=True,
@@ -395,11 +363,464 @@ def criar_heatmap(dataframe, tipo):
         fmt=tipo_fmt,
         vmin=tipo_vmin,
         vmax=dataframe.max().max(),
+        ax=ax,
+    )
+    return fig
+
+
+def criar_heatmap(dataframe, tipo):
+    """Publica o heatmap no Streamlit."""
+    fig = figura_heatmap(dataframe, tipo)
+    st.pyplot(fig)
+    plt.close(fig)
+
+
+def exibir_mapa_independencia(renda_mensal, taxa_anual, aportes, estrategia):
+    """Publica o heatmap com os anos até a renda passiva alcançar a renda desejada."""
+    alvos = [renda_mensal * fator for fator in (0.25, 0.5, 0.75, 1.0, 1.25)]
+    df = mapa_cruzamento(renda_mensal, taxa_anual, aportes, alvos, estrategia)
+
+    st.markdown(
+        "<h3>Renda Desejada x Anos até a Renda Passiva Mensal alcançá-la</h3>",
+        unsafe_allow_html=True,
+    )
+    criar_heatmap(df, tipo=3)
+
+
+def exibir_previdencia_publica(renda_mensal, taxa_anual, saldo_acumulado):
+    """Publica o benefício do RPPS/Funpresp de um servidor que ingressa hoje."""
+    salarios = trajetoria_salarial(renda_mensal, 30)
+    df = projetar_beneficios(
+        salarios,
+        np.datetime64("today"),
+        "M",
+        taxa_investimentos=taxa_anual,
+    )
+    df["Saldo Acumulado"] = saldo_acumulado
+    df = df[
+        [
+            "Regra",
+            "Benefício RPPS",
+            "Benefício Funpresp",
+            "Lacuna",
+            "Patrimônio Necessário",
+            "Saldo Acumulado",
+        ]
+    ]
+
+    # converte em uma tabela html e publica
+    tabela = tabela_html(df)
+    st.markdown(
+        "<h3>Previdência Pública (RPPS limitado ao teto + Funpresp) em 30 anos</h3>",
+        unsafe_allow_html=True,
+    )
+    st.write(str(tabela), unsafe_allow_html=True)
+
+
+@st.cache_data
+def ler_fluxos(conteudo, nome):
+    """Fluxos do extrato enviado, lidos uma vez por conteúdo do arquivo."""
+    return agregar(ler_extrato(io.BytesIO(conteudo), nome))
+
+
+def exibir_longevidade(renda_mensal, taxa_anual, saldo_acumulado):
+    """Publica a ruína ponderada pela sobrevivência se a tábua local existir."""
+    if not tabua_disponivel():
+        return
+
+    adicionar_linha()
+    tabua = carregar_tabua()
+    sexos = {"Feminino": "F", "Masculino": "M"}
+    idades = np.array([55, 60, 65, 70, 75])
+    saldos = saldo_acumulado * np.array([0.5, 0.75, 1.0, 1.25, 1.5])
+
+    ruina = probabilidade_ruina(
+        tabua,
+        list(sexos.values()),
+        idades,
+        saldos,
+        renda_mensal,
+        taxa_anual,
+        volatilidade_anual=12,
+    )
+    colunas = [f"R$ {saldo:,.0f}".replace(",", ".") for saldo in saldos]
+    for i, nome in enumerate(sexos):
+        df = pd.DataFrame(ruina[i], columns=colunas)
+        df.insert(0, "Idade", idades)
+        st.markdown(
+            f"<h3>Idade x Saldo ({nome}): chance de estar vivo quando o saldo "
+            f"acabar, retirando {formatar_reais(renda_mensal)} por mês</h3>",
+            unsafe_allow_html=True,
+        )
+        criar_heatmap(df, tipo=4)
+
+    retiradas = retirada_sustentavel(
+        tabua,
+        list(sexos.values()),
+        idades,
+        [saldo_acumulado],
+        taxa_anual,
+        confianca=0.9,
+        volatilidade_anual=12,
+    )
+    df = pd.DataFrame({"Idade": idades})
+    for i, nome in enumerate(sexos):
+        df[nome] = retiradas[i, :, 0]
+    tabela = tabela_html(df)
+    st.markdown(
+        f"<h3>Retirada mensal sustentável com 90% de confiança "
+        f"(saldo de {formatar_reais(saldo_acumulado)})</h3>",
+        unsafe_allow_html=True,
+    )
+    st.write(str(tabela), unsafe_allow_html=True)
+
+
+def exibir_backtest(renda_mensal, aporte, estrategia):
+    """Publica o backtest histórico se a série local estiver disponível."""
+    if not historico_disponivel():
+        return
+
+    adicionar_linha()
+    colunas = carregar_historico().columns
+    carteiras = {
+        "CDI": {"cdi": 1.0},
+        "70% CDI + 30% Ibovespa": {"cdi": 0.7, "ibov": 0.3},
+    }
+    for nome, pesos in carteiras.items():
+        if not set(pesos) <= set(colunas):
+            continue
+        df = backtest_estrategia(renda_mensal, aporte, estrategia, pesos)
+        resumo = resumo_backtest(df)[["Cenário", "Saldo Acumulado", "Saldo Real"]]
+
+        tabela = tabela_html(resumo)
+        st.markdown(
+            f"<h3>Backtest histórico em 10 anos ({nome})</h3>", unsafe_allow_html=True
+        )
+        st.write(str(tabela), unsafe_allow_html=True)
+        st.write(
+            f"Janelas em que a renda de {formatar_reais(renda_mensal)} durou 10 anos: "
+            f"{taxa_sucesso(df):.0%}"
+        )
+
+
+def exibir_dividas(renda_mensal, aporte, taxa_anual):
+    """Compara planos de quitação das dívidas e o patrimônio depois deles."""
+    with st.expander("Dívidas (opcional): planos de quitação"):
+        dividas = st.data_editor(
+            pd.DataFrame(
+                {
+                    "Dívida": ["Casa", "Carro", "Geladeira", "Celular"],
+                    "Saldo Devedor": [225000.0, 58342.0, 2100.0, 3096.0],
+                    "Parcela": [2725.69, 2248.55, 150.0, 226.67],
+                    "Juros (% a.m.)": [0.9, 1.9, 0.0, 3.1],
+                }
+            ),
+            num_rows="dynamic",
+        ).dropna()
+        if dividas.empty:
+            return
+
+        df = comparar_planos(
+            dividas["Saldo Devedor"],
+            dividas["Juros (% a.m.)"],
+            dividas["Parcela"],
+            renda_mensal,
+            aporte,
+            taxa_anual,
+        )
+        for col in ["Extra Mensal", "Juros Pagos", "Saldo Acumulado"]:
+            df[col] = df[col].apply(formatar_reais)
+        df["Meses até Quitar"] = df["Meses até Quitar"].apply(
+            lambda x: "não quita" if np.isnan(x) else f"{int(x)}"
+        )
+        df = df.rename(columns={"Saldo Acumulado": "Saldo Acumulado em 30 anos"})
+
+        soup = BeautifulSoup(df.to_html(index=False), "html.parser")
+        for cell in soup.find_all("th"):
+            cell["style"] = "text-align: center;"
+        st.write(str(soup), unsafe_allow_html=True)
+
+
+def exibir_reserva(renda_mensal, aporte, taxa_anual):
+    """Publica a reserva de emergência e o efeito de formá-la antes de investir."""
+    reservas = dimensionar_reserva(renda_mensal, aporte)
+
+    df_reserva = reservas.copy()
+    df_reserva["Reserva"] = df_reserva["Reserva"].apply(formatar_reais)
+    df_reserva["Meses de Despesas"] = df_reserva["Meses de Despesas"].apply(
+        lambda x: f"{x:.1f}"
+    )
+    soup = BeautifulSoup(df_reserva.to_html(index=False), "html.parser")
+    for cell in soup.find_all("th"):
+        cell["style"] = "text-align: center;"
+
+    st.markdown(
+        "<h3>Reserva de emergência por probabilidade de cobrir os imprevistos</h3>",
+        unsafe_allow_html=True,
+    )
+    st.write(str(soup), unsafe_allow_html=True)
+
+    # Reserva de 95%: adiar os investimentos (todo o aporte vai para a reserva)
+    # ou reduzi-los (metade do aporte vai para a reserva até completá-la)
+    alvo = f"{0.95:.0%}"
+    reserva = reservas.loc[reservas["Probabilidade"] == alvo, "Reserva"].iloc[0]
+    df = tabela_inv(renda_mensal, aporte, taxa_anual)
+    cenarios = {"Sem reserva": df}
+    for rotulo, fracao in [("adiando os aportes", 1.0), ("com metade do aporte", 0.5)]:
+        cenarios[f"Reserva de {alvo} {rotulo}"] = projetar_com_reserva(
+            renda_mensal, aporte, taxa_anual, reserva, fracao=fracao
+        )
+    comparacao = pd.DataFrame(
+        {
+            "Cenário": list(cenarios),
+            "Saldo Acumulado": [
+                tabela["Saldo Acumulado"].iloc[-1] for tabela in cenarios.values()
+            ],
+            "Renda Passiva Mensal": [
+                tabela["Renda Passiva Mensal"].iloc[-1] for tabela in cenarios.values()
+            ],
+        }
     )
-    st.pyplot(plt)
+    tabela = tabela_html(comparacao)
+    st.markdown(
+        "<h3>Patrimônio em 30 anos formando a reserva antes de investir</h3>",
+        unsafe_allow_html=True,
+    )
+    st.write(str(tabela), unsafe_allow_html=True)
+
+
+def exibir_saques_dinamicos(saldo_acumulado, renda_mensal, taxa_anual):
+    """Compara regras de saque no usufruto com rentabilidades aleatórias."""
+    df = comparar_regras(
+        saldo_acumulado,
+        renda_mensal,
+        taxa_anual,
+        volatilidade_anual=12,
+        n_caminhos=10000,
+        anos=30,
+    )
+
+    df["Probabilidade de Esgotar"] = df["Probabilidade de Esgotar"].apply(
+        lambda x: f"{x:.1%}"
+    )
+    for col in df.columns[2:]:
+        df[col] = df[col].apply(formatar_reais)
+
+    soup = BeautifulSoup(df.to_html(index=False), "html.parser")
+    for cell in soup.find_all("th"):
+        cell["style"] = "text-align: center;"
+
+    st.markdown(
+        "<h3>Regras de saque em 30 anos de usufruto (volatilidade de 12% a.a.)</h3>",
+        unsafe_allow_html=True,
+    )
+    st.write(str(soup), unsafe_allow_html=True)
+
+
+def exibir_comparacao(renda_mensal, aporte, taxa_anual):
+    """Publica as três estratégias lado a lado, calculadas numa única passada."""
+    resultados = comparar_estrategias(renda_mensal, aporte, taxa_anual)
+
+    st.markdown(
+        "<h3>Diferença de IRPF com o PGBL: "
+        f"{formatar_reais(float(resultados['IR']['dirpf']))}</h3>",
+        unsafe_allow_html=True,
+    )
+
+    for coluna in ["Saldo Acumulado", "Renda Passiva Mensal"]:
+        tabela = tabela_html(tabela_alinhada(resultados, coluna))
+        st.markdown(f"<h3>{coluna}</h3>", unsafe_allow_html=True)
+        st.write(str(tabela), unsafe_allow_html=True)
+
+    adicionar_linha()
+
+    fig = figura(
+        "estrategias",
+        resultados["Conservadora"]["Anos"],
+        *(resultados[estrategia]["Saldo Acumulado"] for estrategia in ESTRATEGIAS),
+    )
+    st.markdown("<h3>Patrimônio Acumulado</h3>", unsafe_allow_html=True)
+    st.plotly_chart(fig)
+
+
+def exibir_tornado(renda_mensal, aporte, taxa_anual, estrategia):
+    """Publica o tornado do saldo em 30 anos com cada entrada -/+ 10%."""
+    df = tornado(renda_mensal, aporte, taxa_anual, estrategia)[::-1]
+
+    # Variação do saldo em relação ao cenário base (%)
+    base = df["Saldo Acumulado (base)"]
+    baixo = df["Saldo Acumulado (-)"]
+    alto = df["Saldo Acumulado (+)"]
+
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                name="Entrada -10%",
+                y=df["Parâmetro"],
+                x=100 * (baixo / base - 1),
+                orientation="h",
+                marker=dict(color="orange"),
+                hovertemplate="%{y}: %{x:.1f}%<extra></extra>",
+            ),
+            go.Bar(
+                name="Entrada +10%",
+                y=df["Parâmetro"],
+                x=100 * (alto / base - 1),
+                orientation="h",
+                marker=dict(color="blue"),
+                hovertemplate="%{y}: %{x:.1f}%<extra></extra>",
+            ),
+        ]
+    )
+    fig.update_layout(
+        barmode="overlay",
+        xaxis_title="Variação do Saldo Acumulado em 30 anos (%)",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02),
+    )
+    st.markdown(
+        "<h3>Sensibilidade do patrimônio a cada entrada (±10%)</h3>",
+        unsafe_allow_html=True,
+    )
+    st.plotly_chart(fig)
+
+
+def exibir_carteira(renda_mensal, aporte):
+    """Compara glide paths de uma carteira com várias classes de ativos."""
+    with st.expander("Carteira com vários ativos (opcional): glide paths"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            idade = st.number_input("Idade atual", min_value=18, max_value=80, value=30)
+        with col2:
+            rebalanceamento = st.selectbox(
+                "Rebalanceamento", ["anual", "banda", "nenhum"]
+            )
+        with col3:
+            custo = st.number_input(
+                "Custo sobre as vendas (%)", min_value=0.0, value=0.3, step=0.1
+            )
+
+        df = comparar_glide_paths(
+            renda_mensal,
+            aporte,
+            idade,
+            rebalanceamento=rebalanceamento,
+            custo=custo / 100,
+        )
+        for col in df.columns[1:]:
+            df[col] = df[col].apply(formatar_reais)
+
+        soup = BeautifulSoup(df.to_html(index=False), "html.parser")
+        for cell in soup.find_all("th"):
+            cell["style"] = "text-align: center;"
+        st.write(
+            f"Patrimônio em 30 anos ({', '.join(CLASSES)}; 2.000 caminhos aleatórios)"
+        )
+        st.write(str(soup), unsafe_allow_html=True)
+
+        # Fração em ações de cada glide path ao longo da idade
+        pesos = pesos_glide_paths(idade)
+        idades = idade + np.arange(pesos.shape[1])
+        fig = go.Figure(
+            data=[
+                go.Scatter(
+                    name=nome,
+                    x=idades,
+                    y=100 * pesos[i, :, -1],
+                    mode="lines",
+                    hovertemplate=f"{nome}<br>Idade: %{{x}}<br>"
+                    "Ações: %{y:.0f}%<extra></extra>",
+                )
+                for i, nome in enumerate(GLIDE_PATHS)
+            ]
+        )
+        fig.update_layout(
+            xaxis_title="Idade",
+            yaxis_title="Ações (%)",
+            legend=dict(orientation="h", yanchor="bottom", y=1.02),
+        )
+        st.plotly_chart(fig)
+
+
+def exibir_faixas_percentis(renda_mensal, aporte, taxa_anual):
+    """Publica as faixas de percentis do saldo com rentabilidades aleatórias."""
+    df = percentis_acumulacao(
+        renda_mensal, aporte, taxa_anual, volatilidade_anual=12, n_caminhos=100_000
+    )
+
+    fig = figura(
+        "faixas_percentis",
+        df["Anos"],
+        *(df[coluna] for coluna in ["P5", "P25", "P50", "P75", "P95"]),
+    )
+    st.markdown(
+        "<h3>Faixas do patrimônio com volatilidade de 12% a.a. "
+        "(100.000 caminhos)</h3>",
+        unsafe_allow_html=True,
+    )
+    st.plotly_chart(fig)
+
+
+def exibir_carreira(renda_mensal, aporte, taxa_anual):
+    """Compara a renda constante com a progressão por tabela de carreira."""
+    with st.expander("Carreira com tabela (opcional): progressão salarial"):
+        arquivo = st.file_uploader(
+            "Tabela de carreira (CSV com Nível, Padrão, Vencimento e Interstício); "
+            "sem ela, 16 padrões com step de 3,9% a cada 18 meses a partir da renda",
+            type=["csv"],
+        )
+        tabela = tabela_geometrica(renda_mensal)
+        if arquivo:
+            try:
+                tabela = ler_tabela(arquivo)
+            except ValueError as erro:
+                st.error(f"{erro}. Usando a tabela geométrica padrão.")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            posicao = st.number_input(
+                "Posição atual na tabela",
+                min_value=1,
+                max_value=len(tabela),
+                value=1,
+            )
+        with col2:
+            reajuste = st.number_input(
+                "Reajuste geral anual (%)", min_value=0.0, value=0.0, step=0.5
+            )
+        with col3:
+            estrategia = st.selectbox("Estratégia", ESTRATEGIAS, index=2)
+
+        salarios = salarios_carreira(tabela, 30, posicao - 1, reajuste=reajuste / 100)
+        # Linha 0: salário atual constante; linha 1: carreira
+        salarios = np.vstack([np.full(30, salarios[0, 0]), salarios[0]])
+        projecao = projetar_carreira(salarios, aporte, taxa_anual, estrategia.lower())
+
+        anos = np.array([5, 10, 15, 20, 25, 30])
+        df = pd.DataFrame(
+            {
+                "Anos": anos,
+                "Renda Mensal": salarios[1, anos - 1],
+                "Saldo (Renda Constante)": projecao["Saldo Acumulado"][0, anos - 1],
+                "Saldo (Carreira)": projecao["Saldo Acumulado"][1, anos - 1],
+                "Renda Passiva (Carreira)": projecao["Renda Passiva Mensal"][
+                    1, anos - 1
+                ],
+            }
+        )
+        tabela = tabela_html(df)
+        st.write(
+            f"Estratégia {estrategia} com aporte de {aporte}% da renda de cada ano"
+        )
+        st.write(str(tabela), unsafe_allow_html=True)
 
 
 def main():
+    # Configuração da página
+    st.set_page_config(layout="wide")  # Isso define a largura para ocupar a tela inteira
+
+    # Aquece caches e importações em segundo plano (uma vez por processo)
+    aquecimento.iniciar()
+
     st.markdown("""
         <style>
             /* Carregar a fonte do Google Fonts */
@@ -440,6 +861,17 @@ def main():
 
     st.write("Defina os parâmetro iniciais")
 
+    extrato = st.file_uploader(
+        "Extrato bancário (opcional, CSV ou OFX) para sugerir o aporte",
+        type=["csv", "ofx"],
+    )
+    fluxos = None
+    if extrato:
+        try:
+            fluxos = ler_fluxos(extrato.getvalue(), extrato.name)
+        except ValueError as erro:
+            st.error(f"Não foi possível ler o extrato: {erro}")
+
     # Adicione aqui a lógica para a estratégia agressiva
 
     col1, col2, col3 = st.columns(3)  # Divide a tela em colunas
@@ -450,17 +882,42 @@ def main():
         )
 
     with col2:
-        aporte = st.number_input("Aporte (%)", min_value=0, value=12, step=1)
+        # A sugestão do extrato só substitui o aporte quando chega um extrato
+        # novo; depois disso a edição do usuário é mantida
+        st.session_state.setdefault("aporte", 12)
+        if fluxos is not None and st.session_state.get("extrato") != extrato.file_id:
+            st.session_state["extrato"] = extrato.file_id
+            st.session_state["aporte"] = aporte_equivalente(fluxos, renda_mensal)
+        aporte = st.number_input("Aporte (%)", min_value=0, step=1, key="aporte")
 
     with col3:
         taxa_anual = st.number_input("Taxa de Juros Anual (%)", min_value=1, value=10)
 
+    renda_conjuge = st.number_input(
+        "Renda Mensal do Cônjuge (R$) - opcional, para o planejamento do casal",
+        min_value=0,
+        value=0,
+        step=100,
+    )
+
+    if fluxos is not None:
+        st.write(
+            f"Taxa de poupança do extrato: {taxa_poupanca(fluxos):.1%} da renda "
+            f"(aporte sugerido de {aporte_equivalente(fluxos, renda_mensal)}%)"
+        )
+
+    exibir_dividas(renda_mensal, aporte, taxa_anual)
+
+    exibir_carteira(renda_mensal, aporte)
+
+    exibir_carreira(renda_mensal, aporte, taxa_anual)
+
     adicionar_linha()
 
     st.write("Escolha sua estratégia")
 
     # Botões de estratégia
-    estrat1, estrat2, estrat3 = st.columns(3)
+    estrat1, estrat2, estrat3, estrat4 = st.columns(4)
 
     with estrat1:
         botao_conservador = st.button("Estratégia Conservadora")
@@ -471,11 +928,21 @@ def main():
     with estrat3:
         botao_agressivo = st.button("Estratégia Agressiva")
 
+    with estrat4:
+        botao_comparar = st.button("Comparar Estratégias")
+
     # adicionar_linha()
     st.write("")
 
 
     # Lógica dos botões (fora das colunas)
+    if botao_comparar:
+        st.write(
+            "<h3 style='text-align: center;'><font color='orange'>Comparação das Estratégias</font></h3>",
+            unsafe_allow_html=True,
+        )
+        exibir_comparacao(renda_mensal, aporte, taxa_anual)
+
     if botao_conservador:
         st.write(
             "<h3 style='text-align: center;'><font color='orange'>Estratégia Conservadora</font></h3>",
@@ -524,31 +991,13 @@ def main():
         df = df_inv
         blues_palette = sns.color_palette("Blues")
 
-        fig = go.Figure(
-            data=[
-                go.Bar(
-                    name="Valor Aportado",
-                    x=df["Anos"],
-                    y=df["Valor Aportado"],
-                    marker=dict(color="orange"),  # Define a cor da barra
-                    hovertemplate="Ano: %{x}<br>Valor Aportado: R$ %{y:,.2f}<extra></extra>",
-                ),
-                go.Bar(
-                    name="Rendimentos",
-                    x=df["Anos"],
-                    y=df["Saldo Acumulado"] - df["Valor Aportado"],
-                    marker=dict(color="blue"),  # Define a cor da barra
-                    hovertemplate="Ano: %{x}<br>Rendimentos: R$ %{y:,.2f}<extra></extra>",
-                ),
-            ]
+        fig = figura(
+            "aportes_rendimentos",
+            df["Anos"],
+            df["Valor Aportado"],
+            df["Saldo Acumulado"] - df["Valor Aportado"],
         )
         st.markdown("<h3>Patrimônio Acumulado</h3>", unsafe_allow_html=True)
-        fig.update_layout(
-            barmode="stack",
-            # title="Saldo Acumulado",
-            xaxis_title="Prazo (Anos)",
-            yaxis_title="Valor (R$)",
-        )
         st.plotly_chart(fig)
 
         # --- Tabela de sensibilidade --------------------------------------------------------------------
@@ -556,17 +1005,10 @@ def main():
 
         anos = [5, 10, 15, 20, 25, 30]
         aportes = [5, 10, 15, 20]
-        dados = {"Anos": anos}
-
-        for aporte in aportes:
-
-            df_inv = tabela_inv(1, aporte, taxa_anual)
 
-            df_inv = df_inv[df_inv["Anos"].isin(anos)]
-
-            dados[f"Aporte {aporte}%"] = df_inv["Renda Passiva Mensal"]
-
-        df = pd.DataFrame(dados)
+        df = tabela_sensibilidade(
+            "conservadora", "Renda Passiva Mensal", taxa_anual, anos, aportes
+        )
         st.markdown(
             "<h3>Aporte Mensal (%) x Renda Passiva Mensal (%)</h3>",
             unsafe_allow_html=True,
@@ -583,17 +1025,10 @@ def main():
 
         anos = [5, 10, 15, 20, 25, 30]
         aportes = [10, 12, 15, 20, 25, 30]
-        dados = {"Anos": anos}
-
-        for aporte in aportes:
 
-            df_inv = tabela_inv(renda_mensal=1, aporte=aporte, taxa_anual=taxa_anual)
-
-            df_inv = df_inv[df_inv["Anos"].isin(anos)]
-
-            dados[f"Aporte {aporte}%"] = df_inv["Saldo Acumulado"]
-
-        df = pd.DataFrame(dados)
+        df = tabela_sensibilidade(
+            "conservadora", "Saldo Acumulado", taxa_anual, anos, aportes
+        )
         st.markdown("<h3>Aporte Mensal (%) x Patrimônio</h3>", unsafe_allow_html=True)
         criar_heatmap(df, tipo=2)
 
@@ -625,6 +1060,30 @@ def main():
         # # converte em uma tabela html e publica
         # st.write(str(soup), unsafe_allow_html=True)
 
+        # --- Reserva de emergência ----------------------------------------------------------------
+        adicionar_linha()
+
+        exibir_reserva(renda_mensal, aporte, taxa_anual)
+
+        # --- Faixas de percentis ------------------------------------------------------------------
+        adicionar_linha()
+
+        exibir_faixas_percentis(renda_mensal, aporte, taxa_anual)
+
+        # --- Sensibilidade das entradas -----------------------------------------------------------
+        adicionar_linha()
+
+        exibir_tornado(renda_mensal, aporte, taxa_anual, "conservadora")
+
+        # --- Independência financeira -------------------------------------------------------------
+        adicionar_linha()
+
+        exibir_mapa_independencia(
+            renda_mensal, taxa_anual, [5, 10, 15, 20], "conservadora"
+        )
+
+        exibir_backtest(renda_mensal, aporte, "conservadora")
+
         # Adiciona estilo CSS para centralizar os dados das tabelas ----------------------------------
         adicionar_linha()
         st.markdown(
@@ -717,31 +1176,13 @@ def main():
 
         df = df_prev
 
-        fig = go.Figure(
-            data=[
-                go.Bar(
-                    name="Valor Aportado",
-                    x=df["Anos"],
-                    y=df["Valor Aportado"],
-                    marker=dict(color="orange"),  # Define a cor da barra
-                    hovertemplate="Ano: %{x}<br>Valor Aportado: R$ %{y:,.2f}<extra></extra>",
-                ),
-                go.Bar(
-                    name="Rendimentos",
-                    x=df["Anos"],
-                    y=df["Saldo Acumulado"] - df["Valor Aportado"],
-                    marker=dict(color="blue"),  # Define a cor da barra
-                    hovertemplate="Ano: %{x}<br>Rendimentos: R$ %{y:,.2f}<extra></extra>",
-                ),
-            ]
+        fig = figura(
+            "aportes_rendimentos",
+            df["Anos"],
+            df["Valor Aportado"],
+            df["Saldo Acumulado"] - df["Valor Aportado"],
         )
         st.markdown("<h3>Patrimônio Acumulado</h3>", unsafe_allow_html=True)
-        fig.update_layout(
-            barmode="stack",
-            # title="Saldo Acumulado",
-            xaxis_title="Prazo (Anos)",
-            yaxis_title="Valor (R$)",
-        )
         st.plotly_chart(fig)
 
         # --- Tabela de sensibilidade --------------------------------------------------------------------
@@ -749,17 +1190,10 @@ def main():
 
         anos = [11, 12, 15, 20, 25, 30]
         aportes = [5, 8, 10, 12]
-        dados = {"Anos": anos}
-
-        for aporte in aportes:
 
-            df_inv = tabela_prev(1, aporte, taxa_anual, dirpf)
-
-            df_inv = df_inv[df_inv["Anos"].isin(anos)]
-
-            dados[f"Aporte {aporte}%"] = df_inv["Renda Passiva Mensal"]
-
-        df = pd.DataFrame(dados)
+        df = tabela_sensibilidade(
+            "moderada", "Renda Passiva Mensal", taxa_anual, anos, aportes, dirpf
+        )
         st.markdown(
             "<h3>Aporte Mensal (%) x Renda Passiva Mensal (%)</h3>",
             unsafe_allow_html=True,
@@ -776,17 +1210,10 @@ def main():
 
         anos = [11, 12, 15, 20, 25, 30]
         aportes = [5, 8, 10, 12]
-        dados = {"Anos": anos}
 
-        for aporte in aportes:
-
-            df_inv = tabela_prev(1, aporte, taxa_anual, dirpf)
-
-            df_inv = df_inv[df_inv["Anos"].isin(anos)]
-
-            dados[f"Aporte {aporte}%"] = df_inv["Saldo Acumulado"]
-
-        df = pd.DataFrame(dados)
+        df = tabela_sensibilidade(
+            "moderada", "Saldo Acumulado", taxa_anual, anos, aportes, dirpf
+        )
         st.markdown(
             "<h3>Aporte Mensal (%) x Patrimônio (em renda mensal)</h3>",
             unsafe_allow_html=True,
@@ -798,6 +1225,16 @@ def main():
         # st.markdown("<h3>Aporte Mensal (%) x Patrimônio (em renda mensal)</h3>", unsafe_allow_html=True)
         # st.write(str(tabela), unsafe_allow_html=True)
 
+        # --- Sensibilidade das entradas -----------------------------------------------------------
+        adicionar_linha()
+
+        exibir_tornado(renda_mensal, aporte, taxa_anual, "moderada")
+
+        # --- Independência financeira -------------------------------------------------------------
+        adicionar_linha()
+
+        exibir_mapa_independencia(renda_mensal, taxa_anual, [5, 8, 10, 12], "moderada")
+
         # Adiciona estilo CSS para centralizar os dados das tabelas ----------------------------------
         adicionar_linha()
         st.markdown(
@@ -899,31 +1336,13 @@ def main():
         # ---  Gráfico de barras com o patrimônio dividido entre previdência e investimentos ----------
         adicionar_linha()
 
-        fig = go.Figure(
-            data=[
-                go.Bar(
-                    name="PGBL",
-                    x=df_prev["Anos"],
-                    y=df_prev["Saldo Acumulado"],
-                    marker=dict(color="orange"),  # Define a cor da barra
-                    hovertemplate="Ano: %{x}<br>Previdência: R$ %{y:,.2f}<extra></extra>",
-                ),
-                go.Bar(
-                    name="Investimentos",
-                    x=df_inv["Anos"],
-                    y=df_inv["Saldo Acumulado"],
-                    marker=dict(color="blue"),  # Define a cor da barra
-                    hovertemplate="Ano: %{x}<br>Investimentos: R$ %{y:,.2f}<extra></extra>",
-                ),
-            ]
+        fig = figura(
+            "pgbl_investimentos",
+            df_prev["Anos"],
+            df_prev["Saldo Acumulado"],
+            df_inv["Saldo Acumulado"],
         )
         st.markdown("<h3>Patrimônio Acumulado</h3>", unsafe_allow_html=True)
-        fig.update_layout(
-            barmode="stack",
-            # title="Saldo Acumulado",
-            xaxis_title="Prazo (Anos)",
-            yaxis_title="Valor (R$)",
-        )
         st.plotly_chart(fig)
 
         # --- Tabela de sensibilidade --------------------------------------------------------------------
@@ -932,7 +1351,14 @@ def main():
         anos = [5, 10, 15, 20, 25, 30]
         aportes = [10, 12, 15, 20, 25, 30]
 
-        df = tabela_comparativa_renda(taxa_anual, anos, aportes, dirpf / renda_mensal)
+        df = tabela_sensibilidade(
+            "agressiva",
+            "Renda Passiva Mensal",
+            taxa_anual,
+            anos,
+            aportes,
+            dirpf / renda_mensal,
+        )
 
         st.markdown(
             "<h3>Aporte Mensal (%) x Renda Passiva Mensal (%)</h3>",
@@ -951,8 +1377,13 @@ def main():
         anos = [5, 10, 15, 20, 25, 30]
         aportes = [10, 12, 15, 20,  25, 30]
 
-        df = tabela_comparativa_patrimonio(
-            taxa_anual, anos, aportes, dirpf / renda_mensal
+        df = tabela_sensibilidade(
+            "agressiva",
+            "Saldo Acumulado",
+            taxa_anual,
+            anos,
+            aportes,
+            dirpf / renda_mensal,
         )
 
         st.markdown(
@@ -1017,6 +1448,167 @@ def main():
         st.markdown("<h3>Usufruto em meses ou anos</h3>", unsafe_allow_html=True)
         st.markdown(table_style + f'<div class="custom-table">{soup}</div>', unsafe_allow_html=True)
 
+        exibir_longevidade(
+            renda_mensal,
+            taxa_anual,
+            df_total.loc[df_total["Anos"] == 30, "Saldo Acumulado"].iloc[0],
+        )
+
+        # --- Fase de usufruto líquida de IR ---------------------------------------------------------
+        adicionar_linha()
+
+        anos = [5, 10, 15, 16, 17, 18, 19, 20]
+        df_regressiva = usufruto_liquido(
+            renda_mensal, taxa_anual, df_prev, df_inv, anos, regime="regressivo"
+        )
+        df_progressiva = usufruto_liquido(
+            renda_mensal, taxa_anual, df_prev, df_inv, anos, regime="progressivo"
+        )
+
+        df = pd.DataFrame(
+            {
+                "Anos": anos,
+                "Saldo Acumulado": df_regressiva["Saldo Acumulado"].apply(formatar_reais),
+                "Meses (Regressiva)": df_regressiva["Meses de Usufruto"],
+                "IR Médio (Regressiva)": df_regressiva["IR Médio"].apply(
+                    lambda x: f"{x:.2%}"
+                ),
+                "Meses (Progressiva)": df_progressiva["Meses de Usufruto"],
+                "IR Médio (Progressiva)": df_progressiva["IR Médio"].apply(
+                    lambda x: f"{x:.2%}"
+                ),
+            }
+        )
+
+        soup = BeautifulSoup(df.to_html(index=False), "html.parser")
+
+        for cell in soup.find_all("th"):
+            cell["style"] = "text-align: center;"
+
+        # converte em uma tabela html e publica
+        st.markdown(
+            "<h3>Usufruto líquido de IR (resgates do PGBL e dos investimentos)</h3>",
+            unsafe_allow_html=True,
+        )
+        st.write(str(soup), unsafe_allow_html=True)
+
+        # --- Regras de saque dinâmicas -------------------------------------------------------------
+        adicionar_linha()
+
+        exibir_saques_dinamicos(
+            df_total["Saldo Acumulado"].iloc[-1], renda_mensal, taxa_anual
+        )
+
+        # --- Planejamento do casal -----------------------------------------------------------------
+        if renda_conjuge > 0:
+            adicionar_linha()
+
+            rendas = [renda_mensal, renda_conjuge]
+            df_casal, df_membros = projetar_familia(rendas, [aporte, aporte], taxa_anual)
+            df_otimizado, df_distribuicao = projetar_familia_otimizada(
+                rendas, [aporte, aporte], taxa_anual
+            )
+
+            # converte em uma tabela html e publica
+            tabela = tabela_html(df_membros)
+            st.markdown(
+                f"<h3>Casal: IRPF de cada um com aporte de {aporte}% no PGBL</h3>",
+                unsafe_allow_html=True,
+            )
+            st.write(str(tabela), unsafe_allow_html=True)
+
+            df = df_distribuicao[
+                ["Membro", "Renda Anual", "Aporte PGBL", "Diferença IRPF"]
+            ].copy()
+            tabela = tabela_html(df)
+            st.markdown(
+                "<h3>Casal: divisão do PGBL que maximiza a restituição</h3>",
+                unsafe_allow_html=True,
+            )
+            st.write(str(tabela), unsafe_allow_html=True)
+
+            anos = [5, 10, 15, 20, 25, 30]
+            df = pd.DataFrame(
+                {
+                    "Anos": anos,
+                    "Saldo (Mesmo %)": df_casal.loc[
+                        df_casal["Anos"].isin(anos), "Saldo Acumulado"
+                    ].to_numpy(),
+                    "Saldo (Otimizado)": df_otimizado.loc[
+                        df_otimizado["Anos"].isin(anos), "Saldo Acumulado"
+                    ].to_numpy(),
+                    "Renda Passiva (Mesmo %)": df_casal.loc[
+                        df_casal["Anos"].isin(anos), "Renda Passiva Mensal"
+                    ].to_numpy(),
+                    "Renda Passiva (Otimizado)": df_otimizado.loc[
+                        df_otimizado["Anos"].isin(anos), "Renda Passiva Mensal"
+                    ].to_numpy(),
+                }
+            )
+            tabela = tabela_html(df)
+            st.markdown("<h3>Casal: Resultado</h3>", unsafe_allow_html=True)
+            st.write(str(tabela), unsafe_allow_html=True)
+
+        # --- Lacuna da previdência pública ---------------------------------------------------------
+        adicionar_linha()
+
+        exibir_previdencia_publica(
+            renda_mensal,
+            taxa_anual,
+            df_total.loc[df_total["Anos"] == 30, "Saldo Acumulado"].iloc[0],
+        )
+
+        # --- Comparação entre veículos de investimento ----------------------------------------------
+        adicionar_linha()
+
+        renda_anual = renda_mensal * 13.5
+        aporte_anual = renda_anual * aporte / 100
+        aporte_pgbl = min(aporte_anual, 0.12 * renda_anual)
+        parametros = {
+            "aliquota_ir": dirpf / aporte_pgbl if aporte_pgbl > 0 else 0,
+            "limite_dedutivel": 0.12 * renda_anual,
+        }
+
+        df = tabela_veiculos(
+            aporte_anual, taxa_anual, [5, 10, 15, 20, 25, 30], **parametros
+        )
+
+        # converte em uma tabela html e publica
+        tabela = tabela_html(df)
+        st.markdown(
+            "<h3>Valor líquido de resgate por veículo de investimento</h3>",
+            unsafe_allow_html=True,
+        )
+        st.write(str(tabela), unsafe_allow_html=True)
+
+        df = ranking_veiculos(
+            aporte_anual, [4, 6, 8, 10, 12, 14], [5, 10, 15, 20, 25, 30], **parametros
+        )
+
+        soup = BeautifulSoup(df.to_html(index=False), "html.parser")
+
+        for cell in soup.find_all("th"):
+            cell["style"] = "text-align: center;"
+
+        st.markdown(
+            "<h3>Melhor veículo por taxa de juros e prazo</h3>", unsafe_allow_html=True
+        )
+        st.write(str(soup), unsafe_allow_html=True)
+
+
+        # --- Sensibilidade das entradas -----------------------------------------------------------
+        adicionar_linha()
+
+        exibir_tornado(renda_mensal, aporte, taxa_anual, "agressiva")
+
+        # --- Independência financeira -------------------------------------------------------------
+        adicionar_linha()
+
+        exibir_mapa_independencia(
+            renda_mensal, taxa_anual, [10, 12, 15, 20, 25, 30], "agressiva"
+        )
+
+        exibir_backtest(renda_mensal, aporte, "agressiva")
 
         # Adiciona estilo CSS para centralizar os dados das tabelas ----------------------------------
         adicionar_linha()
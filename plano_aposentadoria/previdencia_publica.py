@@ -0,0 +1,174 @@
+"""Projeção do benefício do RPPS e da Funpresp para servidores públicos.
+
+Regras pela data de ingresso no serviço público (ver
+``slides/assunto/previdencia_publica.tex``):
+
+* até 31/12/2003: integralidade, benefício igual à última remuneração;
+* de 01/01/2004 a 03/02/2013: média de 100% das remunerações (EC 103/2019),
+  com 60% da média + 2% por ano que exceder 20 anos de contribuição (homens)
+  ou 15 anos (mulheres);
+* a partir de 04/02/2013 (Lei 12.618/2013): a mesma regra, limitada ao teto do
+  RGPS, mais a Funpresp, em que o servidor contribui sobre a parcela do salário
+  acima do teto e a União contribui com o mesmo valor (paridade).
+
+Todos os valores estão em reais de hoje (o teto é o de ``motor.TETO_INSS``) e o
+cálculo é vetorizado sobre os servidores: as trajetórias salariais formam uma
+matriz (servidores x anos de carreira).
+"""
+
+import numpy as np
+import pandas as pd
+
+from motor import TETO_INSS, acumular, inss
+
+# Alíquotas progressivas da contribuição ao RPPS da União (EC 103/2019, 2025)
+FAIXAS_RPPS = [
+    (1518.00, 0.075),
+    (2793.88, 0.09),
+    (4190.83, 0.12),
+    (8157.41, 0.14),
+    (13969.49, 0.145),
+    (27938.95, 0.165),
+    (54480.97, 0.19),
+    (float("inf"), 0.22),
+]
+
+INICIO_MEDIA = np.datetime64("2004-01-01")  # Fim da integralidade (EC 41/2003)
+INICIO_FUNPRESP = np.datetime64("2013-02-04")  # Benefício limitado ao teto
+ALIQUOTA_MAXIMA_FUNPRESP = 0.085
+CONTRIBUICOES_ANO = 13  # 12 salários + 13o
+
+REGRAS = np.array(["Integralidade", "Média", "Teto + Funpresp"])
+
+
+def trajetoria_salarial(salario_inicial, anos, progressao=0.0, intersticio=1):
+    """Salário mensal de cada ano da carreira com progressões periódicas.
+
+    Args:
+        salario_inicial (array): Salário inicial de cada servidor.
+        anos (int): Anos de carreira.
+        progressao (array): Aumento a cada progressão (ex.: 0.04 para 4%).
+        intersticio (array): Anos entre progressões.
+
+    Returns:
+        numpy.ndarray: Matriz (servidores x anos) com o salário mensal.
+    """
+    salario_inicial = np.atleast_1d(np.asarray(salario_inicial, dtype=float))
+    progressao = np.asarray(progressao, dtype=float)[..., None]
+    intersticio = np.asarray(intersticio)[..., None]
+    ano = np.arange(anos)
+    return salario_inicial[:, None] * (1 + progressao) ** (ano // intersticio)
+
+
+def contribuicao_rpps(salario_mensal, regra):
+    """Contribuição mensal ao RPPS; no regime com Funpresp incide só até o teto."""
+    base = np.where(
+        regra[..., None] == 2, np.minimum(salario_mensal, TETO_INSS), salario_mensal
+    )
+    return inss(base, FAIXAS_RPPS)
+
+
+def anuidade(saldo, taxa_anual, meses):
+    """Renda mensal que consome o saldo em ``meses`` à taxa informada."""
+    taxa_mensal = (1 + np.asarray(taxa_anual, dtype=float) / 100) ** (1 / 12) - 1
+    return np.where(
+        taxa_mensal > 0,
+        saldo * taxa_mensal / (1 - (1 + taxa_mensal) ** -meses),
+        saldo / meses,
+    )
+
+
+def projetar_beneficios(
+    salarios,
+    data_ingresso,
+    sexo,
+    anos_anteriores=0,
+    aliquota_funpresp=ALIQUOTA_MAXIMA_FUNPRESP,
+    taxa_anual=4.0,
+    meses_beneficio=300,
+    taxa_investimentos=None,
+):
+    """Projeta o benefício do RPPS e da Funpresp ao fim de cada carreira.
+
+    Args:
+        salarios (array): Matriz (servidores x anos) com o salário mensal.
+        data_ingresso (array): Data de ingresso no serviço público ("AAAA-MM-DD").
+        sexo (array): "M" ou "F".
+        anos_anteriores (array): Anos de contribuição antes da carreira.
+        aliquota_funpresp (array): Contribuição do servidor à Funpresp, até 8,5%
+            da parcela do salário acima do teto.
+        taxa_anual (float): Rentabilidade real anual da Funpresp (em porcentagem).
+        meses_beneficio (int): Meses em que o saldo da Funpresp é pago.
+        taxa_investimentos (float): Taxa anual usada para converter a lacuna em
+            patrimônio, como em "Renda Passiva Anual" (padrão: ``taxa_anual``).
+
+    Returns:
+        pandas.DataFrame: Benefícios, lacuna em relação ao último salário e o
+        patrimônio que ``tabela_prev``/``tabela_inv`` precisam acumular para
+        cobri-la como renda passiva.
+    """
+    salarios = np.atleast_2d(np.asarray(salarios, dtype=float))
+    n_servidores, anos = salarios.shape
+    data_ingresso = np.broadcast_to(
+        np.asarray(data_ingresso, dtype="datetime64[D]"), (n_servidores,)
+    )
+    sexo = np.broadcast_to(np.asarray(sexo), (n_servidores,))
+    aliquota_funpresp = np.minimum(
+        np.broadcast_to(np.asarray(aliquota_funpresp, dtype=float), (n_servidores,)),
+        ALIQUOTA_MAXIMA_FUNPRESP,
+    )
+
+    regra = (data_ingresso >= INICIO_MEDIA).astype(int) + (
+        data_ingresso >= INICIO_FUNPRESP
+    )
+
+    ultimo_salario = salarios[:, -1]
+    # Com a Funpresp a base de contribuição ao RPPS, e da média, vai até o teto
+    media = np.where(
+        regra == 2,
+        np.minimum(salarios, TETO_INSS).mean(axis=1),
+        salarios.mean(axis=1),
+    )
+    tempo = anos + np.asarray(anos_anteriores)
+    minimo = np.where(sexo == "F", 15, 20)
+    percentual = np.minimum(0.60 + 0.02 * np.maximum(tempo - minimo, 0), 1.0)
+
+    beneficio_rpps = np.select(
+        [regra == 0, regra == 1],
+        [ultimo_salario, percentual * media],
+        percentual * media,
+    )
+
+    # Funpresp: servidor e União contribuem sobre a parcela acima do teto
+    excedente = np.maximum(salarios - TETO_INSS, 0)
+    aportes_funpresp = (
+        2
+        * aliquota_funpresp[:, None]
+        * excedente
+        * CONTRIBUICOES_ANO
+        * (regra[:, None] == 2)
+    )
+    saldo_funpresp = acumular(aportes_funpresp, taxa_anual)[:, -1]
+    beneficio_funpresp = anuidade(saldo_funpresp, taxa_anual, meses_beneficio)
+
+    if taxa_investimentos is None:
+        taxa_investimentos = taxa_anual
+
+    total = beneficio_rpps + beneficio_funpresp
+    lacuna = np.maximum(ultimo_salario - total, 0)
+    contribuicao = contribuicao_rpps(salarios, regra)
+
+    return pd.DataFrame(
+        {
+            "Regra": REGRAS[regra],
+            "Último Salário": ultimo_salario,
+            "Média das Remunerações": media,
+            "Contribuição RPPS": contribuicao[:, -1],
+            "Benefício RPPS": beneficio_rpps,
+            "Saldo Funpresp": saldo_funpresp,
+            "Benefício Funpresp": beneficio_funpresp,
+            "Benefício Total": total,
+            "Lacuna": lacuna,
+            "Patrimônio Necessário": lacuna * 12 / (taxa_investimentos / 100),
+        }
+    )
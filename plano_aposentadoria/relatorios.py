@@ -0,0 +1,401 @@
+"""Relatórios personalizados (HTML ou PDF) para uma equipe inteira.
+
+Cada relatório traz as mesmas tabelas, o gráfico de barras e os heatmaps que
+``main()`` publica para a estratégia escolhida, calculados pelas mesmas funções
+e formatados com ``tabela_html``. Os gráficos viram imagens estáticas do
+Matplotlib e as páginas saem de um modelo HTML.
+
+Os heatmaps usam renda unitária: dependem só da estratégia, da taxa e, na
+agressiva, de ``dirpf / renda_mensal``. Por isso cada heatmap distinto é
+desenhado uma única vez e compartilhado pelos relatórios (``heatmaps/``). Os
+heatmaps e os relatórios são gerados num pool de processos.
+
+A equipe é um CSV com as colunas ``nome`` e ``renda_mensal`` e, opcionalmente,
+``aporte``, ``taxa_anual`` e ``estrategia``. Uso::
+
+    python relatorios.py equipe.csv [diretorio] [html|pdf]
+"""
+
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+from pathlib import Path
+from string import Template
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from cache_cenarios import chave_cenario  # noqa: E402
+from motor import VERSAO_TABELAS  # noqa: E402
+from orcamento import normalizar  # noqa: E402
+from planejamento_aposentadoria import (  # noqa: E402
+    calcular_aporte,
+    calcular_ir,
+    figura_heatmap,
+    formatar_reais,
+    tabela_html,
+    tabela_inv,
+    tabela_prev,
+    tabela_sensibilidade,
+)
+
+try:
+    from weasyprint import HTML
+except ImportError:  # O weasyprint só é necessário para PDF
+    HTML = None
+
+PADROES = {"aporte": 12, "taxa_anual": 10, "estrategia": "agressiva"}
+ANOS = [5, 10, 15, 20, 25, 30]
+# Casas decimais de dirpf / renda_mensal na chave dos heatmaps da agressiva: a
+# razão varia com cada salário (IR progressivo) e, sem arredondar, quase nenhum
+# heatmap seria compartilhado. Com 3 casas são no máximo ~450 por taxa.
+CASAS_RAZAO_DIRPF = 3
+
+# Heatmaps de cada estratégia: (coluna, tipo, aportes, título), como em main()
+HEATMAPS = {
+    "conservadora": [
+        (
+            "Renda Passiva Mensal",
+            1,
+            [5, 10, 15, 20],
+            "Aporte Mensal (%) x Renda Passiva Mensal (%)",
+        ),
+        (
+            "Saldo Acumulado",
+            2,
+            [10, 12, 15, 20, 25, 30],
+            "Aporte Mensal (%) x Patrimônio",
+        ),
+    ],
+    "moderada": [
+        (
+            "Renda Passiva Mensal",
+            1,
+            [5, 8, 10, 12],
+            "Aporte Mensal (%) x Renda Passiva Mensal (%)",
+        ),
+        (
+            "Saldo Acumulado",
+            2,
+            [5, 8, 10, 12],
+            "Aporte Mensal (%) x Patrimônio (em renda mensal)",
+        ),
+    ],
+    "agressiva": [
+        (
+            "Renda Passiva Mensal",
+            1,
+            [10, 12, 15, 20, 25, 30],
+            "Aporte Mensal (%) x Renda Passiva Mensal (%)",
+        ),
+        (
+            "Saldo Acumulado",
+            2,
+            [10, 12, 15, 20, 25, 30],
+            "Aporte Mensal (%) x Patrimônio (em renda mensal)",
+        ),
+    ],
+}
+
+MODELO = Template("""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>$titulo</title>
+<style>
+    body { font-family: sans-serif; margin: 2em; }
+    h2 { color: orange; text-align: center; }
+    table { width: 100%; border-collapse: collapse; margin-bottom: 1em; }
+    table thead th, table td { text-align: center; padding: 4px; }
+    img { width: 100%; }
+    .linha { border-top: 2px double orange; margin: 20px 0; }
+</style>
+</head>
+<body>
+<h1>$titulo</h1>
+<p>$parametros</p>
+<h2>Estratégia $estrategia</h2>
+$secoes
+</body>
+</html>
+""")
+
+
+def ler_equipe(caminho):
+    """Lê o CSV da equipe e completa as colunas opcionais."""
+    equipe = pd.read_csv(caminho)
+    for coluna, padrao in PADROES.items():
+        if coluna not in equipe:
+            equipe[coluna] = padrao
+        equipe[coluna] = equipe[coluna].fillna(padrao)
+    equipe["estrategia"] = equipe["estrategia"].str.lower()
+    return equipe
+
+
+def _dirpf(renda_mensal, aporte, exato=False):
+    df = calcular_ir(renda_mensal, aporte, exato)
+    irpf = df.loc[df["Descrição"] == "IRPF"]
+    return float(irpf["Sem PGBL"].values[0]) - float(irpf["Com PGBL"].values[0])
+
+
+def chaves_heatmaps(estrategia, taxa_anual, razao_dirpf):
+    """Chave e argumentos de ``tabela_sensibilidade`` de cada heatmap."""
+    # O saldo e a renda do PGBL não dependem de dirpf: só a agressiva usa a razão
+    razao = round(razao_dirpf, CASAS_RAZAO_DIRPF) if estrategia == "agressiva" else 0.0
+    chaves = []
+    for coluna, tipo, aportes, titulo in HEATMAPS[estrategia]:
+        args = (estrategia, coluna, float(taxa_anual), ANOS, aportes, razao)
+        chaves.append(
+            (chave_cenario("heatmap", VERSAO_TABELAS, args, {"tipo": tipo}), args, tipo)
+        )
+    return chaves
+
+
+def heatmaps_equipe(pessoas, diretorio, exato=False):
+    """Heatmaps distintos de toda a equipe, como tarefas de ``_desenhar_heatmap``."""
+    heatmaps = {}
+    for pessoa in pessoas:
+        razao = 0.0
+        if pessoa["estrategia"] == "agressiva":
+            razao = (
+                _dirpf(pessoa["renda_mensal"], pessoa["aporte"], exato)
+                / pessoa["renda_mensal"]
+            )
+        for chave, args, tipo in chaves_heatmaps(
+            pessoa["estrategia"], pessoa["taxa_anual"], razao
+        ):
+            heatmaps[chave] = (chave, args, tipo, diretorio)
+    return heatmaps
+
+
+def _desenhar_heatmap(tarefa):
+    chave, args, tipo, diretorio = tarefa
+    arquivo = Path(diretorio) / "heatmaps" / f"{chave}.png"
+    if not arquivo.exists():
+        fig = figura_heatmap(tabela_sensibilidade(*args), tipo)
+        fig.savefig(arquivo, bbox_inches="tight")
+        plt.close(fig)
+    return chave
+
+
+_graficos = {}
+
+
+def grafico_patrimonio(barras, arquivo):
+    """Barras empilhadas do patrimônio: ``barras`` é [(nome, anos, valores, cor)].
+
+    A figura de cada combinação de séries é criada uma vez por processo; nos
+    relatórios seguintes só as alturas das barras e a escala mudam.
+    """
+    chave = tuple((nome, cor) for nome, _, _, cor in barras)
+    if chave not in _graficos:
+        fig, ax = plt.subplots(figsize=(10, 5))
+        anos = barras[0][1]
+        conjuntos = [
+            ax.bar(anos, np.zeros(len(anos)), color=cor, label=nome)
+            for nome, _, _, cor in barras
+        ]
+        ax.set_xlabel("Prazo (Anos)")
+        ax.set_ylabel("Valor (R$)")
+        ax.yaxis.set_major_formatter(lambda y, _: formatar_reais(y))
+        ax.legend(loc="upper left")
+        fig.subplots_adjust(left=0.18, right=0.97, top=0.95, bottom=0.12)
+        _graficos[chave] = (fig, ax, conjuntos)
+
+    fig, ax, conjuntos = _graficos[chave]
+    base = np.zeros(len(barras[0][1]))
+    for conjunto, (_, _, valores, _) in zip(conjuntos, barras):
+        valores = np.asarray(valores, dtype=float)
+        for barra, inicio, altura in zip(conjunto, base, valores):
+            barra.set_y(inicio)
+            barra.set_height(altura)
+        base = base + valores
+    ax.set_ylim(0, 1.05 * max(base.max(), 1))
+    fig.savefig(arquivo, pil_kwargs={"compress_level": 1})
+
+
+def _tabela(titulo, df, texto=""):
+    return f"<h3>{titulo}</h3>{tabela_html(df.copy())}{texto}"
+
+
+def secoes_relatorio(renda_mensal, aporte, taxa_anual, estrategia, exato=False):
+    """Tabelas (HTML) e barras do gráfico da estratégia, na ordem de main()."""
+    secoes = []
+    dirpf = 0.0
+
+    if estrategia != "conservadora":
+        df = calcular_ir(renda_mensal, aporte, exato)
+        dirpf = _dirpf(renda_mensal, aporte, exato)
+        secoes.append(
+            _tabela(
+                f"Cálculo do IRPF para renda mensal de {formatar_reais(renda_mensal)}.",
+                df,
+                f"<p>A diferença de IRPF é {formatar_reais(dirpf)}.</p>",
+            )
+        )
+
+    if estrategia == "conservadora":
+        aporte_mensal = renda_mensal * aporte / 100
+        df = pd.DataFrame(
+            [
+                {
+                    "Renda Mensal": formatar_reais(renda_mensal),
+                    "Aporte Mensal": aporte_mensal,
+                    "Aporte Anual": aporte_mensal * 13.5,
+                }
+            ]
+        )
+    elif estrategia == "moderada":
+        aportes = calcular_aporte(renda_mensal, aporte, exato)["Aporte PGBL"]
+        df = pd.DataFrame(
+            [
+                {
+                    "Renda Anual": formatar_reais(renda_mensal * 13.5),
+                    "Aporte 1o Ano": aportes.iloc[0],
+                    "Aporte 2o Ano": aportes.iloc[1],
+                }
+            ]
+        )
+    else:
+        df = calcular_aporte(renda_mensal, aporte, exato)
+    secoes.append(_tabela("Valor dos Aportes", df))
+
+    if estrategia == "conservadora":
+        df_inv = tabela_inv(renda_mensal, aporte, taxa_anual, exato=exato)
+        secoes.append(_tabela("Resultado", df_inv[df_inv["Anos"].isin(ANOS)]))
+        barras = [
+            ("Valor Aportado", df_inv["Anos"], df_inv["Valor Aportado"], "orange"),
+            (
+                "Rendimentos",
+                df_inv["Anos"],
+                df_inv["Saldo Acumulado"] - df_inv["Valor Aportado"],
+                "blue",
+            ),
+        ]
+    elif estrategia == "moderada":
+        df_prev = tabela_prev(renda_mensal, aporte, taxa_anual, dirpf, exato)
+        secoes.append(_tabela("Resultado", df_prev[df_prev["Anos"].isin(ANOS)]))
+        barras = [
+            ("Valor Aportado", df_prev["Anos"], df_prev["Valor Aportado"], "orange"),
+            (
+                "Rendimentos",
+                df_prev["Anos"],
+                df_prev["Saldo Acumulado"] - df_prev["Valor Aportado"],
+                "blue",
+            ),
+        ]
+    else:
+        df_prev = tabela_prev(renda_mensal, aporte, taxa_anual, dirpf, exato)
+        df_inv = tabela_inv(renda_mensal, aporte, taxa_anual, dirpf, exato)
+        df_total = df_prev.iloc[:, 1:] + df_inv.iloc[:, 1:]
+        df_total.insert(0, df_prev.columns[0], df_inv.iloc[:, 0])
+        secoes.append(
+            _tabela("Aportes em PGBL", df_prev[df_prev["Anos"].isin(ANOS)])
+            + _tabela(
+                "Aportes em outros investimentos", df_inv[df_inv["Anos"].isin(ANOS)]
+            )
+        )
+        secoes.append(_tabela("Resultado", df_total[df_total["Anos"].isin(ANOS)]))
+        barras = [
+            ("PGBL", df_prev["Anos"], df_prev["Saldo Acumulado"], "orange"),
+            ("Investimentos", df_inv["Anos"], df_inv["Saldo Acumulado"], "blue"),
+        ]
+
+    return secoes, barras, dirpf
+
+
+def nome_seguro(indice, nome):
+    """Nome de arquivo seguro: índice e o nome só com letras, dígitos e "_"."""
+    return f"{indice:05d}_" + re.sub(r"[^A-Z0-9]+", "_", normalizar(nome)).strip("_")
+
+
+def _gerar_relatorio(tarefa):
+    indice, pessoa, diretorio, formato, exato = tarefa
+    diretorio = Path(diretorio)
+    nome_arquivo = nome_seguro(indice, pessoa["nome"])
+    estrategia = pessoa["estrategia"]
+
+    secoes, barras, dirpf = secoes_relatorio(
+        pessoa["renda_mensal"],
+        pessoa["aporte"],
+        pessoa["taxa_anual"],
+        estrategia,
+        exato,
+    )
+
+    grafico_patrimonio(barras, diretorio / f"{nome_arquivo}.png")
+    secoes.append(f'<h3>Patrimônio Acumulado</h3><img src="{nome_arquivo}.png">')
+
+    chaves = chaves_heatmaps(
+        estrategia, pessoa["taxa_anual"], dirpf / pessoa["renda_mensal"]
+    )
+    for (chave, _, _), (_, _, _, titulo) in zip(chaves, HEATMAPS[estrategia]):
+        secoes.append(f'<h3>{titulo}</h3><img src="heatmaps/{chave}.png">')
+
+    html = MODELO.substitute(
+        titulo=f"Planejamento de Aposentadoria: {escape(pessoa['nome'])}",
+        parametros=(
+            f"Renda mensal de {formatar_reais(pessoa['renda_mensal'])}, "
+            f"aporte de {pessoa['aporte']:g}% e "
+            f"taxa de juros de {pessoa['taxa_anual']:g}% ao ano."
+        ),
+        estrategia=estrategia.capitalize(),
+        secoes='\n<div class="linha"></div>\n'.join(secoes),
+    )
+
+    if formato == "pdf":
+        arquivo = diretorio / f"{nome_arquivo}.pdf"
+        HTML(string=html, base_url=str(diretorio)).write_pdf(arquivo)
+    else:
+        arquivo = diretorio / f"{nome_arquivo}.html"
+        arquivo.write_text(html, encoding="utf-8")
+    return arquivo
+
+
+def gerar_relatorios(equipe, diretorio, formato="html", processos=None, exato=False):
+    """Gera um relatório por pessoa da equipe.
+
+    Args:
+        equipe (pandas.DataFrame): Saída de ``ler_equipe``.
+        diretorio (str | Path): Onde gravar os relatórios e as imagens.
+        formato (str): "html" ou "pdf" (este requer o weasyprint).
+        processos (int, opcional): Tamanho do pool (padrão: número de CPUs).
+        exato (bool): Calcula em centavos inteiros (ver ``centavos.py``).
+
+    Returns:
+        list: Caminhos dos relatórios, na ordem da equipe.
+    """
+    if formato == "pdf" and HTML is None:
+        raise ImportError("O formato PDF requer o weasyprint (pip install weasyprint).")
+
+    diretorio = Path(diretorio)
+    (diretorio / "heatmaps").mkdir(parents=True, exist_ok=True)
+    pessoas = equipe.to_dict("records")
+    processos = processos or os.cpu_count()
+
+    heatmaps = heatmaps_equipe(pessoas, diretorio, exato)
+
+    tarefas = [
+        (indice, pessoa, diretorio, formato, exato)
+        for indice, pessoa in enumerate(pessoas)
+    ]
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        list(executor.map(_desenhar_heatmap, heatmaps.values()))
+        lote = max(1, len(tarefas) // (4 * processos))
+        return list(executor.map(_gerar_relatorio, tarefas, chunksize=lote))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    destino = sys.argv[2] if len(sys.argv) > 2 else "saida_relatorios"
+    formato = sys.argv[3] if len(sys.argv) > 3 else "html"
+    arquivos = gerar_relatorios(ler_equipe(sys.argv[1]), destino, formato)
+    print(f"{len(arquivos)} relatórios gravados em {destino}")
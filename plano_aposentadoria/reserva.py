@@ -0,0 +1,137 @@
+"""Dimensionamento da reserva de emergência por simulação de choques.
+
+Cada cenário é uma sequência mensal com perda de renda (desemprego por alguns
+meses) e despesas imprevistas (saúde, conserto do carro, viagem urgente; ver
+``presentation/assuntos/reserva.qmd``). Fora dos choques, a sobra do mês (o
+aporte) recompõe a reserva. A reserva necessária num cenário é a maior queda
+do fluxo de caixa acumulado (máximo acumulado menos o valor atual), e a reserva
+para uma probabilidade-alvo de atravessar os choques é o quantil dessa
+distribuição.
+
+Todos os cenários são gerados e avaliados como uma matriz (cenários x meses).
+"""
+
+import numpy as np
+import pandas as pd
+
+from motor import ANOS_PROJECAO, MULTIPLICADOR_ANUAL, acumular, impostos
+
+N_CENARIOS = 20000
+MESES = 120
+PROBABILIDADES = (0.90, 0.95, 0.99)
+
+
+def renda_liquida_mensal(renda_mensal):
+    """Renda mensal média depois de INSS e IRPF (sem PGBL)."""
+    ir = impostos(renda_mensal, 0)
+    return (ir["Renda Anual"] - ir["Desconto INSS"] - ir["IRPF Sem PGBL"]) / 12
+
+
+def simular_choques(
+    renda_liquida,
+    despesas,
+    n_cenarios=N_CENARIOS,
+    meses=MESES,
+    prob_desemprego=0.005,
+    duracao=(2, 8),
+    substituicao=0.0,
+    prob_imprevisto=0.03,
+    imprevisto_medio=1.0,
+    semente=0,
+):
+    """Fluxo de caixa mensal de cada cenário de choques.
+
+    Args:
+        renda_liquida (float): Renda líquida mensal.
+        despesas (float): Despesas mensais essenciais.
+        prob_desemprego (float): Probabilidade mensal de perder a renda.
+        duracao (tuple): Duração mínima e máxima do desemprego (meses).
+        substituicao (float): Fração da renda mantida sem emprego (ex.: seguro).
+        prob_imprevisto (float): Probabilidade mensal de uma despesa imprevista.
+        imprevisto_medio (float): Valor médio do imprevisto em meses de despesas
+            (distribuição exponencial).
+
+    Returns:
+        numpy.ndarray: Matriz (cenários x meses) com renda menos despesas.
+    """
+    rng = np.random.default_rng(semente)
+    mes = np.arange(meses)
+
+    # Desemprego: o choque iniciado no mês s dura até s + d; o mês m está sem
+    # renda se algum choque anterior ainda não terminou (máximo acumulado).
+    inicio = rng.random((n_cenarios, meses)) < prob_desemprego
+    duracoes = rng.integers(duracao[0], duracao[1] + 1, (n_cenarios, meses))
+    fim = np.maximum.accumulate(np.where(inicio, mes + duracoes, 0), axis=1)
+    desempregado = fim > mes
+
+    imprevisto = (rng.random((n_cenarios, meses)) < prob_imprevisto) * (
+        rng.exponential(imprevisto_medio * despesas, (n_cenarios, meses))
+    )
+
+    renda = np.where(desempregado, substituicao * renda_liquida, renda_liquida)
+    return renda - despesas - imprevisto
+
+
+def reserva_necessaria(fluxos):
+    """Maior queda do fluxo de caixa acumulado de cada cenário."""
+    acumulado = np.cumsum(fluxos, axis=-1)
+    pico = np.maximum(np.maximum.accumulate(acumulado, axis=-1), 0)
+    return (pico - acumulado).max(axis=-1, initial=0)
+
+
+def dimensionar_reserva(renda_mensal, aporte, probabilidades=PROBABILIDADES, **kwargs):
+    """Reserva para cada probabilidade-alvo de atravessar os choques.
+
+    As despesas essenciais são a renda líquida menos o aporte mensal.
+
+    Returns:
+        pandas.DataFrame: Probabilidade, reserva em reais e em meses de despesas.
+    """
+    liquida = renda_liquida_mensal(renda_mensal)
+    aporte_mensal = renda_mensal * MULTIPLICADOR_ANUAL * aporte / 100 / 12
+    despesas = max(liquida - aporte_mensal, 0)
+
+    necessaria = reserva_necessaria(simular_choques(liquida, despesas, **kwargs))
+    reserva = np.quantile(necessaria, probabilidades)
+
+    return pd.DataFrame(
+        {
+            "Probabilidade": [f"{p:.0%}" for p in probabilidades],
+            "Reserva": reserva,
+            "Meses de Despesas": reserva / despesas if despesas else np.nan,
+        }
+    )
+
+
+def aportes_com_reserva(aporte_anual, reserva, anos=ANOS_PROJECAO, fracao=1.0):
+    """Aportes anuais nos investimentos depois de formar a reserva.
+
+    Enquanto a reserva não está completa, ``fracao`` do aporte vai para ela: 1
+    adia os investimentos; frações menores reduzem o aporte por mais tempo.
+    """
+    para_reserva = np.asarray(aporte_anual, dtype=float) * fracao
+    formada = np.minimum(para_reserva * np.arange(1, anos + 1), reserva)
+    desvio = np.diff(formada, prepend=0)
+    return aporte_anual - desvio
+
+
+def projetar_com_reserva(
+    renda_mensal, aporte, taxa_anual, reserva, anos=ANOS_PROJECAO, fracao=1.0
+):
+    """``tabela_inv`` com a reserva formada antes dos investimentos."""
+    aporte_anual = renda_mensal * MULTIPLICADOR_ANUAL * aporte / 100
+    aportes = aportes_com_reserva(aporte_anual, reserva, anos, fracao)
+
+    ano = np.arange(1, anos + 1)
+    saldo = acumular(aportes, taxa_anual)
+    renda_anual = np.where(ano > 1, saldo * taxa_anual / 100, 0)
+
+    return pd.DataFrame(
+        {
+            "Anos": ano,
+            "Valor Aportado": np.cumsum(aportes),
+            "Saldo Acumulado": saldo,
+            "Renda Passiva Anual": renda_anual,
+            "Renda Passiva Mensal": renda_anual / 12,
+        }
+    )
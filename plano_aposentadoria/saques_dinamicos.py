@@ -0,0 +1,200 @@
+"""Usufruto com regras de saque dinâmicas sobre caminhos aleatórios.
+
+``usufruto`` retira sempre ``renda_mensal``. Aqui o saque segue uma regra que
+depende da trajetória do saldo, revista a cada 12 meses:
+
+* fixo: o saque inicial, sempre;
+* percentual: ``percentual`` ao ano do saldo no início de cada ano;
+* guyton-klinger: o saque inicial com guarda-corpos; se a taxa de saque atual
+  passa de ``1 + guarda`` vezes a inicial, o saque cai ``ajuste``; se fica
+  abaixo de ``1 - guarda`` vezes a inicial, sobe ``ajuste``;
+* piso-teto: o percentual do saldo, limitado entre ``piso`` e ``teto`` vezes o
+  saque inicial.
+
+As rentabilidades são reais (já descontada a inflação), então os saques estão
+em reais de hoje. O laço de meses é compilado com o Numba quando ele está
+instalado; sem ele, a mesma conta é feita vetorizada sobre os caminhos.
+"""
+
+import numpy as np
+import pandas as pd
+
+from estocastico import blocos_retornos
+
+try:
+    from numba import njit
+except ImportError:  # O Numba é opcional
+    njit = None
+
+REGRAS = {"fixo": 0, "percentual": 1, "guyton-klinger": 2, "piso-teto": 3}
+
+PARAMETROS = {
+    "percentual": 0.04,
+    "guarda": 0.20,
+    "ajuste": 0.10,
+    "piso": 0.90,
+    "teto": 1.50,
+}
+
+
+def _revisar(regra, saque, saque_inicial, saldo, taxa_inicial, parametros):
+    """Saque mensal do próximo ano (escalares ou arrays de caminhos)."""
+    percentual, guarda, ajuste, piso, teto = parametros
+    if regra == 1:
+        return saldo * percentual / 12
+    if regra == 2:
+        taxa = np.where(saldo > 0, 12 * saque / np.maximum(saldo, 1e-12), np.inf)
+        saque = np.where(
+            taxa > taxa_inicial * (1 + guarda), saque * (1 - ajuste), saque
+        )
+        return np.where(taxa < taxa_inicial * (1 - guarda), saque * (1 + ajuste), saque)
+    if regra == 3:
+        return np.clip(
+            saldo * percentual / 12, saque_inicial * piso, saque_inicial * teto
+        )
+    return saque
+
+
+def _kernel_numpy(saldo_inicial, retornos, regra, saque_inicial, parametros):
+    n_caminhos, meses = retornos.shape
+    taxa_inicial = 12 * saque_inicial / saldo_inicial
+
+    saldo = np.full(n_caminhos, float(saldo_inicial))
+    saque = np.full(n_caminhos, float(saque_inicial))
+    esgotado = np.full(n_caminhos, meses)
+    total = np.zeros(n_caminhos)
+    minimo = np.full(n_caminhos, np.inf)
+
+    for mes in range(meses):
+        if mes > 0 and mes % 12 == 0:
+            saque = _revisar(
+                regra, saque, saque_inicial, saldo, taxa_inicial, parametros
+            )
+        ativo = esgotado == meses
+        pago = np.where(ativo, np.minimum(saque, saldo), 0.0)
+        saldo = np.where(ativo, saldo - pago, 0.0) * (1 + retornos[:, mes])
+        total += pago
+        minimo = np.where(ativo, np.minimum(minimo, pago), minimo)
+        esgotado = np.where(ativo & (saldo <= 0), mes + 1, esgotado)
+
+    return esgotado, saldo, total, minimo
+
+
+def _kernel_laco(saldo_inicial, retornos, regra, saque_inicial, parametros):
+    """Mesmo cálculo caminho a caminho, para ser compilado pelo Numba."""
+    n_caminhos, meses = retornos.shape
+    percentual, guarda, ajuste, piso, teto = parametros
+    taxa_inicial = 12 * saque_inicial / saldo_inicial
+
+    esgotado = np.full(n_caminhos, meses)
+    saldos = np.zeros(n_caminhos)
+    totais = np.zeros(n_caminhos)
+    minimos = np.full(n_caminhos, np.inf)
+
+    for i in range(n_caminhos):
+        saldo = saldo_inicial
+        saque = saque_inicial
+        for mes in range(meses):
+            if mes > 0 and mes % 12 == 0:
+                if regra == 1:
+                    saque = saldo * percentual / 12
+                elif regra == 2:
+                    taxa = 12 * saque / saldo
+                    if taxa > taxa_inicial * (1 + guarda):
+                        saque = saque * (1 - ajuste)
+                    elif taxa < taxa_inicial * (1 - guarda):
+                        saque = saque * (1 + ajuste)
+                elif regra == 3:
+                    saque = min(
+                        max(saldo * percentual / 12, saque_inicial * piso),
+                        saque_inicial * teto,
+                    )
+            pago = min(saque, saldo)
+            saldo = (saldo - pago) * (1 + retornos[i, mes])
+            totais[i] += pago
+            minimos[i] = min(minimos[i], pago)
+            if saldo <= 0:
+                esgotado[i] = mes + 1
+                saldo = 0.0
+                break
+        saldos[i] = saldo
+
+    return esgotado, saldos, totais, minimos
+
+
+_kernel_compilado = njit(cache=True)(_kernel_laco) if njit is not None else None
+
+
+def simular(saldo_inicial, retornos, regra, saque_inicial, **kwargs):
+    """Aplica uma regra de saque a uma matriz (caminhos x meses) de retornos.
+
+    Args:
+        saldo_inicial (float): Patrimônio no início do usufruto.
+        retornos (array): Rentabilidades mensais reais (em fração).
+        regra (str): Uma das chaves de ``REGRAS``.
+        saque_inicial (float): Saque mensal do primeiro ano.
+        **kwargs: Substituem os valores de ``PARAMETROS``.
+
+    Returns:
+        dict: Por caminho, "Meses" até esgotar (o total de meses se não
+        esgota), "Saldo Final", "Total Sacado" e "Saque Mínimo" mensal.
+    """
+    parametros = tuple(float(kwargs.get(k, v)) for k, v in PARAMETROS.items())
+    retornos = np.ascontiguousarray(retornos, dtype=float)
+    kernel = _kernel_compilado if _kernel_compilado is not None else _kernel_numpy
+    meses, saldo, total, minimo = kernel(
+        float(saldo_inicial), retornos, REGRAS[regra], float(saque_inicial), parametros
+    )
+    return {
+        "Meses": meses,
+        "Saldo Final": saldo,
+        "Total Sacado": total,
+        "Saque Mínimo": minimo,
+    }
+
+
+def comparar_regras(
+    saldo_inicial,
+    saque_inicial,
+    media_anual,
+    volatilidade_anual,
+    n_caminhos=100000,
+    anos=40,
+    regras=tuple(REGRAS),
+    bloco=10000,
+    semente=0,
+    **kwargs,
+):
+    """Resumo de cada regra sobre os mesmos caminhos aleatórios.
+
+    Os caminhos são gerados em blocos, então a memória não cresce com
+    ``n_caminhos``.
+
+    Returns:
+        pandas.DataFrame: Probabilidade de esgotar o saldo, mediana do saldo
+        final, saque mensal médio e o saque mensal mínimo no pior 5%.
+    """
+    meses = 12 * anos
+    resultados = {regra: [] for regra in regras}
+    for retornos in blocos_retornos(
+        n_caminhos, meses, media_anual, volatilidade_anual, bloco, semente
+    ):
+        for regra in regras:
+            resultados[regra].append(
+                simular(saldo_inicial, retornos, regra, saque_inicial, **kwargs)
+            )
+
+    linhas = []
+    for regra, blocos in resultados.items():
+        r = {chave: np.concatenate([b[chave] for b in blocos]) for chave in blocos[0]}
+        linhas.append(
+            {
+                "Regra": regra,
+                "Probabilidade de Esgotar": float((r["Meses"] < meses).mean()),
+                "Saldo Final Mediano": float(np.median(r["Saldo Final"])),
+                "Saque Mensal Médio": float((r["Total Sacado"] / meses).mean()),
+                "Saque Mínimo (5%)": float(np.quantile(r["Saque Mínimo"], 0.05)),
+            }
+        )
+
+    return pd.DataFrame(linhas)
@@ -0,0 +1,138 @@
+"""Análise de sensibilidade (tornado) de todas as entradas da projeção.
+
+Cada entrada (renda, aporte, taxa, faixas de INSS/IR, multiplicador anual e
+horizonte) é perturbada para baixo e para cima mantendo as demais no cenário
+base. As 2N + 1 combinações formam um único lote: cada parâmetro vira um array
+e o motor vetorizado calcula todas de uma vez. O horizonte é resolvido
+projetando até o maior prazo do lote e lendo cada linha no seu próprio ano.
+
+A elasticidade é a variação percentual do resultado dividida pela variação
+percentual da entrada (diferença central).
+"""
+
+import numpy as np
+import pandas as pd
+
+from motor import (
+    ANOS_PROJECAO,
+    MULTIPLICADOR_ANUAL,
+    impostos,
+    projetar_inv,
+    projetar_prev,
+)
+
+PARAMETROS = {
+    "renda_mensal": "Renda Mensal",
+    "aporte": "Aporte (%)",
+    "taxa_anual": "Taxa de Juros",
+    "escala_faixas": "Faixas de INSS/IR",
+    "multiplicador": "Multiplicador Anual",
+    "anos": "Horizonte",
+}
+RESULTADOS = ["Saldo Acumulado", "Renda Passiva Mensal"]
+
+
+def lote_perturbacoes(base, perturbacao=0.10):
+    """Arrays com o cenário base seguido de cada entrada -/+ ``perturbacao``.
+
+    Returns:
+        dict: Um array de tamanho 2N + 1 por parâmetro.
+    """
+    nomes = list(PARAMETROS)
+    fatores = np.ones((2 * len(nomes) + 1, len(nomes)))
+    for i in range(len(nomes)):
+        fatores[1 + 2 * i, i] = 1 - perturbacao
+        fatores[2 + 2 * i, i] = 1 + perturbacao
+
+    lote = {nome: base[nome] * fatores[:, i] for i, nome in enumerate(nomes)}
+    lote["anos"] = np.rint(lote["anos"]).astype(int)
+    return lote
+
+
+def projetar_lote(lote, estrategia="agressiva"):
+    """Resultados finais de cada linha do lote numa única chamada ao motor."""
+    anos_max = int(lote["anos"].max())
+    renda, aporte, taxa = lote["renda_mensal"], lote["aporte"], lote["taxa_anual"]
+    multiplicador = lote["multiplicador"]
+
+    if estrategia == "conservadora":
+        projecoes = [
+            projetar_inv(
+                renda, aporte, taxa, anos=anos_max, multiplicador=multiplicador
+            )
+        ]
+    else:
+        dirpf = impostos(renda, aporte, multiplicador, lote["escala_faixas"])["dirpf"]
+        projecoes = [
+            projetar_prev(
+                renda, aporte, taxa, dirpf, anos=anos_max, multiplicador=multiplicador
+            )
+        ]
+        if estrategia == "agressiva":
+            projecoes.append(
+                projetar_inv(
+                    renda,
+                    aporte,
+                    taxa,
+                    dirpf,
+                    anos=anos_max,
+                    multiplicador=multiplicador,
+                )
+            )
+
+    # Cada linha é lida no seu próprio horizonte
+    indice = (lote["anos"] - 1)[:, None]
+    return {
+        coluna: sum(
+            np.take_along_axis(p[coluna], indice, axis=-1)[:, 0] for p in projecoes
+        )
+        for coluna in RESULTADOS
+    }
+
+
+def tornado(
+    renda_mensal,
+    aporte,
+    taxa_anual,
+    estrategia="agressiva",
+    anos=ANOS_PROJECAO,
+    multiplicador=MULTIPLICADOR_ANUAL,
+    escala_faixas=1.0,
+    perturbacao=0.10,
+):
+    """Tabela do tornado ordenada pela maior elasticidade do saldo.
+
+    Returns:
+        pandas.DataFrame: Para cada parâmetro, os resultados no cenário base,
+        com a entrada reduzida e aumentada e as elasticidades.
+    """
+    base = {
+        "renda_mensal": renda_mensal,
+        "aporte": aporte,
+        "taxa_anual": taxa_anual,
+        "escala_faixas": escala_faixas,
+        "multiplicador": multiplicador,
+        "anos": anos,
+    }
+    lote = lote_perturbacoes(base, perturbacao)
+    resultados = projetar_lote(lote, estrategia)
+
+    linhas = []
+    for i, (nome, rotulo) in enumerate(PARAMETROS.items()):
+        # O horizonte é inteiro: usa a variação efetiva em anos
+        variacao = (lote[nome][2 + 2 * i] - lote[nome][1 + 2 * i]) / base[nome]
+        linha = {"Parâmetro": rotulo}
+        for coluna in RESULTADOS:
+            valores = resultados[coluna]
+            baixo, alto = valores[1 + 2 * i], valores[2 + 2 * i]
+            linha[f"{coluna} (base)"] = valores[0]
+            linha[f"{coluna} (-)"] = baixo
+            linha[f"{coluna} (+)"] = alto
+            linha[f"Elasticidade {coluna}"] = (
+                (alto - baixo) / valores[0] / variacao if valores[0] else np.nan
+            )
+        linhas.append(linha)
+
+    df = pd.DataFrame(linhas)
+    ordem = df["Elasticidade Saldo Acumulado"].abs().sort_values(ascending=False).index
+    return df.loc[ordem].reset_index(drop=True)
@@ -0,0 +1,75 @@
+import io
+import json
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+import backtest
+from backtest import (
+    SERIE_IBOVESPA,
+    baixar_historico,
+    carregar_historico,
+    historico_disponivel,
+)
+
+
+def _sgs(series, consultas):
+    """``urlopen`` falso que devolve os pontos de cada série na janela pedida."""
+
+    def urlopen(url, timeout):
+        codigo = int(url.split("bcdata.sgs.")[1].split("/")[0])
+        parametros = parse_qs(urlparse(url).query)
+        inicio, fim = (
+            pd.to_datetime(parametros[chave][0], dayfirst=True)
+            for chave in ("dataInicial", "dataFinal")
+        )
+        consultas.append((codigo, inicio, fim))
+        dados = [
+            {"data": data.strftime("%d/%m/%Y"), "valor": f"{valor:.2f}"}
+            for data, valor in series[codigo].loc[inicio:fim].items()
+        ]
+        return io.BytesIO(json.dumps(dados).encode())
+
+    return urlopen
+
+
+def test_baixar_historico_grava_o_csv_lido_pelo_backtest(tmp_path, monkeypatch):
+    meses = pd.date_range("1994-07-01", periods=3, freq="MS")
+    dias = pd.to_datetime(["1994-06-30", "1994-07-15", "1994-07-29", "1994-08-31"])
+    consultas = []
+    monkeypatch.setattr(
+        backtest,
+        "urlopen",
+        _sgs(
+            {
+                4391: pd.Series([0.5, 0.4, 0.3], index=meses),
+                433: pd.Series([0.2, 0.1, -0.1], index=meses),
+                SERIE_IBOVESPA: pd.Series([4000, 4100, 4400, 4180], index=dias),
+            },
+            consultas,
+        ),
+    )
+    caminho = tmp_path / "dados" / "historico_mensal.csv"
+    baixar_historico(caminho, fim="2025-12-31")
+
+    historico = carregar_historico(caminho)
+    assert list(historico.columns) == ["cdi", "ipca", "ibov"]
+    assert historico.index[0] == pd.Timestamp("1994-07-01")
+    # Setembro não tem fechamento do Ibovespa e fica de fora
+    assert len(historico) == 2
+    assert historico["cdi"].tolist() == pytest.approx([0.005, 0.004])
+    assert historico["ibov"].tolist() == pytest.approx([0.1, -0.05])
+
+    # Consultas de no máximo 10 anos, sem lacunas até o fim
+    for _, inicio, fim in consultas:
+        assert fim < inicio + pd.DateOffset(years=10)
+    assert max(fim for _, _, fim in consultas) == pd.Timestamp("2025-12-31")
+
+
+def test_app_nao_baixa_o_historico(tmp_path, monkeypatch):
+    def sem_rede(url, timeout):
+        raise AssertionError("o app não deve acessar a rede")
+
+    monkeypatch.setattr(backtest, "urlopen", sem_rede)
+    assert not historico_disponivel(tmp_path / "historico.csv")
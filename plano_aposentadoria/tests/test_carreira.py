@@ -0,0 +1,25 @@
+import io
+
+import pytest
+
+from carreira import COLUNAS_TABELA, ler_tabela
+
+
+def _csv(*linhas):
+    return io.StringIO("\n".join([",".join(COLUNAS_TABELA), *linhas]))
+
+
+def test_ler_tabela():
+    tabela = ler_tabela(_csv("A,1,5000,1.5", "A,2,5195,1.5"))
+    assert tabela["Vencimento"].tolist() == [5000, 5195]
+
+
+def test_tabela_sem_colunas():
+    with pytest.raises(ValueError, match="Colunas ausentes"):
+        ler_tabela(io.StringIO("Nível,Padrão,Salário\nA,1,5000\n"))
+
+
+@pytest.mark.parametrize("linha", ["A,1,cinco mil,1.5", "A,1,5000,", "A,1,5000,0"])
+def test_tabela_com_valores_invalidos(linha):
+    with pytest.raises(ValueError, match="números positivos"):
+        ler_tabela(_csv("A,1,5000,1.5", linha))
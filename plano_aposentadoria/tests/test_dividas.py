@@ -0,0 +1,29 @@
+import numpy as np
+
+from dividas import comparar_planos, investir_apos_dividas, simular_dividas
+
+SALDOS = [58342.0, 2100.0, 3096.0]
+TAXAS = [1.9, 0.0, 3.1]
+PARCELAS = [2248.55, 150.0, 226.67]
+
+
+def test_extra_maior_que_o_aporte_fica_de_fora():
+    # Aporte mensal padrão: 6000 x 13,5 x 12% / 12 = 810
+    df = comparar_planos(SALDOS, TAXAS, PARCELAS, 6000, 12, 10)
+    assert sorted(df["Extra Mensal"].unique()) == [0, 250, 500]
+    assert (df["Saldo Acumulado"] > 0).all()
+
+
+def test_investimento_nunca_negativo():
+    simulacao = simular_dividas(SALDOS, TAXAS, PARCELAS, extras=[0, 2000])
+    projecao = investir_apos_dividas(6000, 12, 10, simulacao)
+    assert (np.diff(projecao["Valor Aportado"], axis=-1) >= 0).all()
+    assert (projecao["Saldo Acumulado"] >= 0).all()
+
+
+def test_ordem_livre():
+    simulacao = simular_dividas(
+        SALDOS, TAXAS, PARCELAS, extras=[500], estrategias=[np.array([2, 1, 0])]
+    )
+    quitacao = simulacao["Quitação"][0, 0]
+    assert quitacao[2] <= quitacao[1] <= quitacao[0]
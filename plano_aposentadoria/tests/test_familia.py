@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from familia import otimizar_pgbl, projetar_familia
+from motor import MULTIPLICADOR_ANUAL
+
+
+def test_membro_sem_restituicao_nao_conta_o_aporte_duas_vezes():
+    # Com R$ 2.000 o PGBL não reduz o IRPF (dirpf = 0)
+    familia, membros = projetar_familia([2000], [12], 10)
+    assert membros["Diferença IRPF"].iloc[0] == 0
+    aporte_anual = 2000 * MULTIPLICADOR_ANUAL * 0.12
+    assert familia["Valor Aportado"].iloc[0] == pytest.approx(aporte_anual)
+
+
+def test_otimizar_pgbl_com_muitos_membros():
+    rendas = [9000, 7000, 5000, 4000, 15000, 3000, 25000, 6000]
+    df = otimizar_pgbl(rendas, 60000)
+    assert df["Aporte PGBL"].sum() <= 60000 + 1e-6
+    assert (df["PGBL (%)"] <= 12).all()
+    # Orçamento folgado: todos que têm restituição vão ao limite
+    folgado = otimizar_pgbl(rendas, 1e7)
+    assert np.allclose(
+        folgado.loc[folgado["Diferença IRPF"] > 0, "PGBL (%)"], 12
+    )
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from longevidade import (
+    IDADE_FINAL,
+    carregar_tabua,
+    descontos_acumulados,
+    meses_cobertos,
+    probabilidade_ruina,
+    sobrevivencia,
+    tabua_disponivel,
+)
+
+
+def test_tabua_distribuida():
+    assert tabua_disponivel()
+    tabua = carregar_tabua()
+    assert list(tabua.columns) == ["homens", "mulheres"]
+    assert tabua.index[0] == 0 and tabua.iloc[-1].eq(1).all()
+    assert ((tabua > 0) & (tabua <= 1)).all().all()
+
+
+def _tabua_ibge(caminho):
+    """CSV no formato do IBGE: Gompertz até 79 anos e grupo aberto de 80+."""
+    idades = np.arange(0, 81)
+    homens = 1000 * -np.expm1(-np.exp(-10.0 + 0.09 * idades))
+    mulheres = 1000 * -np.expm1(-np.exp(-10.5 + 0.09 * idades))
+    homens[-1] = mulheres[-1] = 1000
+    pd.DataFrame({"idade": idades, "homens": homens, "mulheres": mulheres}).to_csv(
+        caminho, index=False
+    )
+    return caminho
+
+
+def test_tabua_ibge_com_grupo_aberto_aos_80(tmp_path):
+    tabua = carregar_tabua(_tabua_ibge(tmp_path / "ibge.csv"))
+
+    assert tabua.index[-1] == IDADE_FINAL and tabua.index.is_monotonic_increasing
+    assert tabua.iloc[-1].eq(1).all()
+    # A extensão reproduz a lei de Gompertz usada na tábua
+    assert tabua.loc[90, "homens"] == pytest.approx(-np.expm1(-np.exp(-10.0 + 8.1)))
+    vivo = sobrevivencia(tabua, ["M"], [65], 12 * 30)
+    assert vivo[0, 0, 12 * 16] > 0.2  # Muitos passam dos 81 anos
+    assert vivo[0, 0, 12 * 16] > vivo[0, 0, 12 * 25] > 0
+
+
+def test_tabua_curta_demais(tmp_path):
+    caminho = tmp_path / "tabua.csv"
+    caminho.write_text("idade,homens,mulheres\n79,80,60\n80,1000,1000\n")
+    with pytest.raises(ValueError, match="grupo aberto"):
+        carregar_tabua(caminho)
+
+
+def test_tabua_lida_uma_vez(tmp_path, monkeypatch):
+    caminho = _tabua_ibge(tmp_path / "tabua.csv")
+    leituras = []
+    ler = pd.read_csv
+    monkeypatch.setattr(pd, "read_csv", lambda c: leituras.append(c) or ler(c))
+    assert carregar_tabua(caminho) is carregar_tabua(caminho)
+    assert len(leituras) == 1
+
+
+def test_saldo_igual_a_retirada_paga_um_mes():
+    descontos = descontos_acumulados(0, 0, 12, 1, 0)
+    assert meses_cobertos(descontos, [0.5, 1, 2, 2.5]).tolist() == [[0, 1, 2, 2]]
+
+
+def test_ruina_com_rentabilidade_constante():
+    tabua = carregar_tabua()
+    # Com taxa zero, 120 retiradas esgotam o saldo em exatamente 10 anos
+    ruina = probabilidade_ruina(tabua, ["F"], [65], [120.0], 1.0, 0)
+    vivo_aos_75 = np.prod(1 - tabua["mulheres"].loc[65:74])
+    assert np.isclose(ruina[0, 0, 0], vivo_aos_75)
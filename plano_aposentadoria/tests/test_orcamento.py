@@ -0,0 +1,71 @@
+import io
+from datetime import datetime
+
+import pytest
+
+from orcamento import _valor, agregar, ler_csv, ler_ofx, taxa_poupanca
+
+OFX_TRANSACOES = [
+    ("20240105", "-1500.00", "ALUGUEL"),
+    ("20240110", "6000.00", "PAGTO SALARIO"),
+    ("20240115", "-300.50", "SUPERMERCADO"),
+]
+
+
+def _ofx(separador):
+    transacoes = separador.join(
+        f"<STMTTRN><TRNTYPE>OTHER<DTPOSTED>{data}<TRNAMT>{valor}<MEMO>{memo}"
+        "</STMTTRN>"
+        for data, valor, memo in OFX_TRANSACOES
+    )
+    return (
+        f"OFXHEADER:100{separador}<OFX><BANKTRANLIST>{transacoes}</BANKTRANLIST></OFX>"
+    )
+
+
+@pytest.mark.parametrize("separador", ["\n", ""])
+def test_ofx_le_todas_as_transacoes(separador):
+    lancamentos = list(ler_ofx(io.BytesIO(_ofx(separador).encode("latin-1"))))
+    assert [(d.strftime("%Y%m%d"), v, m) for d, m, v in lancamentos] == [
+        (data, float(valor), memo) for data, valor, memo in OFX_TRANSACOES
+    ]
+
+
+def test_resgate_nao_conta_como_renda():
+    mes = datetime(2024, 1, 1)
+    base = [(mes, "PAGTO SALARIO", 5000.0), (mes, "ALUGUEL", -4000.0)]
+    com_resgate = base + [(mes, "RESGATE CDB", 10000.0), (mes, "UBER", -500.0)]
+
+    assert taxa_poupanca(agregar(base)) == pytest.approx(0.2)
+    assert taxa_poupanca(agregar(com_resgate)) == pytest.approx(0.1)
+
+
+@pytest.mark.parametrize(
+    "texto, esperado",
+    [
+        ("1.234", 1234.0),
+        ("-1.234.567", -1234567.0),
+        ("1.234,56", 1234.56),
+        ("R$ 10,00", 10.0),
+        ("-1234.56", -1234.56),
+        ("12.5", 12.5),
+    ],
+)
+def test_valor_no_formato_brasileiro(texto, esperado):
+    assert _valor(texto) == esperado
+
+
+def test_ofx_com_ponto_decimal():
+    assert _valor("1.500", milhar=False) == 1.5
+
+
+def test_csv_sem_as_colunas_esperadas():
+    extrato = io.BytesIO("Data;Histórico;Valor\n05/01/2024;ALUGUEL;-1500\n".encode())
+    with pytest.raises(ValueError, match="Colunas ausentes"):
+        list(ler_csv(extrato))
+
+
+def test_csv_com_valor_invalido():
+    extrato = io.BytesIO(b"data;descricao;valor\n05/01/2024;ALUGUEL;abc\n")
+    with pytest.raises(ValueError, match="Linha 2"):
+        list(ler_csv(extrato))
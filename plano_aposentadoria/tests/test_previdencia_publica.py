@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from motor import TETO_INSS
+from previdencia_publica import projetar_beneficios, trajetoria_salarial
+
+
+def test_media_limitada_ao_teto_com_funpresp():
+    salarios = trajetoria_salarial([15000, 5000], 20)
+    df = projetar_beneficios(salarios, "2020-01-01", "M")
+    assert df["Benefício RPPS"].tolist() == pytest.approx(
+        [0.60 * TETO_INSS, 0.60 * 5000]
+    )
+
+
+def test_media_sem_teto_antes_da_funpresp():
+    salarios = trajetoria_salarial(15000, 20)
+    df = projetar_beneficios(salarios, "2010-01-01", "M")
+    assert df["Benefício RPPS"].iloc[0] == pytest.approx(0.60 * 15000)
+    assert np.isclose(df["Média das Remunerações"].iloc[0], 15000)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from relatorios import HEATMAPS, _gerar_relatorio, heatmaps_equipe, nome_seguro
+
+
+def test_nome_seguro_sem_caracteres_de_caminho():
+    assert nome_seguro(3, "Bruno <b>X</b>") == "00003_BRUNO_B_X_B"
+    assert nome_seguro(4, "../Ana / Júlia") == "00004_ANA_JULIA"
+
+
+def test_relatorio_com_nome_em_html(tmp_path):
+    pessoa = {
+        "nome": "Bruno <b>X</b>",
+        "renda_mensal": 6000,
+        "aporte": 12,
+        "taxa_anual": 10,
+        "estrategia": "conservadora",
+    }
+    arquivo = _gerar_relatorio((0, pessoa, tmp_path, "html", False))
+
+    assert arquivo.parent == tmp_path
+    html = arquivo.read_text(encoding="utf-8")
+    assert "Bruno &lt;b&gt;X&lt;/b&gt;" in html
+    assert "<b>X</b>" not in html
+
+
+def test_heatmaps_compartilhados_entre_salarios(tmp_path):
+    rendas = np.linspace(2000, 60000, 400).round(2)
+    pessoas = [
+        {"renda_mensal": renda, "aporte": 12, "taxa_anual": 10, "estrategia": e}
+        for renda in rendas
+        for e in ("agressiva", "conservadora")
+    ]
+    heatmaps = heatmaps_equipe(pessoas, tmp_path)
+
+    # A razão dirpf / renda vai de 0 a ~0,45: no máximo ~450 valores distintos
+    limite = (450 + 1) * len(HEATMAPS["agressiva"]) + len(HEATMAPS["conservadora"])
+    assert len(heatmaps) <= limite
+    assert len(heatmaps) < len(rendas)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from tributacao_resgate import (
+    ISENCAO_ACOES,
+    lotes_pgbl,
+    resgatar_investimentos,
+    resgatar_pgbl,
+)
+
+
+def test_isencao_compara_vendas_brutas():
+    # Com IR a venda passaria do limite, mas isenta a venda é a renda líquida
+    isento = resgatar_investimentos(
+        1e6, 1e5, 10, 19500, aliquota=0.15, isencao_mensal=ISENCAO_ACOES
+    )
+    assert isento["IR"][0] == 0
+    assert isento["Resgate Bruto"][0] == 19500
+
+    tributado = resgatar_investimentos(
+        1e6, 1e5, 10, 20500, aliquota=0.15, isencao_mensal=ISENCAO_ACOES
+    )
+    assert tributado["IR"][0] > 0
+
+
+def test_resgate_parcial_no_ultimo_mes():
+    resultado = resgatar_investimentos(2500, 2500, 0, 1000)
+    assert resultado["Meses de Usufruto"] == 2
+    assert resultado["Resgate Parcial"] == pytest.approx(500)
+    assert resultado["IR Parcial"] == 0
+
+
+def test_pgbl_pago_usa_bruto_da_ultima_iteracao():
+    lotes, idades = lotes_pgbl(12000, 5, 0)
+    resultado = resgatar_pgbl(lotes, idades, 0, 1000, iteracoes=1, max_meses=24)
+    bruto = resultado["Resgate Bruto"]
+    assert resultado["Meses de Usufruto"] == 24
+    assert np.allclose(bruto, 1000 / 0.9)
@@ -0,0 +1,11 @@
+from veiculos import EMPATE, VEICULOS, ranking_veiculos
+
+
+def test_ranking_sem_aporte_empata():
+    df = ranking_veiculos(0, [6, 10], [5, 30])
+    assert (df.iloc[:, 1:] == EMPATE).all().all()
+
+
+def test_ranking_com_aporte_tem_vencedor():
+    df = ranking_veiculos(12000, [6, 10], [5, 30])
+    assert df.iloc[:, 1:].isin(list(VEICULOS)).all().all()
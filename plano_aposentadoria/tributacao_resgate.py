@@ -0,0 +1,293 @@
+"""Tributação na fase de usufruto (resgates do PGBL e dos investimentos).
+
+No PGBL o imposto incide sobre todo o valor resgatado. Na tabela regressiva a
+alíquota depende do tempo de acumulação de cada contribuição (35% até 2 anos,
+caindo 5 pontos a cada 2 anos até 10% acima de 10 anos), e os resgates consomem
+as contribuições mais antigas primeiro. Na tabela progressiva o resgate mensal
+segue as faixas do IRPF. Nos demais investimentos o imposto incide apenas sobre
+o ganho de capital (15% em ações e renda fixa de longo prazo, 20% em FIIs).
+
+As contribuições são guardadas em lotes mensais, e o cálculo é vetorizado sobre
+lotes e meses: cada lote vira um número de cotas (cota = 1 na aposentadoria) e
+o consumo de cada lote em cada mês é a interseção entre o intervalo de cotas do
+lote e o intervalo resgatado naquele mês.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cache_cenarios import cache_persistente
+from motor import VERSAO_TABELAS, irpf
+
+# Anos de acumulação (limite superior) e alíquota da tabela regressiva
+TABELA_REGRESSIVA = [
+    (2, 0.35),
+    (4, 0.30),
+    (6, 0.25),
+    (8, 0.20),
+    (10, 0.15),
+    (float("inf"), 0.10),
+]
+ALIQUOTA_GANHO_CAPITAL = 0.15
+ALIQUOTA_FII = 0.20
+ISENCAO_ACOES = 20000.00  # Vendas mensais de ações isentas de IR
+
+MAX_MESES = 1500  # Mesmo limite de usufruto
+
+
+def aliquota_regressiva(meses_acumulacao):
+    """Alíquota da tabela regressiva para o tempo de acumulação (em meses)."""
+    limites = np.array([limite for limite, _ in TABELA_REGRESSIVA[:-1]])
+    aliquotas = np.array([aliquota for _, aliquota in TABELA_REGRESSIVA])
+    anos = np.asarray(meses_acumulacao, dtype=float) / 12
+    return aliquotas[np.searchsorted(limites, anos, side="left")]
+
+
+def _taxa_mensal(taxa_anual):
+    return (1 + taxa_anual / 100) ** (1 / 12) - 1
+
+
+def lotes_pgbl(aporte_anual, anos, taxa_anual, saldo_final=None):
+    """Divide as contribuições anuais ao PGBL em lotes mensais.
+
+    Args:
+        aporte_anual (float): Contribuição anual ao PGBL.
+        anos (int): Anos de acumulação.
+        taxa_anual (float): A taxa de juros anual (em porcentagem).
+        saldo_final (float, opcional): Saldo da projeção anual. Quando informado,
+            os lotes são reescalados para somar exatamente esse valor.
+
+    Returns:
+        tuple: Valor de cada lote na aposentadoria e a idade do lote em meses,
+        do mais antigo para o mais novo.
+    """
+    idades = np.arange(12 * anos, 0, -1)
+    valores = aporte_anual / 12 * (1 + _taxa_mensal(taxa_anual)) ** idades
+    if saldo_final is not None and valores.sum() > 0:
+        valores = valores * saldo_final / valores.sum()
+    return valores, idades
+
+
+def _meses_pagos(pago):
+    """Quantidade de meses pagos integralmente até o primeiro mês sem saldo."""
+    falhas = np.flatnonzero(~pago)
+    return int(falhas[0]) if falhas.size else len(pago)
+
+
+def resgatar_pgbl(
+    lotes,
+    idades,
+    taxa_anual,
+    renda_liquida,
+    regime="regressivo",
+    inicio=0,
+    max_meses=MAX_MESES,
+    iteracoes=50,
+):
+    """Simula os resgates mensais do PGBL para uma renda líquida fixa.
+
+    O valor bruto de cada mês é obtido por ponto fixo: bruto = líquido / (1 -
+    alíquota efetiva), em que a alíquota efetiva depende dos lotes consumidos.
+
+    Args:
+        lotes (array): Valor de cada lote na aposentadoria (do mais antigo).
+        idades (array): Tempo de acumulação de cada lote em meses.
+        taxa_anual (float): A taxa de juros anual (em porcentagem).
+        renda_liquida (float | array): Renda mensal desejada, já descontado o
+            IR (uma por mês quando array).
+        regime (str): "regressivo" ou "progressivo".
+        inicio (int): Meses de espera antes do primeiro resgate.
+
+    Returns:
+        dict: Arrays mensais "Resgate Bruto", "IR" e "Pago", e "Meses de Usufruto".
+    """
+    meses = np.arange(max_meses)
+    cota = (1 + _taxa_mensal(taxa_anual)) ** (inicio + meses)
+
+    limites = np.cumsum(lotes)
+    anteriores = limites - lotes
+    if regime == "regressivo":
+        aliquotas = aliquota_regressiva(idades[None, :] + inicio + meses[:, None])
+
+    bruto = np.full(max_meses, renda_liquida / (1 - TABELA_REGRESSIVA[-1][1]))
+    for _ in range(iteracoes):
+        cotas = bruto / cota
+        acumulado = np.cumsum(cotas)
+        consumo = np.clip(
+            np.minimum(acumulado[:, None], limites)
+            - np.maximum((acumulado - cotas)[:, None], anteriores),
+            0,
+            None,
+        )
+        valores = consumo * cota[:, None]
+        resgatado = valores.sum(axis=1)
+
+        if regime == "regressivo":
+            ir = (valores * aliquotas).sum(axis=1)
+        else:
+            ir = np.maximum(irpf(resgatado), 0)
+
+        efetiva = np.divide(ir, resgatado, out=np.zeros_like(ir), where=resgatado > 0)
+        # Compara com o bruto desta iteração (o mesmo usado em ``resgatado``)
+        pago = resgatado >= bruto * (1 - 1e-9)
+        novo = renda_liquida / (1 - efetiva)
+        if np.allclose(novo, bruto, rtol=1e-10):
+            break
+        bruto = novo
+
+    return {
+        "Resgate Bruto": resgatado,
+        "IR": ir,
+        "Pago": pago,
+        "Meses de Usufruto": _meses_pagos(pago),
+    }
+
+
+def resgatar_investimentos(
+    saldo,
+    custo,
+    taxa_anual,
+    renda_liquida,
+    aliquota=ALIQUOTA_GANHO_CAPITAL,
+    isencao_mensal=0,
+    max_meses=MAX_MESES,
+):
+    """Simula os resgates mensais de investimentos tributados no ganho de capital.
+
+    Pelo custo médio, cada cota resgatada tem o mesmo custo, então a fração de
+    ganho de cada resgate é ``1 - custo_por_cota / cota`` e o valor bruto sai em
+    forma fechada.
+
+    Args:
+        saldo (float): Saldo na aposentadoria.
+        custo (float): Total aportado (custo de aquisição).
+        taxa_anual (float): A taxa de juros anual (em porcentagem).
+        renda_liquida (float): Renda mensal desejada, já descontado o IR.
+        aliquota (float): Alíquota sobre o ganho de capital.
+        isencao_mensal (float): Vendas brutas mensais até esse valor são
+            isentas (``ISENCAO_ACOES`` em ações).
+
+    Returns:
+        dict: Arrays mensais "Resgate Bruto", "IR" e "Pago", "Meses de Usufruto"
+        e o resgate e o IR do mês em que o saldo acaba ("Resgate Parcial" e
+        "IR Parcial").
+    """
+    meses = np.arange(max_meses)
+    cota = (1 + _taxa_mensal(taxa_anual)) ** meses
+    custo_por_cota = custo / saldo if saldo > 0 else 0
+    fracao_ganho = np.clip(1 - custo_por_cota / cota, 0, None)
+
+    # A isenção vale para as vendas brutas do mês; isenta, a venda é a própria
+    # renda líquida
+    isento = renda_liquida <= isencao_mensal
+    if isento:
+        bruto = np.full(max_meses, float(renda_liquida))
+    else:
+        bruto = renda_liquida / (1 - aliquota * fracao_ganho)
+    ir = bruto - renda_liquida
+
+    cotas = np.cumsum(bruto / cota)
+    pago = cotas <= saldo
+    meses_pagos = _meses_pagos(pago)
+
+    # O que sobra no mês em que o saldo acaba também é resgatado
+    parcial = ir_parcial = 0.0
+    if meses_pagos < max_meses:
+        restante = saldo - (cotas[meses_pagos - 1] if meses_pagos else 0)
+        parcial = max(restante, 0) * cota[meses_pagos]
+        if parcial > isencao_mensal:
+            ir_parcial = parcial * aliquota * fracao_ganho[meses_pagos]
+
+    return {
+        "Resgate Bruto": np.where(pago, bruto, 0),
+        "IR": np.where(pago, ir, 0),
+        "Pago": pago,
+        "Meses de Usufruto": meses_pagos,
+        "Resgate Parcial": parcial,
+        "IR Parcial": ir_parcial,
+    }
+
+
+@cache_persistente(VERSAO_TABELAS)
+def usufruto_liquido(
+    renda_mensal,
+    taxa_anual,
+    df_prev,
+    df_inv,
+    anos,
+    regime="regressivo",
+    aliquota_ganho=ALIQUOTA_GANHO_CAPITAL,
+    acoes=False,
+):
+    """Versão de ``usufruto`` com o IR dos resgates descontado.
+
+    A renda mensal é tratada como valor líquido. Os investimentos são resgatados
+    primeiro e o PGBL depois, o que deixa as contribuições envelhecerem e cair na
+    menor alíquota da tabela regressiva.
+
+    Args:
+        renda_mensal (float): Renda mensal líquida desejada.
+        taxa_anual (float): A taxa de juros anual (em porcentagem).
+        df_prev (pandas.DataFrame | None): Tabela de ``tabela_prev``.
+        df_inv (pandas.DataFrame): Tabela de ``tabela_inv``.
+        anos (list): Anos de acumulação (início do usufruto) avaliados.
+        regime (str): Tabela do PGBL, "regressivo" ou "progressivo".
+        aliquota_ganho (float): Alíquota sobre o ganho dos investimentos.
+        acoes (bool): Investimentos em ações, com vendas mensais até
+            ``ISENCAO_ACOES`` isentas.
+
+    Returns:
+        pandas.DataFrame: Saldo, meses e anos de usufruto e o IR médio pago.
+    """
+    dados = []
+
+    for ano in anos:
+        linha_inv = df_inv[df_inv["Anos"] == ano].iloc[0]
+        investimentos = resgatar_investimentos(
+            linha_inv["Saldo Acumulado"],
+            linha_inv["Valor Aportado"],
+            taxa_anual,
+            renda_mensal,
+            aliquota=aliquota_ganho,
+            isencao_mensal=ISENCAO_ACOES if acoes else 0,
+        )
+        meses = investimentos["Meses de Usufruto"]
+        saldo = linha_inv["Saldo Acumulado"]
+        parcial = investimentos["Resgate Parcial"]
+        bruto = investimentos["Resgate Bruto"][:meses].sum() + parcial
+        ir = investimentos["IR"][:meses].sum() + investimentos["IR Parcial"]
+
+        if df_prev is not None:
+            saldo_prev = df_prev.loc[df_prev["Anos"] == ano, "Saldo Acumulado"].iloc[0]
+            aporte_anual = df_prev.loc[df_prev["Anos"] == 1, "Saldo Acumulado"].iloc[0]
+            lotes, idades = lotes_pgbl(aporte_anual, ano, taxa_anual, saldo_prev)
+            # O PGBL completa a renda do mês em que os investimentos acabam
+            renda = np.full(MAX_MESES - meses, float(renda_mensal))
+            if renda.size:
+                renda[0] -= parcial - investimentos["IR Parcial"]
+            pgbl = resgatar_pgbl(
+                lotes,
+                idades,
+                taxa_anual,
+                renda,
+                regime=regime,
+                inicio=meses,
+                max_meses=MAX_MESES - meses,
+            )
+            meses_pgbl = pgbl["Meses de Usufruto"]
+            meses += meses_pgbl
+            saldo += saldo_prev
+            bruto += pgbl["Resgate Bruto"][:meses_pgbl].sum()
+            ir += pgbl["IR"][:meses_pgbl].sum()
+
+        dados.append(
+            {
+                "Anos": ano,
+                "Saldo Acumulado": saldo,
+                "Meses de Usufruto": meses,
+                "Anos de Usufruto": meses / 12,
+                "IR Médio": ir / bruto if bruto > 0 else 0,
+            }
+        )
+
+    return pd.DataFrame(dados)
@@ -0,0 +1,147 @@
+"""Comparação de veículos de investimento após impostos e taxas.
+
+Projeta o mesmo fluxo de aportes anuais em cada veículo, com a tributação e as
+taxas de cada um (ver ``presentation/assuntos/investimentos.qmd``):
+
+* PGBL: aporte dedutível até 12% da renda bruta (a restituição é reinvestida) e
+  IR sobre o valor total resgatado pela tabela regressiva;
+* VGBL: IR apenas sobre os rendimentos, pela tabela regressiva;
+* LCI/LCA e FI-Infra: isentos;
+* Ações: 15% sobre o ganho de capital (o resgate no horizonte é uma venda única,
+  então a isenção de vendas até R$ 20 mil/mês não se aplica);
+* Renda fixa (CDB/Tesouro): tabela regressiva de 22,5% a 15% sobre o ganho;
+* Fundos: come-cotas de 15% sobre o rendimento de cada ano.
+
+O cálculo é vetorizado sobre veículos, taxas, horizontes e lotes (um lote por
+ano de aporte), então grades inteiras saem numa única chamada.
+"""
+
+import numpy as np
+import pandas as pd
+
+from tributacao_resgate import aliquota_regressiva
+
+# Alíquota da renda fixa pelo tempo do lote (anos): até 180 dias, 360, 720 e acima
+TABELA_RENDA_FIXA = [(0.5, 0.225), (1, 0.20), (2, 0.175), (float("inf"), 0.15)]
+ALIQUOTA_COME_COTAS = 0.15
+EMPATE = "Empate"  # Célula do ranking sem um único melhor veículo
+
+VEICULOS = {
+    "PGBL": {"taxa_adm": 1.0, "tributacao": "pgbl"},
+    "VGBL": {"taxa_adm": 1.0, "tributacao": "vgbl"},
+    # LCI/LCA costumam render uma fração do CDI em troca da isenção
+    "LCI/LCA": {"taxa_adm": 0.0, "tributacao": "isento", "rendimento": 0.90},
+    "Ações": {"taxa_adm": 0.0, "tributacao": "ganho_capital", "aliquota": 0.15},
+    "Renda Fixa (CDB/Tesouro)": {"taxa_adm": 0.2, "tributacao": "renda_fixa"},
+    "Fundo Multimercado": {"taxa_adm": 2.0, "tributacao": "come_cotas"},
+}
+
+
+def aliquota_renda_fixa(anos):
+    """Alíquota regressiva da renda fixa para o tempo do lote em anos."""
+    limites = np.array([limite for limite, _ in TABELA_RENDA_FIXA[:-1]])
+    aliquotas = np.array([aliquota for _, aliquota in TABELA_RENDA_FIXA])
+    return aliquotas[np.searchsorted(limites, anos, side="left")]
+
+
+def comparar_veiculos(
+    aporte_anual,
+    taxas,
+    horizontes,
+    aliquota_ir=0.275,
+    limite_dedutivel=np.inf,
+    veiculos=VEICULOS,
+):
+    """Valor líquido de resgate de cada veículo para cada taxa e horizonte.
+
+    Os aportes seguem a convenção de ``motor.acumular``: o aporte do ano n entra
+    no fim do ano e rende a partir do ano seguinte.
+
+    Args:
+        aporte_anual (float): Aporte feito a cada ano.
+        taxas (list): Taxas de juros anuais brutas (em porcentagem).
+        horizontes (list): Prazos em anos.
+        aliquota_ir (float): Fração do aporte no PGBL devolvida como restituição.
+        limite_dedutivel (float): Aporte anual máximo dedutível (12% da renda).
+        veiculos (dict): Veículos com "taxa_adm" (% a.a.), "tributacao" e,
+            opcionalmente, "rendimento" (fração da taxa de referência).
+
+    Returns:
+        numpy.ndarray: Valores líquidos com forma (veículos, taxas, horizontes).
+    """
+    taxas = np.asarray(taxas, dtype=float)
+    horizontes = np.asarray(horizontes)
+    anos = int(horizontes.max())
+
+    # Lotes k = 1..anos e idade de cada lote em cada horizonte: (horizontes, lotes)
+    lote = np.arange(1, anos + 1)
+    idade = horizontes[:, None] - lote[None, :]
+    ativo = idade >= 0
+    idade = np.where(ativo, idade, 0)
+
+    restituicao = min(aporte_anual, limite_dedutivel) * aliquota_ir
+    aporte_pgbl = np.where(lote == 1, aporte_anual, aporte_anual + restituicao)
+    aporte = np.full(anos, float(aporte_anual))
+
+    resultado = np.empty((len(veiculos), len(taxas), len(horizontes)))
+
+    for v, parametros in enumerate(veiculos.values()):
+        tributacao = parametros["tributacao"]
+        taxa_bruta = taxas * parametros.get("rendimento", 1.0)
+        fator = (1 + taxa_bruta / 100) * (1 - parametros["taxa_adm"] / 100)
+        if tributacao == "come_cotas":
+            fator = 1 + (fator - 1) * (1 - ALIQUOTA_COME_COTAS)
+
+        aportes = aporte_pgbl if tributacao == "pgbl" else aporte
+        # Valor de cada lote no horizonte: (taxas, horizontes, lotes)
+        lotes = aportes * fator[:, None, None] ** idade * ativo
+        ganho = lotes - aportes * ativo
+
+        if tributacao == "pgbl":
+            imposto = lotes * aliquota_regressiva(12 * idade)
+        elif tributacao == "vgbl":
+            imposto = ganho * aliquota_regressiva(12 * idade)
+        elif tributacao == "renda_fixa":
+            imposto = ganho * aliquota_renda_fixa(idade)
+        elif tributacao == "come_cotas":
+            # Complemento no resgate dos lotes com menos de 2 anos
+            imposto = ganho * (aliquota_renda_fixa(idade) - ALIQUOTA_COME_COTAS)
+        elif tributacao == "ganho_capital":
+            imposto = ganho * parametros["aliquota"]
+        else:
+            imposto = np.zeros_like(lotes)
+
+        resultado[v] = (lotes - np.clip(imposto, 0, None)).sum(axis=-1)
+
+    return resultado
+
+
+def ranking_veiculos(aporte_anual, taxas, horizontes, **kwargs):
+    """Tabela com o melhor veículo para cada taxa (linhas) e horizonte (colunas).
+
+    Quando mais de um veículo empata no maior valor (ex.: aporte zero), a célula
+    fica com ``EMPATE``.
+    """
+    veiculos = kwargs.get("veiculos", VEICULOS)
+    valores = comparar_veiculos(aporte_anual, taxas, horizontes, **kwargs)
+    nomes = np.array(list(veiculos), dtype=object)
+    melhores = nomes[valores.argmax(axis=0)]
+    if len(nomes) > 1:
+        ordenados = np.sort(valores, axis=0)
+        melhores[np.isclose(ordenados[-1], ordenados[-2])] = EMPATE
+
+    df = pd.DataFrame(melhores, columns=[f"{h} anos" for h in horizontes])
+    df.insert(0, "Taxa", [f"{t}%" for t in taxas])
+
+    return df
+
+
+def tabela_veiculos(aporte_anual, taxa_anual, horizontes, **kwargs):
+    """Valor líquido de cada veículo (linhas) por horizonte (colunas) numa taxa."""
+    veiculos = kwargs.get("veiculos", VEICULOS)
+    valores = comparar_veiculos(aporte_anual, [taxa_anual], horizontes, **kwargs)
+
+    df = pd.DataFrame(valores[:, 0, :], columns=[f"{h} anos" for h in horizontes])
+    df.insert(0, "Veículo", list(veiculos))
+
+    return df.sort_values(df.columns[-1], ascending=False)
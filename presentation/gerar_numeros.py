@@ -0,0 +1,173 @@
+"""Gera ``_variables.yml`` com os números dos slides a partir do motor da calculadora.
+
+Roda como ``pre-render`` do Quarto (ver ``_quarto.yml``), então os slides usam
+``{{< var sacre_10.parcela >}}`` em vez de valores digitados à mão. Cada cenário
+é guardado em ``.numeros_cache.json`` pelo hash das entradas e do código do
+motor: só os cenários alterados são recalculados.
+
+Uso:
+    python gerar_numeros.py
+"""
+
+import hashlib
+import json
+import math
+import sys
+from pathlib import Path
+
+PASTA = Path(__file__).resolve().parent
+MOTOR = PASTA.parent / "plano_aposentadoria"
+sys.path.insert(0, str(MOTOR))
+
+from cache_cenarios import chave_cenario  # noqa: E402
+from motor import LIMITE_PGBL, VERSAO_TABELAS  # noqa: E402
+
+ARQUIVO_VARIAVEIS = PASTA / "_variables.yml"
+ARQUIVO_CACHE = PASTA / ".numeros_cache.json"
+FONTES = [Path(__file__), MOTOR / "motor.py"]
+
+
+def reais(valor):
+    """Formato dos slides: R$4.169,08 (negativos como -R$234,92)."""
+    texto = f"R${abs(valor):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return f"-{texto}" if valor < 0 else texto
+
+
+def porcentagem(valor, casas=2):
+    return f"{valor:.{casas}f}%".replace(".", ",")
+
+
+def taxa_mensal(taxa_anual, casas=4):
+    """Taxa mensal equivalente (em %) truncada nas casas exibidas no slide."""
+    escala = 10**casas
+    return math.floor(((1 + taxa_anual / 100) ** (1 / 12) - 1) * 100 * escala) / escala
+
+
+def sacre(valor_imovel, entrada, meses, juros_anual, adm_anual, aluguel):
+    """Primeira prestação do SACRE e a comparação com o aluguel.
+
+    As parcelas usam a taxa mensal já truncada, para que as contas do slide
+    fechem com os valores exibidos.
+    """
+    financiado = valor_imovel - entrada
+    juros_mes = taxa_mensal(juros_anual)
+    adm_mes = taxa_mensal(adm_anual)
+
+    amortizacao = round(financiado / meses, 2)
+    juros = round(financiado * juros_mes / 100, 2)
+    adm = round(financiado * adm_mes / 100, 2)
+    despesas = round(juros + adm, 2)
+    aluguel_80 = round(0.8 * aluguel, 2)
+    diferenca = round(despesas - aluguel_80, 2)
+
+    return {
+        "valor_imovel": reais(valor_imovel),
+        "entrada": reais(entrada),
+        "entrada_pct": porcentagem(100 * entrada / valor_imovel, 0),
+        "financiado": reais(financiado),
+        "meses": str(meses),
+        "anos": str(meses // 12),
+        "juros_anual": porcentagem(juros_anual, 0),
+        "juros_mensal": porcentagem(juros_mes, 4),
+        "adm_anual": porcentagem(adm_anual, 0),
+        "adm_mensal": porcentagem(adm_mes, 4),
+        "amortizacao": reais(amortizacao),
+        "juros": reais(juros),
+        "adm": reais(adm),
+        "parcela": reais(amortizacao + juros + adm),
+        "despesas": reais(despesas),
+        "aluguel": reais(aluguel),
+        "aluguel_80": reais(aluguel_80),
+        "diferenca": reais(diferenca),
+        "diferenca_pct": ("+ " if diferenca > 0 else "")
+        + porcentagem(100 * diferenca / aluguel_80),
+        "sobra_investida": reais(amortizacao + juros + adm - aluguel),
+    }
+
+
+def calculadora():
+    """Parâmetros da calculadora citados nos slides."""
+    return {"limite_pgbl": porcentagem(100 * LIMITE_PGBL, 0)}
+
+
+# Nome da variável no Quarto -> (função, argumentos)
+CENARIOS = {
+    "sacre_10": (
+        sacre,
+        dict(
+            valor_imovel=450000,
+            entrada=90000,
+            meses=360,
+            juros_anual=10,
+            adm_anual=1,
+            aluguel=2500,
+        ),
+    ),
+    "sacre_5": (
+        sacre,
+        dict(
+            valor_imovel=450000,
+            entrada=90000,
+            meses=360,
+            juros_anual=5,
+            adm_anual=1,
+            aluguel=2500,
+        ),
+    ),
+    "calculadora": (calculadora, dict()),
+}
+
+
+def versao_codigo():
+    """Hash do código que produz os números (motor e este script)."""
+    h = hashlib.sha256(VERSAO_TABELAS.encode())
+    for fonte in FONTES:
+        h.update(fonte.read_bytes())
+    return h.hexdigest()
+
+
+def _yaml(valores, nivel=0):
+    linhas = []
+    for chave, valor in valores.items():
+        if isinstance(valor, dict):
+            linhas.append(f"{'  ' * nivel}{chave}:")
+            linhas.extend(_yaml(valor, nivel + 1))
+        else:
+            linhas.append(
+                f"{'  ' * nivel}{chave}: {json.dumps(valor, ensure_ascii=False)}"
+            )
+    return linhas
+
+
+def gerar(cenarios=CENARIOS):
+    """Calcula (ou lê do cache) cada cenário e escreve ``_variables.yml``."""
+    try:
+        cache = json.loads(ARQUIVO_CACHE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+
+    versao = versao_codigo()
+    variaveis, novo_cache, recalculados = {}, {}, []
+    for nome, (funcao, kwargs) in cenarios.items():
+        chave = chave_cenario(nome, versao, (), kwargs)
+        if chave not in cache:
+            cache[chave] = funcao(**kwargs)
+            recalculados.append(nome)
+        variaveis[nome] = novo_cache[chave] = cache[chave]
+
+    ARQUIVO_CACHE.write_text(
+        json.dumps(novo_cache, ensure_ascii=False), encoding="utf-8"
+    )
+    texto = "\n".join(["# Gerado por gerar_numeros.py; não edite.", *_yaml(variaveis)])
+    if (
+        not ARQUIVO_VARIAVEIS.exists()
+        or ARQUIVO_VARIAVEIS.read_text(encoding="utf-8") != texto + "\n"
+    ):
+        ARQUIVO_VARIAVEIS.write_text(texto + "\n", encoding="utf-8")
+
+    return recalculados
+
+
+if __name__ == "__main__":
+    recalculados = gerar()
+    print(f"Cenários recalculados: {', '.join(recalculados) or 'nenhum'}")
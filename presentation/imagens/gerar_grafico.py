@@ -1,3 +1,6 @@
+import sys
+from pathlib import Path
+
 import plotly.graph_objects as go
 import plotly.express as px
 
@@ -16,6 +19,13 @@ source = [0, 1, 2,  3, 3, 3, 3, 3, 3, 3]
 target = [3, 3, 3,  4, 5, 6, 7, 8, 9, 10]
 value = [0.7, 0.2, 0.1,  0.25, 0.15, 0.15, .13, 0.12, 0.1, 0.1]
 
+# Com um extrato (CSV ou OFX) como argumento, os dados vêm do orçamento real
+if len(sys.argv) > 1:
+    sys.path.append(str(Path(__file__).resolve().parents[2] / 'plano_aposentadoria'))
+    from orcamento import agregar, dados_sankey, ler_extrato
+
+    labels, source, target, value = dados_sankey(agregar(ler_extrato(sys.argv[1])))
+
 # --- PASSO 2: SELEÇÃO DAS CORES DA PALETA 'BLUES' ---
 
 # 1. Escolhe a paleta de cores sequencial